@@ -1,18 +1,61 @@
-
 from __future__ import annotations
 from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
+
+from .cache import YeediAuthCache
+from .const import CONF_ACCOUNT, CONF_COUNTRY, CONF_PASSWORD, DATA_LIFECYCLE, DOMAIN
+from .hub import hub_key
+from .lifecycle import HubLifecycle
+from .services import async_setup_services
+
+PLATFORMS = ["vacuum", "sensor", "binary_sensor", "image"]
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
-PLATFORMS = ["vacuum"]
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    async_setup_services(hass)
+    return True
+
+def _lifecycle(hass: HomeAssistant) -> HubLifecycle:
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    lifecycle = domain_data.get(DATA_LIFECYCLE)
+    if lifecycle is None:
+        lifecycle = domain_data[DATA_LIFECYCLE] = HubLifecycle(hass)
+    return lifecycle
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    hass.data.setdefault(entry.domain, {})
-    hass.data[entry.domain][entry.entry_id] = entry.data
+    lifecycle = _lifecycle(hass)
+    hub = lifecycle.async_acquire(entry)
+    hass.data[DOMAIN][entry.entry_id] = hub
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+    lifecycle.async_setup_done(entry, hub)
     return True
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    await hass.config_entries.async_reload(entry.entry_id)
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    lifecycle = _lifecycle(hass)
+    lifecycle.async_unload_started(entry)
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[entry.domain].pop(entry.entry_id, None)
+        hub = hass.data[DOMAIN].pop(entry.entry_id, None)
+        if hub is not None:
+            # Kept connected for a short while in case this is a reload.
+            await lifecycle.async_release(entry, hub)
     return unload_ok
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    key = hub_key(entry.data[CONF_ACCOUNT], entry.data[CONF_COUNTRY])
+    for other in hass.config_entries.async_entries(entry.domain):
+        if other.entry_id != entry.entry_id and hub_key(
+            other.data[CONF_ACCOUNT], other.data[CONF_COUNTRY]
+        ) == key:
+            return
+    # Last entry for this account: close its hub and drop the cached tokens
+    # and device list.
+    await _lifecycle(hass).async_close_released(key)
+    await YeediAuthCache(hass, key=key, password=entry.data[CONF_PASSWORD]).async_remove()
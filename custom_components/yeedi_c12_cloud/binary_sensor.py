@@ -0,0 +1,45 @@
+"""Binary sensors split out of the vacuum's state attributes."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .entity import YeediEntity
+from .helpers import entry_devices
+from .hub import YeediHub
+from .normalize import bin_full
+
+if TYPE_CHECKING:
+    from deebot_client.device import Device as DeebotDevice
+
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
+    hub: YeediHub = hass.data[DOMAIN][entry.entry_id]
+    async_add_entities(YeediBinFullSensor(entry, hub, did) for did, _name in entry_devices(entry.data))
+
+
+class YeediBinFullSensor(YeediEntity, BinarySensorEntity):
+    _attr_name = "Bin full"
+    _attr_device_class = BinarySensorDeviceClass.PROBLEM
+
+    def __init__(self, entry: ConfigEntry, hub: YeediHub, did: str) -> None:
+        super().__init__(entry, hub, did, "bin_full")
+
+    def _async_subscribe(self, bot: DeebotDevice) -> bool:
+        # deebot-client has no bin event; a full bin is reported as an error.
+        return self._subscribe("ErrorEvent", self._on_error)
+
+    async def _on_error(self, event: Any) -> None:
+        value = bin_full(event.code)
+        if value == self._attr_is_on:
+            return
+        self._attr_is_on = value
+        self.async_write_ha_state()
@@ -0,0 +1,158 @@
+"""Persistent login and device-list cache used for warm starts."""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Optional
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .helpers import md5
+
+if TYPE_CHECKING:
+    from deebot_client.models import Credentials
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 5
+
+# Refuse cached tokens this close to expiry; a fresh login is cheaper than
+# a rejected MQTT connect.
+_EXPIRY_MARGIN = 300
+
+
+def _credentials_payload(creds: Credentials) -> dict[str, Any]:
+    return {
+        "token": creds.token,
+        "user_id": creds.user_id,
+        "expires_at": creds.expires_at,
+    }
+
+
+class YeediAuthCache:
+    """Device id, issued tokens and last device list for one account.
+
+    The data is keyed by a hash of the account and country so the storage
+    file name does not leak the login, and it is invalidated whenever the
+    password changes.
+    """
+
+    def __init__(self, hass: HomeAssistant, *, key: str, password: str) -> None:
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.auth.{md5(key)}", private=True
+        )
+        self._secret = md5(md5(password))
+        self._data: dict[str, Any] = {}
+
+    async def async_load(self) -> None:
+        data = await self._store.async_load() or {}
+        if data.get("secret") != self._secret:
+            # Password changed (or first run): keep nothing but start fresh.
+            data = {}
+        self._data = data
+
+    @property
+    def device_id(self) -> str:
+        """Return the persisted client device id, minting one on first use."""
+
+        device_id = self._data.get("device_id")
+        if not device_id:
+            device_id = self._data["device_id"] = md5(str(time.time()))
+            self._schedule_save()
+        return device_id
+
+    @property
+    def credentials(self) -> Optional[Credentials]:
+        """Return cached credentials if they are still comfortably valid."""
+
+        raw = self._data.get("credentials")
+        if not raw:
+            return None
+        from deebot_client.models import Credentials
+
+        try:
+            creds = Credentials(
+                token=raw["token"],
+                user_id=raw["user_id"],
+                expires_at=int(raw.get("expires_at", 0)),
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+        if creds.expires_at - _EXPIRY_MARGIN < time.time():
+            return None
+        return creds
+
+    async def async_set_credentials(self, creds: Credentials) -> None:
+        self._data["credentials"] = _credentials_payload(creds)
+        self._schedule_save()
+
+    def invalidate_credentials(self) -> None:
+        if self._data.pop("credentials", None) is not None:
+            self._schedule_save()
+
+    @property
+    def api_devices(self) -> list[dict[str, Any]]:
+        return list(self._data.get("devices") or [])
+
+    def set_devices(self, devices: list[Any]) -> None:
+        api = [d.api for d in devices if isinstance(getattr(d, "api", None), dict)]
+        if api != self._data.get("devices"):
+            self._data["devices"] = api
+            self._schedule_save()
+
+    async def async_cached_devices(self) -> list[Any]:
+        """Rebuild ``DeviceInfo`` objects from the cached API payloads.
+
+        Returns an empty list when any cached device class is no longer
+        recognised by the installed deebot_client, so callers fall back to
+        a fresh ``get_devices()``.
+        """
+
+        api_devices = self.api_devices
+        if not api_devices:
+            return []
+        try:
+            from deebot_client.hardware.deebot import get_static_device_info
+            from deebot_client.models import DeviceInfo
+        except Exception:
+            return []
+
+        out: list[Any] = []
+        for api in api_devices:
+            try:
+                static = await get_static_device_info(api["class"])
+            except Exception:
+                static = None
+            if static is None:
+                _LOGGER.debug("Cached device class %s unknown", api.get("class"))
+                return []
+            out.append(DeviceInfo(api, static))
+        return out
+
+    async def async_seed(
+        self, *, device_id: str, credentials: Credentials, devices: list[Any]
+    ) -> None:
+        """Store a login made elsewhere (the config flow) and save at once.
+
+        Saved immediately rather than delayed, because the entry set up
+        right after the flow loads this store through its own instance.
+        """
+
+        self._data = {"device_id": device_id, "secret": self._secret}
+        self._data["credentials"] = _credentials_payload(credentials)
+        self._data["devices"] = [
+            d.api for d in devices if isinstance(getattr(d, "api", None), dict)
+        ]
+        await self._store.async_save(dict(self._data))
+
+    def _schedule_save(self) -> None:
+        self._data["secret"] = self._secret
+        self._store.async_delay_save(lambda: dict(self._data), SAVE_DELAY)
+
+    async def async_remove(self) -> None:
+        self._data = {}
+        await self._store.async_remove()
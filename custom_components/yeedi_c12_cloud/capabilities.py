@@ -0,0 +1,178 @@
+"""Per-model capability probe, cached in a Store across restarts.
+
+The probe reads what deebot_client knows about a model (its static
+capability table, or the guarded command imports on clients without one)
+once per device class and client version.  The result is persisted, so
+after a restart the vacuum starts with the right supported features and
+fan-speed list before it has connected, and service calls a model cannot
+handle are rejected locally instead of costing a cloud round-trip.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import asdict, dataclass, field
+from importlib import metadata
+import logging
+from typing import TYPE_CHECKING, Any, Optional
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DATA_CAPABILITIES, DOMAIN
+from .loader import optional_attr
+from .normalize import fan_speed
+
+if TYPE_CHECKING:
+    from deebot_client.device import Device as DeebotDevice
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
+
+# Bump when the probe learns something new so cached results are redone.
+PROBE_VERSION = 2
+
+
+@dataclass(slots=True)
+class ModelCapabilities:
+    """What one device class supports, as plain JSON-able data."""
+
+    model: str
+    # HA fan speed name -> deebot_client enum member name ("" = legacy string).
+    fan_speeds: dict[str, str] = field(default_factory=dict)
+    water_levels: list[int] = field(default_factory=list)
+    rooms: bool = False
+    area_clean: bool = False
+    clean_logs: bool = False
+
+    @property
+    def fan_speed_list(self) -> list[str]:
+        return list(self.fan_speeds)
+
+
+def probe(model: str, bot: DeebotDevice) -> ModelCapabilities:
+    """Derive a model's capabilities from the connected device handle."""
+
+    caps = getattr(bot, "capabilities", None)
+    if caps is None:
+        # Clients without capability tables: fall back to guarded imports.
+        levels = optional_attr("deebot_client.events.fan_speed", "FanSpeedLevel")
+        amounts = optional_attr("deebot_client.events.water_info", "WaterAmount")
+        fallback_fan: dict[str, str] = {}
+        if levels and optional_attr("deebot_client.commands.json.fan_speed", "SetFanSpeed"):
+            for member in levels:
+                if (name := fan_speed(member)) is not None:
+                    fallback_fan.setdefault(name, member.name)
+        set_water = optional_attr("deebot_client.commands.json.water_info", "SetWaterInfo")
+        return ModelCapabilities(
+            model=model,
+            fan_speeds=fallback_fan,
+            water_levels=[int(amount) for amount in amounts] if amounts and set_water else [],
+        )
+
+    fan_speeds: dict[str, str] = {}
+    fan = getattr(caps, "fan_speed", None)
+    for member in getattr(fan, "types", ()) or ():
+        name = fan_speed(member)
+        if name is not None and name not in fan_speeds:
+            fan_speeds[name] = member.name
+
+    water = getattr(getattr(caps, "water", None), "amount", None)
+    water_levels = sorted(int(level) for level in getattr(water, "types", ()) or ())
+
+    clean = getattr(caps, "clean", None)
+    return ModelCapabilities(
+        model=model,
+        fan_speeds=fan_speeds,
+        water_levels=water_levels,
+        rooms=getattr(caps, "map", None) is not None,
+        area_clean=getattr(getattr(clean, "action", None), "area", None) is not None,
+        clean_logs=getattr(clean, "log", None) is not None,
+    )
+
+
+def device_model(bot: DeebotDevice) -> str:
+    """The device class (e.g. ``p1jij8``) that capability tables are keyed by."""
+
+    info = getattr(bot, "device_info", None) or {}
+    return str(info.get("class") or "unknown")
+
+
+class CapabilityStore:
+    """Probed capabilities by model, plus which model each robot is."""
+
+    def __init__(self, hass: HomeAssistant, client_version: str) -> None:
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, f"{DOMAIN}.capabilities")
+        self._version = f"{PROBE_VERSION}:{client_version}"
+        self._models: dict[str, ModelCapabilities] = {}
+        self._devices: dict[str, str] = {}
+
+    async def async_load(self) -> None:
+        data = await self._store.async_load() or {}
+        if data.get("version") != self._version:
+            # New probe or client version: capabilities may differ.
+            return
+        for model, raw in (data.get("models") or {}).items():
+            try:
+                self._models[model] = ModelCapabilities(**raw)
+            except TypeError:
+                continue
+        self._devices = dict(data.get("devices") or {})
+
+    def for_device(self, did: str) -> Optional[ModelCapabilities]:
+        """Cached capabilities of ``did``'s model, if it was seen before."""
+
+        model = self._devices.get(did)
+        return self._models.get(model) if model is not None else None
+
+    def async_probe(self, did: str, bot: DeebotDevice) -> ModelCapabilities:
+        """Return ``did``'s capabilities, probing its model only the first time."""
+
+        model = device_model(bot)
+        caps = self._models.get(model)
+        changed = False
+        if caps is None:
+            caps = self._models[model] = probe(model, bot)
+            changed = True
+            _LOGGER.debug("Probed capabilities of %s: %s", model, caps)
+        if self._devices.get(did) != model:
+            self._devices[did] = model
+            changed = True
+        if changed:
+            self._store.async_delay_save(self._data, SAVE_DELAY)
+        return caps
+
+    def _data(self) -> dict[str, Any]:
+        return {
+            "version": self._version,
+            "models": {model: asdict(caps) for model, caps in self._models.items()},
+            "devices": self._devices,
+        }
+
+
+def _client_version() -> str:
+    try:
+        return metadata.version("deebot-client")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+async def async_get_capability_store(hass: HomeAssistant) -> CapabilityStore:
+    """Load the shared store once per Home Assistant instance."""
+
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    pending = domain_data.get(DATA_CAPABILITIES)
+    if pending is None:
+        pending = domain_data[DATA_CAPABILITIES] = hass.loop.create_future()
+        try:
+            store = CapabilityStore(hass, await hass.async_add_executor_job(_client_version))
+            await store.async_load()
+        except BaseException as err:
+            del domain_data[DATA_CAPABILITIES]
+            pending.set_exception(err)
+            pending.exception()  # re-raised below; don't warn about it
+            raise
+        pending.set_result(store)
+    return await asyncio.shield(pending)
@@ -0,0 +1,144 @@
+"""Per-device command scheduler: serialised, coalescing and prioritised."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+import itertools
+import logging
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import COMMAND_QUEUE_MAXSIZE, DOMAIN
+from .metrics import Metrics
+
+_LOGGER = logging.getLogger(__name__)
+
+# Lower runs first.  Stop/pause/return-to-base jump ahead of anything queued;
+# background fetches such as map pieces wait behind user commands.
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 10
+PRIORITY_LOW = 20
+
+
+@dataclass
+class _Pending:
+    command: Any
+    priority: int
+    key: Optional[str]
+    futures: list[asyncio.Future] = field(default_factory=list)
+
+
+class CommandQueue:
+    """Send commands to one device one at a time.
+
+    * Commands submitted with the same ``key`` while an earlier one is still
+      waiting replace it, so only the latest fan-speed or water-level
+      setting reaches the cloud; every caller gets the surviving result.
+    * High priority commands are sent before anything else waiting.
+    * At most ``maxsize`` commands may wait; further submits fail fast with
+      :class:`HomeAssistantError` instead of piling up behind a slow cloud.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        execute: Callable[[Any], Awaitable[Any]],
+        *,
+        name: str,
+        maxsize: int = COMMAND_QUEUE_MAXSIZE,
+        metrics: Optional[Metrics] = None,
+    ) -> None:
+        self.hass = hass
+        self._execute = execute
+        self._name = name
+        self._maxsize = maxsize
+        self.metrics = metrics or Metrics()
+        self._queue: asyncio.PriorityQueue[tuple[int, int, _Pending]] = asyncio.PriorityQueue()
+        self._by_key: dict[str, _Pending] = {}
+        self._seq = itertools.count()
+        self._worker: Optional[asyncio.Task] = None
+        self.last_latency: Optional[float] = None
+
+    @property
+    def depth(self) -> int:
+        """Number of commands waiting to be sent."""
+
+        return self._queue.qsize()
+
+    async def async_submit(
+        self,
+        command: Any,
+        *,
+        priority: int = PRIORITY_NORMAL,
+        key: Optional[str] = None,
+    ) -> Any:
+        """Queue ``command`` and wait for its (or its successor's) result."""
+
+        future: asyncio.Future = self.hass.loop.create_future()
+        pending = self._by_key.get(key) if key else None
+        if pending is not None:
+            pending.command = command
+            pending.futures.append(future)
+            self.metrics.incr("commands_coalesced")
+        else:
+            if self._queue.qsize() >= self._maxsize:
+                self.metrics.incr("commands_rejected")
+                raise HomeAssistantError(
+                    f"Too many commands queued for {self._name}; try again shortly"
+                )
+            pending = _Pending(command, priority, key, [future])
+            if key:
+                self._by_key[key] = pending
+            self._queue.put_nowait((priority, next(self._seq), pending))
+        self.metrics.incr("commands_submitted")
+        self._ensure_worker()
+        return await future
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._worker = self.hass.async_create_background_task(
+                self._async_run(), f"{DOMAIN} command queue {self._name}"
+            )
+
+    async def _async_run(self) -> None:
+        while True:
+            _, _, pending = await self._queue.get()
+            if pending.key and self._by_key.get(pending.key) is pending:
+                del self._by_key[pending.key]
+            started = time.monotonic()
+            try:
+                result = await self._execute(pending.command)
+            except asyncio.CancelledError:
+                for fut in pending.futures:
+                    if not fut.done():
+                        fut.cancel()
+                raise
+            except Exception as err:
+                self.metrics.incr("commands_failed")
+                for fut in pending.futures:
+                    if not fut.done():
+                        fut.set_exception(err)
+            else:
+                for fut in pending.futures:
+                    if not fut.done():
+                        fut.set_result(result)
+            self.last_latency = time.monotonic() - started
+            self.metrics.observe("command_rtt", self.last_latency)
+            self.metrics.incr("commands_sent")
+
+    async def async_close(self) -> None:
+        """Stop the worker and cancel everything still waiting."""
+
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        while not self._queue.empty():
+            _, _, pending = self._queue.get_nowait()
+            for fut in pending.futures:
+                if not fut.done():
+                    fut.cancel()
+        self._by_key.clear()
@@ -0,0 +1,30 @@
+"""Core robot commands shared by the vacuum entity and fleet services."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from .command_queue import PRIORITY_HIGH, PRIORITY_NORMAL
+
+# Names accepted by fleet_command (and vacuum.send_command aliases map here).
+CORE_COMMANDS = ("start", "stop", "pause", "return_to_base", "locate")
+
+
+def core_command(name: str) -> tuple[Any, int]:
+    """Return ``(command, priority)`` for one of :data:`CORE_COMMANDS`."""
+
+    from deebot_client.commands.json.charge import Charge
+    from deebot_client.commands.json.clean import Clean, CleanAction
+    from deebot_client.commands.json.locate import PlaySound
+
+    if name == "start":
+        return Clean(CleanAction.START), PRIORITY_NORMAL
+    if name == "stop":
+        return Clean(CleanAction.STOP), PRIORITY_HIGH
+    if name == "pause":
+        return Clean(CleanAction.PAUSE), PRIORITY_HIGH
+    if name == "return_to_base":
+        return Charge(), PRIORITY_HIGH
+    if name == "locate":
+        return PlaySound(), PRIORITY_NORMAL
+    raise ValueError(f"Unknown command {name!r}")
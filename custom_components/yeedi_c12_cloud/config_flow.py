@@ -1,17 +1,36 @@
 
 from __future__ import annotations
+from dataclasses import dataclass
+import logging
 import time
+from typing import Any
 
 import aiohttp
 import voluptuous as vol
-from deebot_client.api_client import ApiClient
-from deebot_client.authentication import Authenticator
-from deebot_client.util import md5
 from homeassistant import config_entries
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
+from homeassistant.helpers import config_validation as cv
 
-from .const import DOMAIN, CONF_ACCOUNT, CONF_PASSWORD, CONF_COUNTRY, CONF_DEVICE_ID, CONF_DEVICE_NAME
-from .helpers import create_yeedi_api_config
+from .const import (
+    AUTO_COUNTRY,
+    AUTO_DETECT_COUNTRIES,
+    DOMAIN,
+    CONF_ACCOUNT,
+    CONF_PASSWORD,
+    CONF_COUNTRY,
+    CONF_DEVICE_ID,
+    CONF_DEVICE_NAME,
+    CONF_DEVICES,
+    CONF_STATE_WRITE_WINDOW,
+    DEFAULT_STATE_WRITE_WINDOW,
+)
+from .cache import YeediAuthCache
+from .helpers import create_yeedi_api_config, entry_devices, md5
+from .hub import device_did, hub_key
+from .loader import async_import_client
+
+_LOGGER = logging.getLogger(__name__)
 
 STEP_USER_SCHEMA = vol.Schema({
     vol.Required(CONF_ACCOUNT): str,
@@ -19,9 +38,112 @@ STEP_USER_SCHEMA = vol.Schema({
     vol.Required(CONF_COUNTRY, default="US"): str,
 })
 
+class NoDevices(Exception):
+    """Login worked but the account has no MQTT-capable devices."""
+
+
+class InvalidAuth(Exception):
+    """The cloud rejected the account or password."""
+
+
+@dataclass(slots=True)
+class _LoginResult:
+    country: str
+    devices: list[Any]
+    credentials: Any
+    elapsed: float
+
+
+async def _async_login(
+    session: aiohttp.ClientSession, device_id: str, account: str, password: str, country: str
+) -> _LoginResult:
+    """Log in against ``country``'s endpoints and list the MQTT devices."""
+
+    from deebot_client.api_client import ApiClient
+    from deebot_client.authentication import Authenticator
+    from deebot_client.exceptions import InvalidAuthenticationError
+
+    started = time.monotonic()
+    yeedi_config = create_yeedi_api_config(
+        session, device_id=device_id, alpha_2_country=country
+    )
+    auth = Authenticator(yeedi_config.rest, account, md5(password))
+    try:
+        credentials = await auth.authenticate()
+        devices = await ApiClient(auth).get_devices()
+    except InvalidAuthenticationError as err:
+        raise InvalidAuth from err
+    finally:
+        await auth.teardown()
+    return _LoginResult(
+        country=country,
+        devices=list(getattr(devices, "mqtt", []) or []),
+        credentials=credentials,
+        elapsed=time.monotonic() - started,
+    )
+
+
+async def _async_detect_region(
+    session: aiohttp.ClientSession,
+    device_id: str,
+    account: str,
+    password: str,
+    first: str | None = None,
+) -> tuple[_LoginResult, dict[str, float | None]]:
+    """Log in to each candidate region in turn and keep the fastest.
+
+    Regions are tried one at a time, ``first`` before the others, so the
+    password never goes to several regions at once and a rejected password
+    ends the search before any other region sees it.  Of the regions that
+    accept the login and list devices, the one that answered fastest is
+    used.  Also returns the latency of every region tried (``None`` for
+    failures).
+    """
+
+    latencies: dict[str, float | None] = {}
+    found: list[_LoginResult] = []
+    logged_in = False
+    for country in dict.fromkeys(c for c in (first, *AUTO_DETECT_COUNTRIES) if c):
+        try:
+            result = await _async_login(session, device_id, account, password, country)
+        except InvalidAuth:
+            raise
+        except Exception as err:
+            _LOGGER.debug("Region probe %s failed: %s", country, err)
+            latencies[country] = None
+            continue
+        latencies[country] = result.elapsed
+        logged_in = True
+        if result.devices:
+            found.append(result)
+    if found:
+        return min(found, key=lambda r: r.elapsed), latencies
+    if logged_in:
+        raise NoDevices
+    raise ConnectionError("No region accepted the login")
+
+
+def _device_label(device: Any) -> str:
+    api = getattr(device, "api", None) or {}
+    return api.get("nick") or api.get("deviceName") or device_did(device) or str(device)
+
+
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
+    """Log in once and add any number of the account's robots.
+
+    One config entry covers an account; running the flow again for the
+    same account adds the newly selected robots to that entry.  The login
+    made here is handed to the runtime through the token cache, so setting
+    up the entry does not log in a second time.
+    """
+
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry) -> OptionsFlow:
+        return OptionsFlow()
+
     async def async_step_user(self, user_input=None) -> FlowResult:
         errors = {}
         if user_input is not None:
@@ -30,52 +152,114 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             country = user_input[CONF_COUNTRY].strip().upper()
 
             try:
+                await async_import_client(self.hass)
                 device_id = md5(str(time.time()))
                 async with aiohttp.ClientSession() as session:
-                    yeedi_config = create_yeedi_api_config(
-                        session, device_id=device_id, alpha_2_country=country
-                    )
-                    auth = Authenticator(yeedi_config.rest, account, md5(password))
-                    api = ApiClient(auth)
-                    devices = await api.get_devices()
-                    mqtt_devs = getattr(devices, "mqtt", []) or []
-                    if not mqtt_devs:
-                        errors["base"] = "no_devices"
+                    if country == AUTO_COUNTRY:
+                        # The country Home Assistant is set up for is the likeliest.
+                        login, latencies = await _async_detect_region(
+                            session,
+                            device_id,
+                            account,
+                            password,
+                            getattr(self.hass.config, "country", None),
+                        )
+                        _LOGGER.debug(
+                            "Region probe latencies: %s; using %s", latencies, login.country
+                        )
                     else:
-                        self._account = account
-                        self._password = password
-                        self._country = country
-                        self._mqtt_devs = mqtt_devs
-                        return await self.async_step_pick()
+                        login = await _async_login(session, device_id, account, password, country)
+                if not login.devices:
+                    raise NoDevices
+            except NoDevices:
+                errors["base"] = "no_devices"
+            except InvalidAuth:
+                errors["base"] = "invalid_auth"
             except Exception:
                 errors["base"] = "cannot_connect"
+            else:
+                self._account = account
+                self._password = password
+                self._device_id = device_id
+                self._login = login
+                return await self.async_step_pick()
 
         return self.async_show_form(step_id="user", data_schema=STEP_USER_SCHEMA, errors=errors)
 
     async def async_step_pick(self, user_input=None) -> FlowResult:
-        import voluptuous as vol
+        key = hub_key(self._account, self._login.country)
+        account_entries = [
+            entry
+            for entry in self._async_current_entries(include_ignore=False)
+            if hub_key(entry.data[CONF_ACCOUNT], entry.data[CONF_COUNTRY]) == key
+        ]
+        configured = {
+            did for entry in account_entries for did, _name in entry_devices(entry.data)
+        }
+        labels = {
+            did: _device_label(d)
+            for d in self._login.devices
+            if (did := device_did(d)) and did not in configured
+        }
+        if not labels:
+            return self.async_abort(reason="already_configured")
+
+        errors: dict[str, str] = {}
         if user_input is not None:
-            dev_id = user_input[CONF_DEVICE_ID]
-            name = user_input.get(CONF_DEVICE_NAME) or dev_id
-            await self.async_set_unique_id(f"{DOMAIN}:{dev_id}")
-            self._abort_if_unique_id_configured()
+            selected = [
+                {CONF_DEVICE_ID: did, CONF_DEVICE_NAME: labels[did]}
+                for did in user_input[CONF_DEVICES]
+                if did in labels
+            ]
+            if not selected:
+                errors["base"] = "no_devices_selected"
+        if user_input is not None and not errors:
+            await self.async_set_unique_id(f"{DOMAIN}:{key}")
+            existing = next(
+                (e for e in account_entries if e.unique_id == self.unique_id), None
+            )
+            if existing is not None:
+                # Same account again: extend the entry (this reloads it).
+                self.hass.config_entries.async_update_entry(
+                    existing,
+                    data={**existing.data, CONF_DEVICES: [*existing.data[CONF_DEVICES], *selected]},
+                )
+                return self.async_abort(reason="devices_added")
+
+            if not account_entries:
+                # Nothing runs for this account yet: hand over the login.
+                cache = YeediAuthCache(self.hass, key=key, password=self._password)
+                await cache.async_seed(
+                    device_id=self._device_id,
+                    credentials=self._login.credentials,
+                    devices=self._login.devices,
+                )
             data = {
                 CONF_ACCOUNT: self._account,
                 CONF_PASSWORD: self._password,
-                CONF_COUNTRY: self._country,
-                CONF_DEVICE_ID: dev_id,
-                CONF_DEVICE_NAME: name,
+                CONF_COUNTRY: self._login.country,
+                CONF_DEVICES: selected,
             }
-            return self.async_create_entry(title=name, data=data)
+            return self.async_create_entry(title=self._account, data=data)
+
+        schema = vol.Schema({
+            vol.Required(CONF_DEVICES, default=list(labels)): cv.multi_select(
+                {did: f"{label} ({did})" for did, label in labels.items()}
+            ),
+        })
+        return self.async_show_form(step_id="pick", data_schema=schema, errors=errors)
+
 
-        opts = {}
-        for d in self._mqtt_devs:
-            did = getattr(d, "did", None) or getattr(d, "id", None) or str(d)
-            nick = getattr(d, "nick", None) or getattr(d, "name", None) or did
-            opts[did] = f"{nick} ({did})"
+class OptionsFlow(config_entries.OptionsFlow):
+    async def async_step_init(self, user_input=None) -> FlowResult:
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
 
+        options = self.config_entry.options
         schema = vol.Schema({
-            vol.Required(CONF_DEVICE_ID): vol.In(list(opts.keys())),
-            vol.Optional(CONF_DEVICE_NAME): str,
+            vol.Optional(
+                CONF_STATE_WRITE_WINDOW,
+                default=options.get(CONF_STATE_WRITE_WINDOW, DEFAULT_STATE_WRITE_WINDOW),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=5000)),
         })
-        return self.async_show_form(step_id="pick", data_schema=schema)
+        return self.async_show_form(step_id="init", data_schema=schema)
@@ -5,3 +5,71 @@ CONF_PASSWORD = "password"
 CONF_COUNTRY = "country"
 CONF_DEVICE_ID = "device_id"
 CONF_DEVICE_NAME = "device_name"
+# List of {device_id, device_name} for entries covering several robots.
+CONF_DEVICES = "devices"
+CONF_STATE_WRITE_WINDOW = "state_write_window"
+
+# Entering this as the country tries one country per cloud region in turn.
+AUTO_COUNTRY = "AUTO"
+AUTO_DETECT_COUNTRIES = ("US", "DE", "JP", "AU", "CN")
+
+DATA_LIFECYCLE = "lifecycle"
+DATA_HISTORY = "history"
+DATA_CAPABILITIES = "capabilities"
+DATA_PROFILER = "profiler"
+
+# Upper bound for one login + discovery + MQTT setup attempt (seconds).
+CONNECT_TIMEOUT = 30
+# Jittered exponential backoff bounds for connect/reconnect retries (seconds).
+RECONNECT_BACKOFF_MIN = 5
+RECONNECT_BACKOFF_MAX = 300
+# A hub released by its last config entry stays connected this long, so a
+# reload picks it up again instead of logging in anew (seconds).
+HUB_RELEASE_GRACE = 30
+# Upper bound for each step of closing a hub (seconds).
+TEARDOWN_TIMEOUT = 10
+
+# Default window (milliseconds) for coalescing bursts of state writes.
+DEFAULT_STATE_WRITE_WINDOW = 250
+
+# Commands allowed to wait per device before new submits are rejected.
+COMMAND_QUEUE_MAXSIZE = 16
+
+# Quiet period (seconds) after the last map update before re-rendering.
+MAP_RENDER_DELAY = 2
+# Follow the map trace and robot position only this long after the map image
+# was last fetched (seconds).
+MAP_LIVE_TIMEOUT = 600
+
+# How long clean_rooms waits for the first room list after connecting (seconds).
+ROOMS_WAIT_TIMEOUT = 10
+
+# Push health: poll instead once no MQTT message arrived for this long (s).
+PUSH_STALE_AFTER = 900
+HEALTH_CHECK_INTERVAL = 30
+# Adaptive poll intervals while push is degraded (seconds).
+POLL_INTERVAL_ACTIVE = 30
+POLL_INTERVAL_IDLE_MIN = 120
+POLL_INTERVAL_IDLE_MAX = 900
+
+# Robots a fleet_command sends to at once.
+FLEET_PARALLELISM = 8
+
+# Default and maximum length of a start_event_recording capture (seconds).
+EVENT_RECORDING_DURATION = 600
+EVENT_RECORDING_MAX_DURATION = 86400
+
+# Default and maximum length of a start_profile window (seconds).
+PROFILE_DURATION = 60
+PROFILE_MAX_DURATION = 1800
+
+# Clean history: cloud logs requested on first sync, per later sync, and at
+# most when widening the window to catch up after an outage.
+CLEAN_LOG_FETCH_INITIAL = 100
+CLEAN_LOG_FETCH_MIN = 10
+CLEAN_LOG_FETCH_MAX = 400
+# Seconds between clean log syncs, and after a job ends before syncing.
+CLEAN_LOG_SYNC_INTERVAL = 6 * 3600
+CLEAN_LOG_SYNC_DELAY = 120
+# Dispatcher signal sent when a robot's history changed.
+SIGNAL_HISTORY_UPDATED = f"{DOMAIN}_history_updated_{{did}}"
@@ -0,0 +1,37 @@
+"""Diagnostics: connection state, counters, latency histograms and reload timings."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_ACCOUNT, CONF_PASSWORD, DATA_LIFECYCLE, DOMAIN
+from .helpers import entry_devices
+from .hub import YeediHub
+
+TO_REDACT = {CONF_ACCOUNT, CONF_PASSWORD}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    hub: YeediHub = hass.data[DOMAIN][entry.entry_id]
+    robots = {}
+    for did, name in entry_devices(entry.data):
+        metrics = hub.device_metrics.get(did)
+        robots[did] = {
+            "name": name,
+            "metrics": metrics.as_dict() if metrics is not None else None,
+        }
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "hub": hub.diagnostics(),
+        "lifecycle": hass.data[DOMAIN][DATA_LIFECYCLE].metrics.as_dict(),
+        "robots": robots,
+    }
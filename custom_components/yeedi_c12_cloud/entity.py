@@ -0,0 +1,109 @@
+"""Base class for the per-device helper entities (sensors, map, ...)."""
+
+from __future__ import annotations
+
+from abc import abstractmethod
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Callable, Optional
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers.entity import DeviceInfo, Entity
+
+from .const import DOMAIN
+from .hub import YeediHub, backoff_delay
+from .subscriptions import Consumer, EventSubscriptions
+
+if TYPE_CHECKING:
+    from deebot_client.device import Device as DeebotDevice
+    from deebot_client.events import AvailabilityEvent
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class YeediEntity(Entity):
+    """Entity attached to the same hub device handle as the vacuum.
+
+    Connecting happens in the background, exactly like the vacuum; once the
+    shared device is available :meth:`_async_subscribe` hooks the entity up
+    to the events it renders, through the robot's shared
+    :class:`EventSubscriptions`.  A disabled entity is never added, so the
+    events only it needs are not subscribed at all.  Subclasses write state
+    only when their own value changes.
+    """
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _attr_available = False
+
+    def __init__(self, entry: ConfigEntry, hub: YeediHub, did: str, key: str) -> None:
+        self.entry = entry
+        self._hub = hub
+        self._did = did
+        self._device_unique = f"{DOMAIN}:{self._did}"
+        self._attr_unique_id = f"{self._device_unique}:{key}"
+        self._attr_device_info = DeviceInfo(identifiers={(DOMAIN, self._device_unique)})
+        self._bot: Optional[DeebotDevice] = None
+        self._events: Optional[EventSubscriptions] = None
+        self._unsubs: list[Callable[[], None]] = []
+        self._connect_task: Optional[asyncio.Task] = None
+
+    async def async_added_to_hass(self) -> None:
+        self._connect_task = self.entry.async_create_background_task(
+            self.hass, self._async_connect_loop(), f"{DOMAIN} connect {self._attr_unique_id}"
+        )
+
+    async def async_will_remove_from_hass(self) -> None:
+        if self._connect_task is not None:
+            self._connect_task.cancel()
+            self._connect_task = None
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs.clear()
+        self._bot = None
+        self._events = None
+
+    async def _async_connect_loop(self) -> None:
+        attempt = 0
+        while True:
+            try:
+                bot = await self._hub.async_get_device(self._did)
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:
+                delay = backoff_delay(attempt)
+                attempt += 1
+                _LOGGER.debug(
+                    "%s not connected (%s); retrying in %.0fs", self._attr_unique_id, err, delay
+                )
+                await asyncio.sleep(delay)
+                continue
+            break
+
+        self._bot = bot
+        self._events = self._hub.event_subscriptions(self._did)
+        if not self._async_subscribe(bot):
+            _LOGGER.debug("%s is not supported by %s", self._attr_unique_id, self._did)
+            return
+        self._subscribe("AvailabilityEvent", self._on_availability)
+        self._attr_available = True
+        self.async_write_ha_state()
+
+    @abstractmethod
+    def _async_subscribe(self, bot: DeebotDevice) -> bool:
+        """Subscribe to the entity's events; return False if unsupported."""
+
+    def _subscribe(self, event: type | str, consumer: Consumer) -> bool:
+        """Receive ``event`` until removal; False if this client lacks it."""
+
+        unsub = self._events.subscribe(event, consumer)
+        if unsub is None:
+            return False
+        self._unsubs.append(unsub)
+        return True
+
+    async def _on_availability(self, event: AvailabilityEvent) -> None:
+        available = bool(event.available)
+        if available != self._attr_available:
+            self._attr_available = available
+            self.async_write_ha_state()
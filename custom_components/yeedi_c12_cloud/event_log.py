@@ -0,0 +1,190 @@
+"""Append-only recording of a robot's event stream, for offline replay.
+
+A recording is a JSON Lines file.  The first line is a header object, every
+following line one event::
+
+    {"format": "yeedi-events", "version": 2, "did": "...", "started": 1760000000.0}
+    [0.012, "BatteryEvent", {"value": 87}]
+    [0.430, "water_info.WaterAmountEvent", {"value": {"__enum__": "high", "value": 3}}]
+
+The first element is seconds since the recording started.  Enum values are
+stored by lowercased member name, which is also a key the normalisation
+tables accept.  Integer enums (states, fan speeds, water amounts) keep their
+value as well and are read back as :class:`RecordedEnum`, which is both, so
+replayed events map to the same states as live ones.  Version 1 recordings
+only hold the name.
+``scripts/replay_events.py`` feeds a recording back through the vacuum's
+handlers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import enum
+import json
+import logging
+from pathlib import Path
+import time
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Optional, TextIO
+
+from homeassistant.core import HomeAssistant
+
+if TYPE_CHECKING:
+    from .subscriptions import EventSubscriptions
+
+_LOGGER = logging.getLogger(__name__)
+
+FORMAT = "yeedi-events"
+VERSION = 2
+
+# Buffered events written per executor job.
+_FLUSH_EVERY = 64
+
+
+# Key marking an encoded integer enum member.
+_ENUM_KEY = "__enum__"
+
+
+class RecordedEnum(int):
+    """An integer enum member read back from a recording.
+
+    Compares and converts like the member's value and, like the member, has
+    a ``name`` for the normalisation tables.
+    """
+
+    def __new__(cls, value: int, name: str) -> RecordedEnum:
+        member = super().__new__(cls, value)
+        member.name = name
+        return member
+
+    def __repr__(self) -> str:
+        return f"<{self.name}: {int(self)}>"
+
+
+def encode_value(value: Any) -> Any:
+    """Turn an event field into plain JSON data."""
+
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, enum.Enum):
+        if isinstance(value, int):
+            return {_ENUM_KEY: value.name.lower(), "value": int(value)}
+        return value.name.lower()
+    if isinstance(value, (int, float)):
+        return value
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {f.name: encode_value(getattr(value, f.name)) for f in dataclasses.fields(value)}
+    if isinstance(value, dict):
+        return {str(k): encode_value(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [encode_value(v) for v in value]
+    return str(value)
+
+
+def decode_value(value: Any) -> Any:
+    """Inverse of :func:`encode_value`, with objects as attribute namespaces."""
+
+    if isinstance(value, dict):
+        if _ENUM_KEY in value:
+            return RecordedEnum(value["value"], value[_ENUM_KEY])
+        return SimpleNamespace(**{k: decode_value(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return [decode_value(v) for v in value]
+    return value
+
+
+def read_events(path: str | Path) -> tuple[dict[str, Any], Iterator[tuple[float, str, Any]]]:
+    """Return the header and an iterator of ``(offset, event_name, event)``."""
+
+    handle = open(path, encoding="utf-8")
+    header = json.loads(handle.readline() or "{}")
+    if header.get("format") != FORMAT:
+        handle.close()
+        raise ValueError(f"{path} is not a {FORMAT} recording")
+
+    def events() -> Iterator[tuple[float, str, Any]]:
+        with handle:
+            for line in handle:
+                if not line.strip():
+                    continue
+                offset, name, fields = json.loads(line)
+                yield offset, name, decode_value(fields)
+
+    return header, events()
+
+
+class EventRecorder:
+    """Subscribe to a device's events and append them to a recording file.
+
+    Events are buffered in memory and written by executor jobs in batches,
+    so recording adds a list append to the event path and no blocking I/O.
+    """
+
+    def __init__(self, hass: HomeAssistant, path: Path, did: str) -> None:
+        self._hass = hass
+        self.path = path
+        self._did = did
+        self._file: Optional[TextIO] = None
+        self._buffer: list[str] = []
+        self._write_lock = asyncio.Lock()
+        self._unsubs: list[Callable[[], None]] = []
+        self._started = 0.0
+        self.events = 0
+
+    @property
+    def active(self) -> bool:
+        return self._file is not None
+
+    async def async_start(self, events: EventSubscriptions, event_names: Iterable[str]) -> None:
+        header = {"format": FORMAT, "version": VERSION, "did": self._did, "started": time.time()}
+        self._file = await self._hass.async_add_executor_job(self._open, header)
+        self._started = time.monotonic()
+        # Shares the robot's subscriptions; the current value of each event
+        # is replayed into the file first.
+        for name in event_names:
+            if (unsub := events.subscribe(name, self._recorder_for(name))) is not None:
+                self._unsubs.append(unsub)
+        _LOGGER.info("Recording %s events to %s", self._did, self.path)
+
+    async def async_stop(self) -> None:
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs.clear()
+        if self._file is None:
+            return
+        await self._async_flush()
+        handle, self._file = self._file, None
+        await self._hass.async_add_executor_job(handle.close)
+        _LOGGER.info("Recorded %d %s events to %s", self.events, self._did, self.path)
+
+    def _recorder_for(self, name: str) -> Callable[[Any], Any]:
+        async def record(event: Any) -> None:
+            fields = encode_value(event)
+            offset = round(time.monotonic() - self._started, 3)
+            self._buffer.append(json.dumps([offset, name, fields], separators=(",", ":")))
+            self.events += 1
+            if len(self._buffer) >= _FLUSH_EVERY:
+                self._hass.async_create_task(self._async_flush())
+
+        return record
+
+    async def _async_flush(self) -> None:
+        async with self._write_lock:
+            if not self._buffer or self._file is None:
+                return
+            lines, self._buffer = self._buffer, []
+            await self._hass.async_add_executor_job(self._write, self._file, lines)
+
+    def _open(self, header: dict[str, Any]) -> TextIO:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        handle = open(self.path, "a", encoding="utf-8")
+        handle.write(json.dumps(header, separators=(",", ":")) + "\n")
+        handle.flush()
+        return handle
+
+    @staticmethod
+    def _write(handle: TextIO, lines: list[str]) -> None:
+        handle.write("\n".join(lines) + "\n")
+        handle.flush()
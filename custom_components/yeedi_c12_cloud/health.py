@@ -0,0 +1,183 @@
+"""MQTT push health monitor with an adaptive polling fallback.
+
+The integration is push based: every state change arrives as an MQTT
+message.  If the broker connection stalls silently, nothing tells us, so
+:class:`PushHealthMonitor` watches the time since the last MQTT message of
+the account.  Once it exceeds ``PUSH_STALE_AFTER`` the hub is asked to
+reconnect and the monitor starts polling each device until a new push
+message arrives.
+
+Polling is adaptive per device: every ``POLL_INTERVAL_ACTIVE`` seconds while
+the robot cleans or returns, and from ``POLL_INTERVAL_IDLE_MIN`` doubling to
+``POLL_INTERVAL_IDLE_MAX`` while it sits idle or docked and nothing changes.
+One poll refreshes battery, clean/charge state and errors together.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    DOMAIN,
+    HEALTH_CHECK_INTERVAL,
+    POLL_INTERVAL_ACTIVE,
+    POLL_INTERVAL_IDLE_MAX,
+    POLL_INTERVAL_IDLE_MIN,
+    PUSH_STALE_AFTER,
+)
+from .metrics import Metrics
+from .normalize import clean_state
+from .subscriptions import resolve_event
+
+if TYPE_CHECKING:
+    from deebot_client.device import Device as DeebotDevice
+
+    from .subscriptions import EventSubscriptions
+
+_LOGGER = logging.getLogger(__name__)
+
+# Event classes refreshed by one poll.
+_POLLED_EVENTS = ("BatteryEvent", "StateEvent", "ErrorEvent")
+_ACTIVE_STATES = frozenset({"cleaning", "returning"})
+
+
+@dataclass
+class _PolledDevice:
+    bot: DeebotDevice
+    state: Optional[str] = None
+    interval: float = POLL_INTERVAL_ACTIVE
+    next_poll: float = 0.0
+    changed: bool = False
+    unsubs: list[Callable[[], None]] = field(default_factory=list)
+
+
+class PushHealthMonitor:
+    """Detect a silent push channel and poll the account's devices meanwhile."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        *,
+        name: str,
+        last_push: Callable[[], Optional[datetime]],
+        reconnect: Callable[[], None],
+        metrics: Metrics,
+    ) -> None:
+        self.hass = hass
+        self._name = name
+        self._last_push = last_push
+        self._reconnect = reconnect
+        self.metrics = metrics
+        self._devices: dict[str, _PolledDevice] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._started_at = datetime.now(timezone.utc)
+        self.degraded_since: Optional[datetime] = None
+
+    @property
+    def push_healthy(self) -> bool:
+        return self.degraded_since is None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._started_at = datetime.now(timezone.utc)
+            self._task = self.hass.async_create_background_task(
+                self._async_run(), f"{DOMAIN} push health {self._name}"
+            )
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for device in self._devices.values():
+            for unsub in device.unsubs:
+                unsub()
+        self._devices.clear()
+        self.degraded_since = None
+
+    def track(self, did: str, bot: DeebotDevice, events: EventSubscriptions) -> None:
+        """Follow the state of ``did`` so polling can adapt to it."""
+
+        if did in self._devices:
+            return
+        device = self._devices[did] = _PolledDevice(bot)
+
+        async def on_state(event: Any) -> None:
+            state = clean_state(event.state)
+            if state is not None and state != device.state:
+                device.state = state
+                device.changed = True
+
+        if (unsub := events.subscribe("StateEvent", on_state)) is not None:
+            device.unsubs.append(unsub)
+
+    def staleness(self) -> float:
+        """Seconds since the last MQTT message (or since monitoring began)."""
+
+        last = self._last_push() or self._started_at
+        return (datetime.now(timezone.utc) - last).total_seconds()
+
+    async def _async_run(self) -> None:
+        while True:
+            await asyncio.sleep(HEALTH_CHECK_INTERVAL)
+            stale = self.staleness()
+            self.metrics.observe("push_staleness", stale)
+            if self.degraded_since is None:
+                if stale > PUSH_STALE_AFTER:
+                    self._enter_degraded(stale)
+            elif (self._last_push() or self._started_at) > self.degraded_since:
+                self._leave_degraded()
+            if self.degraded_since is not None:
+                self._poll_due()
+
+    def _enter_degraded(self, stale: float) -> None:
+        _LOGGER.info(
+            "No push messages for %s in %.0fs; reconnecting and polling until they resume",
+            self._name,
+            stale,
+        )
+        self.degraded_since = datetime.now(timezone.utc)
+        self.metrics.incr("push_degraded")
+        now = time.monotonic()
+        for device in self._devices.values():
+            device.interval = POLL_INTERVAL_ACTIVE
+            device.next_poll = now
+        self._reconnect()
+
+    def _leave_degraded(self) -> None:
+        _LOGGER.info("Push messages for %s resumed; polling stopped", self._name)
+        self.degraded_since = None
+        self.metrics.incr("push_recovered")
+
+    def _poll_due(self) -> None:
+        now = time.monotonic()
+        for device in self._devices.values():
+            if now < device.next_poll:
+                continue
+            self._poll(device)
+            device.interval = self._next_interval(device)
+            device.changed = False
+            device.next_poll = now + device.interval
+
+    def _poll(self, device: _PolledDevice) -> None:
+        self.metrics.incr("polls")
+        for name in _POLLED_EVENTS:
+            event_class = resolve_event(name)
+            if event_class is not None:
+                # Runs the model's own refresh commands; results arrive as
+                # ordinary events, exactly like pushed ones.
+                device.bot.events.request_refresh(event_class)
+
+    @staticmethod
+    def _next_interval(device: _PolledDevice) -> float:
+        if device.state in _ACTIVE_STATES or device.state is None:
+            return POLL_INTERVAL_ACTIVE
+        if device.changed:
+            return POLL_INTERVAL_IDLE_MIN
+        return min(POLL_INTERVAL_IDLE_MAX, max(POLL_INTERVAL_IDLE_MIN, device.interval * 2))
@@ -3,11 +3,49 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, replace
-from typing import Optional
+import hashlib
+import os
+from typing import TYPE_CHECKING, Any, Mapping, Optional
 
-from aiohttp import ClientSession
+from .const import CONF_DEVICE_ID, CONF_DEVICE_NAME, CONF_DEVICES
 
-from deebot_client.authentication import RestConfiguration, create_rest_config
+if TYPE_CHECKING:
+    from aiohttp import ClientSession
+    from deebot_client.authentication import RestConfiguration
+
+
+# Point the integration (and the scripts) at a local stand-in cloud, e.g. the
+# one in ``scripts/fake_cloud``.  Explicit arguments take precedence.
+ENV_OVERRIDE_REST_URL = "YEEDI_OVERRIDE_REST_URL"
+ENV_OVERRIDE_MQTT_URL = "YEEDI_OVERRIDE_MQTT_URL"
+
+
+DEFAULT_DEVICE_NAME = "Yeedi C12"
+
+
+def md5(text: str) -> str:
+    """Hex MD5 of ``text``, as deebot_client's ``util.md5`` computes it.
+
+    Kept here so hashing a password or storage key does not import
+    deebot_client.
+    """
+
+    return hashlib.md5(str(text).encode("utf8")).hexdigest()  # noqa: S324
+
+
+def entry_devices(data: Mapping[str, Any]) -> list[tuple[str, str]]:
+    """Return ``(did, name)`` for every robot a config entry covers.
+
+    Entries created by the multi-select flow list their robots under
+    ``devices``; older entries hold a single ``device_id``.
+    """
+
+    if CONF_DEVICES in data:
+        return [
+            (d[CONF_DEVICE_ID], d.get(CONF_DEVICE_NAME) or d[CONF_DEVICE_ID])
+            for d in data[CONF_DEVICES]
+        ]
+    return [(data[CONF_DEVICE_ID], data.get(CONF_DEVICE_NAME) or DEFAULT_DEVICE_NAME)]
 
 
 @dataclass(frozen=True, slots=True)
@@ -23,6 +61,8 @@ def create_yeedi_api_config(
     *,
     device_id: str,
     alpha_2_country: str,
+    override_rest_url: Optional[str] = None,
+    override_mqtt_url: Optional[str] = None,
 ) -> YeediApiConfig:
     """Return a Yeedi-specific REST configuration and MQTT override (if any).
 
@@ -32,17 +72,29 @@ def create_yeedi_api_config(
     the Ecovacs-operated ``mq*.ecouser.net`` brokers, so no override is required
     for MQTT today; keeping the default documents that behaviour for future
     maintainers.
+
+    ``override_rest_url`` / ``override_mqtt_url`` (or the
+    ``YEEDI_OVERRIDE_REST_URL`` / ``YEEDI_OVERRIDE_MQTT_URL`` environment
+    variables) route every REST call and the MQTT connection to a single
+    local endpoint instead, which is how the offline fake cloud is used.
     """
 
+    from deebot_client.authentication import create_rest_config
+
+    override_rest_url = override_rest_url or os.getenv(ENV_OVERRIDE_REST_URL) or None
+    override_mqtt_url = override_mqtt_url or os.getenv(ENV_OVERRIDE_MQTT_URL) or None
     base = create_rest_config(
         session,
         device_id=device_id,
         alpha_2_country=alpha_2_country,
+        override_rest_url=override_rest_url,
     )
+    if override_rest_url:
+        return YeediApiConfig(rest=base, mqtt_override=override_mqtt_url)
     country_slug = base.country.lower()
     tld = "cn" if alpha_2_country.upper() == "CN" else "com"
     login_url = f"https://gl-{country_slug}-api.yeedi.{tld}"
     auth_code_url = f"https://gl-{country_slug}-openapi.yeedi.{tld}"
 
     rest = replace(base, login_url=login_url, auth_code_url=auth_code_url)
-    return YeediApiConfig(rest=rest, mqtt_override=None)
+    return YeediApiConfig(rest=rest, mqtt_override=override_mqtt_url)
@@ -0,0 +1,376 @@
+"""Local clean history: an indexed SQLite store with running aggregates.
+
+Completed jobs come from two sources:
+
+* the robot's cloud clean logs (``GetCleanLogs``), synced incrementally
+  against a per-robot high-water mark, and
+* clean-state transitions seen live, recorded as provisional ``local`` jobs
+  until the matching cloud log (started within :data:`_MATCH_WINDOW`)
+  replaces them.
+
+Daily and weekly totals are kept in their own tables and updated in the
+same transaction as every insert or replacement, so reading today's or
+this week's numbers is one primary-key lookup however long the history
+grows.  All database work runs in the executor.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import logging
+from pathlib import Path
+import sqlite3
+import threading
+import time
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP, STATE_CLEANING, STATE_DOCKED, STATE_IDLE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CLEAN_LOG_FETCH_INITIAL,
+    CLEAN_LOG_FETCH_MAX,
+    CLEAN_LOG_FETCH_MIN,
+    CLEAN_LOG_SYNC_DELAY,
+    CLEAN_LOG_SYNC_INTERVAL,
+    DATA_HISTORY,
+    DOMAIN,
+    SIGNAL_HISTORY_UPDATED,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+HISTORY_DB = "history.db"
+
+# A cloud log starting this close to a local job (seconds) is the same job.
+_MATCH_WINDOW = 300
+
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS jobs (
+        did TEXT NOT NULL,
+        started INTEGER NOT NULL,
+        day TEXT NOT NULL,
+        week TEXT NOT NULL,
+        duration INTEGER NOT NULL,
+        area INTEGER NOT NULL,
+        type TEXT,
+        stop_reason TEXT,
+        source TEXT NOT NULL,
+        PRIMARY KEY (did, started)
+    ) WITHOUT ROWID""",
+    "CREATE INDEX IF NOT EXISTS jobs_started ON jobs (started)",
+    """CREATE TABLE IF NOT EXISTS daily (
+        did TEXT NOT NULL, day TEXT NOT NULL,
+        jobs INTEGER NOT NULL, duration INTEGER NOT NULL, area INTEGER NOT NULL,
+        PRIMARY KEY (did, day)
+    ) WITHOUT ROWID""",
+    """CREATE TABLE IF NOT EXISTS weekly (
+        did TEXT NOT NULL, week TEXT NOT NULL,
+        jobs INTEGER NOT NULL, duration INTEGER NOT NULL, area INTEGER NOT NULL,
+        PRIMARY KEY (did, week)
+    ) WITHOUT ROWID""",
+    """CREATE TABLE IF NOT EXISTS sync (
+        did TEXT PRIMARY KEY, last_ts INTEGER NOT NULL
+    ) WITHOUT ROWID""",
+)
+
+
+@dataclass(slots=True, frozen=True)
+class CleanJob:
+    """One completed cleaning job."""
+
+    did: str
+    started: int
+    duration: int
+    area: int = 0
+    type: Optional[str] = None
+    stop_reason: Optional[str] = None
+    source: str = "cloud"
+
+
+def period_keys(timestamp: float) -> tuple[str, str]:
+    """Local ``(YYYY-MM-DD, YYYY-Www)`` keys for a UNIX timestamp."""
+
+    local = dt_util.as_local(dt_util.utc_from_timestamp(timestamp))
+    year, week, _ = local.isocalendar()
+    return local.date().isoformat(), f"{year}-W{week:02d}"
+
+
+def period_start(period: str, timestamp: float) -> datetime:
+    """Local midnight starting the ``"day"`` or (ISO, Monday) ``"week"``."""
+
+    day = dt_util.as_local(dt_util.utc_from_timestamp(timestamp)).date()
+    if period == "week":
+        day -= timedelta(days=day.weekday())
+    return dt_util.start_of_local_day(day)
+
+
+class _HistoryDB:
+    """Blocking SQLite access; every method runs in the executor."""
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            for statement in _SCHEMA:
+                self._conn.execute(statement)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _bump(self, did: str, day: str, week: str, sign: int, duration: int, area: int) -> None:
+        for table, column, key in (("daily", "day", day), ("weekly", "week", week)):
+            self._conn.execute(
+                f"INSERT INTO {table} (did, {column}, jobs, duration, area) VALUES (?, ?, ?, ?, ?) "
+                f"ON CONFLICT (did, {column}) DO UPDATE SET jobs = jobs + excluded.jobs, "
+                "duration = duration + excluded.duration, area = area + excluded.area",
+                (did, key, sign, sign * duration, sign * area),
+            )
+
+    def add_jobs(self, jobs: Iterable[tuple[CleanJob, str, str]]) -> set[str]:
+        """Insert new jobs and fold them into the aggregates; return changed dids."""
+
+        changed: set[str] = set()
+        with self._lock, self._conn:
+            for job, day, week in jobs:
+                if job.source == "cloud":
+                    # Replace the provisional local record of the same job.
+                    row = self._conn.execute(
+                        "SELECT started, day, week, duration, area FROM jobs "
+                        "WHERE did = ? AND source = 'local' AND started BETWEEN ? AND ? "
+                        "ORDER BY abs(started - ?) LIMIT 1",
+                        (job.did, job.started - _MATCH_WINDOW, job.started + _MATCH_WINDOW, job.started),
+                    ).fetchone()
+                    if row is not None:
+                        started, old_day, old_week, duration, area = row
+                        self._conn.execute(
+                            "DELETE FROM jobs WHERE did = ? AND started = ?", (job.did, started)
+                        )
+                        self._bump(job.did, old_day, old_week, -1, duration, area)
+                elif self._conn.execute(
+                    "SELECT 1 FROM jobs WHERE did = ? AND source = 'cloud' AND started BETWEEN ? AND ?",
+                    (job.did, job.started - _MATCH_WINDOW, job.started + _MATCH_WINDOW),
+                ).fetchone():
+                    # The cloud log got here first.
+                    continue
+                inserted = self._conn.execute(
+                    "INSERT OR IGNORE INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        job.did, job.started, day, week, job.duration, job.area,
+                        job.type, job.stop_reason, job.source,
+                    ),
+                ).rowcount
+                if inserted:
+                    self._bump(job.did, day, week, 1, job.duration, job.area)
+                    changed.add(job.did)
+                if job.source == "cloud":
+                    self._conn.execute(
+                        "INSERT INTO sync (did, last_ts) VALUES (?, ?) ON CONFLICT (did) "
+                        "DO UPDATE SET last_ts = max(last_ts, excluded.last_ts)",
+                        (job.did, job.started),
+                    )
+        return changed
+
+    def last_timestamp(self, did: str) -> Optional[int]:
+        with self._lock:
+            row = self._conn.execute("SELECT last_ts FROM sync WHERE did = ?", (did,)).fetchone()
+        return row[0] if row else None
+
+    def aggregates(self, did: str, day: str, week: str) -> dict[str, dict[str, int]]:
+        out: dict[str, dict[str, int]] = {}
+        with self._lock:
+            for period, table, column, key in (
+                ("day", "daily", "day", day),
+                ("week", "weekly", "week", week),
+            ):
+                row = self._conn.execute(
+                    f"SELECT jobs, duration, area FROM {table} WHERE did = ? AND {column} = ?",
+                    (did, key),
+                ).fetchone() or (0, 0, 0)
+                out[period] = {"jobs": row[0], "duration": row[1], "area": row[2]}
+        return out
+
+
+class CleanHistory:
+    """Shared clean-history store for every robot of this Home Assistant."""
+
+    def __init__(self, hass: HomeAssistant, db: _HistoryDB) -> None:
+        self.hass = hass
+        self._db = db
+
+    async def async_add_jobs(self, jobs: Iterable[CleanJob]) -> None:
+        rows = [(job, *period_keys(job.started)) for job in jobs]
+        if not rows:
+            return
+        changed = await self.hass.async_add_executor_job(self._db.add_jobs, rows)
+        for did in changed:
+            async_dispatcher_send(self.hass, SIGNAL_HISTORY_UPDATED.format(did=did))
+
+    async def async_last_timestamp(self, did: str) -> Optional[int]:
+        return await self.hass.async_add_executor_job(self._db.last_timestamp, did)
+
+    async def async_aggregates(self, did: str) -> dict[str, dict[str, int]]:
+        """Totals (``jobs``, ``duration`` in s, ``area`` in m²) for today and this week."""
+
+        day, week = period_keys(time.time())
+        return await self.hass.async_add_executor_job(self._db.aggregates, did, day, week)
+
+    async def async_close(self) -> None:
+        await self.hass.async_add_executor_job(self._db.close)
+
+
+async def async_get_history(hass: HomeAssistant) -> CleanHistory:
+    """Open the store on first use and close it when Home Assistant stops."""
+
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    pending = domain_data.get(DATA_HISTORY)
+    if pending is None:
+        pending = domain_data[DATA_HISTORY] = hass.loop.create_future()
+        try:
+            path = Path(hass.config.path(DOMAIN, HISTORY_DB))
+            db = await hass.async_add_executor_job(_HistoryDB, path)
+        except BaseException as err:
+            del domain_data[DATA_HISTORY]
+            pending.set_exception(err)
+            pending.exception()  # re-raised below; don't warn about it
+            raise
+        history = CleanHistory(hass, db)
+
+        async def _close(_event: Event) -> None:
+            await history.async_close()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _close)
+        pending.set_result(history)
+    return await asyncio.shield(pending)
+
+
+class CleanLogSync:
+    """Feed one robot's jobs into the history store.
+
+    deebot_client refreshes the clean logs itself when the entity first
+    subscribes to them, which serves as the startup sync.  After that only a
+    small window of the newest logs is requested, periodically and shortly
+    after each job ends; if every log in the window is new the window
+    doubles (up to a cap) and the request is repeated, so nothing is missed
+    after a long outage without refetching the whole history each time.
+    Logs at or before the high-water mark are never written again.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        history: CleanHistory,
+        did: str,
+        request: Optional[Callable[[int], Awaitable[Any]]],
+    ) -> None:
+        self.hass = hass
+        self._history = history
+        self._did = did
+        self._request = request
+        self._requested = 0
+        self._last_ts: Optional[int] = None
+        # High-water mark when the current sync round began.
+        self._floor: Optional[int] = None
+        self._state: Optional[str] = None
+        self._job_started: Optional[int] = None
+        self._unsubs: list[CALLBACK_TYPE] = []
+        self._sync_unsub: Optional[CALLBACK_TYPE] = None
+
+    async def async_start(self) -> None:
+        self._last_ts = self._floor = await self._history.async_last_timestamp(self._did)
+        if self._request is None:
+            return
+        self._unsubs.append(
+            async_track_time_interval(
+                self.hass, self._async_sync, timedelta(seconds=CLEAN_LOG_SYNC_INTERVAL)
+            )
+        )
+
+    @callback
+    def stop(self) -> None:
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs.clear()
+        if self._sync_unsub is not None:
+            self._sync_unsub()
+            self._sync_unsub = None
+
+    async def _async_sync(self, _now: Any = None, count: Optional[int] = None) -> None:
+        if count is None:
+            self._floor = self._last_ts
+            count = CLEAN_LOG_FETCH_MIN if self._floor is not None else CLEAN_LOG_FETCH_INITIAL
+        self._requested = count
+        try:
+            await self._request(count)
+        except Exception as err:
+            _LOGGER.debug("Clean log sync for %s failed: %s", self._did, err)
+
+    @callback
+    def on_state(self, state: Optional[str]) -> None:
+        """Track clean-state transitions; called for every state event."""
+
+        previous, self._state = self._state, state
+        if state == previous:
+            return
+        if state == STATE_CLEANING and self._job_started is None:
+            self._job_started = int(time.time())
+        elif state in (STATE_DOCKED, STATE_IDLE) and self._job_started is not None:
+            started, self._job_started = self._job_started, None
+            job = CleanJob(
+                did=self._did,
+                started=started,
+                duration=int(time.time()) - started,
+                source="local",
+            )
+            self.hass.async_create_task(self._history.async_add_jobs([job]))
+            if self._request is not None and self._sync_unsub is None:
+                # Give the cloud a moment to publish the job's log.
+                self._sync_unsub = async_call_later(
+                    self.hass, CLEAN_LOG_SYNC_DELAY, self._async_delayed_sync
+                )
+
+    async def _async_delayed_sync(self, _now: datetime) -> None:
+        self._sync_unsub = None
+        await self._async_sync()
+
+    async def async_on_clean_logs(self, event: Any) -> None:
+        jobs = []
+        for entry in getattr(event, "logs", None) or ():
+            try:
+                started = int(entry.timestamp)
+            except (AttributeError, TypeError, ValueError):
+                continue
+            if self._floor is not None and started <= self._floor:
+                continue
+            reason = getattr(entry, "stop_reason", None)
+            jobs.append(
+                CleanJob(
+                    did=self._did,
+                    started=started,
+                    duration=int(getattr(entry, "duration", 0) or 0),
+                    area=int(getattr(entry, "area", 0) or 0),
+                    type=getattr(entry, "type", None),
+                    stop_reason=getattr(reason, "name", reason),
+                )
+            )
+        if not jobs:
+            return
+        await self._history.async_add_jobs(jobs)
+        self._last_ts = max(self._last_ts or 0, *(job.started for job in jobs))
+        received = len(getattr(event, "logs", None) or ())
+        if (
+            self._requested
+            and self._floor is not None
+            and len(jobs) == received >= self._requested
+            and self._requested < CLEAN_LOG_FETCH_MAX
+        ):
+            # The whole window was new: there may be more behind it.
+            await self._async_sync(count=min(self._requested * 2, CLEAN_LOG_FETCH_MAX))
@@ -0,0 +1,433 @@
+"""Per-account connection hub shared by all Yeedi vacuum entities."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+from functools import partial
+import logging
+import random
+import time
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Optional
+
+import aiohttp
+from homeassistant.core import HomeAssistant
+
+from .cache import YeediAuthCache
+from .command_queue import CommandQueue
+from .const import (
+    CONNECT_TIMEOUT,
+    DOMAIN,
+    RECONNECT_BACKOFF_MAX,
+    RECONNECT_BACKOFF_MIN,
+    TEARDOWN_TIMEOUT,
+)
+from .health import PushHealthMonitor
+from .helpers import create_yeedi_api_config, md5
+from .loader import async_import_client
+from .metrics import Metrics
+from .subscriptions import EventSubscriptions
+
+if TYPE_CHECKING:
+    from deebot_client.api_client import ApiClient
+    from deebot_client.authentication import Authenticator
+    from deebot_client.device import Device as DeebotDevice
+    from deebot_client.events import AvailabilityEvent
+    from deebot_client.models import Credentials
+    from deebot_client.mqtt_client import MqttClient
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def hub_key(account: str, country: str) -> str:
+    """Return the ``hass.data`` key identifying one cloud account."""
+
+    return f"{account.strip().lower()}:{country.strip().upper()}"
+
+
+def device_did(device: Any) -> Optional[str]:
+    """Return the cloud ``did`` for a device entry returned by ``get_devices``."""
+
+    api = getattr(device, "api", None)
+    if isinstance(api, dict) and api.get("did"):
+        return api["did"]
+    return getattr(device, "did", None) or getattr(device, "id", None)
+
+
+def backoff_delay(attempt: int) -> float:
+    """Return a jittered exponential delay for retry number ``attempt``.
+
+    Half of the window is fixed and half is random, so hubs that lost the
+    broker at the same moment do not all log in again at the same moment.
+    """
+
+    window = min(RECONNECT_BACKOFF_MAX, RECONNECT_BACKOFF_MIN * 2 ** min(attempt, 16))
+    return window / 2 + random.uniform(0, window / 2)
+
+
+class YeediHub:
+    """Own one HTTP session, authenticator and MQTT connection per account.
+
+    Config entries sharing an account and country reuse the same hub, so a
+    site with several robots logs in once and holds a single broker
+    connection.  Entities ask the hub for a :class:`DeebotDevice` handle by
+    ``did`` instead of building their own client stack.
+
+    The client device id, issued tokens and the last device list are kept
+    in a :class:`YeediAuthCache`, so a restart reuses them and only falls
+    back to a full password login when the cached token is rejected.
+
+    Connects are single-flight: concurrent callers share one login and one
+    MQTT client.  When every device on the account reports unavailable the
+    hub assumes the broker connection stalled and reconnects with jittered
+    exponential backoff; :meth:`async_wait_ready` lets commands wait for
+    that instead of racing it.  A broker connection that stalls without any
+    device going unavailable is caught by :attr:`health`, which reconnects
+    and polls the devices until push messages resume.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        *,
+        account: str,
+        password: str,
+        country: str,
+    ) -> None:
+        self.hass = hass
+        self.account = account
+        self.country = country
+        self._password = password
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._auth: Optional[Authenticator] = None
+        self._mqtt: Optional[MqttClient] = None
+        self._devices: list[Any] = []
+        self._bots: dict[str, DeebotDevice] = {}
+        self._queues: dict[str, CommandQueue] = {}
+        self._events: dict[str, EventSubscriptions] = {}
+        self._cache = YeediAuthCache(hass, key=self.key, password=password)
+        self._cache_loaded = False
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self._ready = asyncio.Event()
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._unavailable: set[str] = set()
+        self._unsubs: list[Callable[[], None]] = []
+        self.metrics = Metrics()
+        # Per-robot metrics registered by the vacuum entities (diagnostics).
+        self.device_metrics: dict[str, Metrics] = {}
+        self.health = PushHealthMonitor(
+            hass,
+            name=self.key,
+            last_push=self._last_push,
+            reconnect=self._schedule_reconnect,
+            metrics=self.metrics,
+        )
+        self.entry_ids: set[str] = set()
+
+    @property
+    def key(self) -> str:
+        return hub_key(self.account, self.country)
+
+    @property
+    def connected(self) -> bool:
+        return self._mqtt is not None
+
+    def uses_password(self, password: str) -> bool:
+        return password == self._password
+
+    @property
+    def devices(self) -> list[Any]:
+        """Return the MQTT-capable devices discovered for this account."""
+
+        return list(self._devices)
+
+    async def async_connect(self) -> None:
+        """Log in, discover devices and open the shared MQTT connection."""
+
+        if self._mqtt is not None:
+            return
+        async with self._lock:
+            if self._mqtt is not None:
+                return
+            await async_import_client(self.hass)
+            if not self._cache_loaded:
+                await self._cache.async_load()
+                self._cache_loaded = True
+            device_id = self._cache.device_id
+
+            self._session = aiohttp.ClientSession()
+            started = time.monotonic()
+            try:
+                await self._async_open(device_id)
+            except BaseException:
+                # Leave no half-built client stack behind for the next attempt.
+                await self._async_teardown()
+                raise
+            self.metrics.observe("hub_connect", time.monotonic() - started)
+            self.metrics.incr("connects")
+            self.health.start()
+            self._ready.set()
+
+    async def _async_open(self, device_id: str) -> None:
+        from deebot_client.api_client import ApiClient
+        from deebot_client.authentication import Authenticator
+        from deebot_client.mqtt_client import MqttClient, create_mqtt_config
+
+        yeedi_config = create_yeedi_api_config(
+            self._session, device_id=device_id, alpha_2_country=self.country
+        )
+        self._auth = Authenticator(yeedi_config.rest, self.account, md5(self._password))
+        cached_creds = self._cache.credentials
+        if cached_creds is not None:
+            # deebot_client has no public way to seed issued credentials;
+            # authenticate() only logs in again once they expire.
+            self._auth._credentials = cached_creds
+        self._auth.subscribe(self._async_on_credentials)
+        api = ApiClient(self._auth)
+
+        warm = cached_creds is not None
+        self._devices = await self._cache.async_cached_devices() if warm else []
+        if self._devices:
+            # Warm start: trust the cached list now and revalidate the token
+            # and device list off the startup path.
+            self._refresh_task = self.hass.async_create_background_task(
+                self._async_refresh_devices(api), f"{DOMAIN} refresh devices"
+            )
+        else:
+            self._devices = await self._async_fetch_devices(api, retry_login=warm)
+
+        mqtt_config = create_mqtt_config(
+            device_id=device_id,
+            country=self.country,
+            override_mqtt_url=yeedi_config.mqtt_override,
+        )
+        self._mqtt = MqttClient(mqtt_config, self._auth)
+        _LOGGER.debug(
+            "Connected hub %s with %d MQTT device(s) (warm=%s)",
+            self.key,
+            len(self._devices),
+            warm,
+        )
+
+    async def _async_on_credentials(self, creds: Credentials) -> None:
+        self.metrics.incr("logins")
+        await self._cache.async_set_credentials(creds)
+
+    async def _async_fetch_devices(self, api: ApiClient, *, retry_login: bool) -> list[Any]:
+        """Fetch the device list, logging in again if a cached token is rejected."""
+
+        started = time.monotonic()
+        try:
+            # Includes the login when no valid token is cached.
+            devices = await api.get_devices()
+            mqtt_devs = list(getattr(devices, "mqtt", []) or [])
+            self.metrics.observe("device_list", time.monotonic() - started)
+        except Exception:
+            if not retry_login:
+                raise
+            mqtt_devs = []
+        if not mqtt_devs and retry_login:
+            _LOGGER.debug("Cached token for %s rejected, logging in again", self.key)
+            self._cache.invalidate_credentials()
+            await self._auth.authenticate(force=True)
+            return await self._async_fetch_devices(api, retry_login=False)
+        self._cache.set_devices(mqtt_devs)
+        return mqtt_devs
+
+    async def _async_refresh_devices(self, api: ApiClient) -> None:
+        try:
+            devices = await self._async_fetch_devices(api, retry_login=True)
+        except Exception:
+            _LOGGER.debug("Background device refresh failed for %s", self.key, exc_info=True)
+            return
+        if devices:
+            self._devices = devices
+
+    async def async_get_device(self, did: str) -> DeebotDevice:
+        """Return the shared device handle for ``did``, initialising it once."""
+
+        bot = self._bots.get(did)
+        if bot is not None:
+            return bot
+        await self.async_connect()
+        from deebot_client.device import Device as DeebotDevice
+        from deebot_client.events import AvailabilityEvent
+
+        async with self._lock:
+            if did in self._bots:
+                return self._bots[did]
+            if self._mqtt is None:
+                raise RuntimeError(f"Hub {self.key} closed while connecting")
+
+            target = next((d for d in self._devices if device_did(d) == did), None)
+            if target is None:
+                # Never fall back to another robot: commands would go to it.
+                raise RuntimeError(f"Device {did} is not an MQTT device of {self.key}")
+
+            bot = DeebotDevice(target, self._auth)
+            await bot.initialize(self._mqtt)
+            events = self._events[did] = EventSubscriptions(self.hass, bot, name=did)
+            self._unsubs.append(
+                events.subscribe(AvailabilityEvent, partial(self._async_on_availability, did))
+            )
+            self._queues[did] = CommandQueue(self.hass, bot.execute_command, name=did)
+            self._bots[did] = bot
+            self.health.track(did, bot, events)
+            return bot
+
+    def command_queue(self, did: str) -> CommandQueue:
+        """Return the command queue of an initialised device."""
+
+        return self._queues[did]
+
+    def event_subscriptions(self, did: str) -> EventSubscriptions:
+        """Return the shared event subscriptions of an initialised device."""
+
+        return self._events[did]
+
+    async def async_wait_ready(self) -> None:
+        """Wait (bounded) until a running reconnect has finished."""
+
+        if self._ready.is_set():
+            return
+        async with asyncio.timeout(CONNECT_TIMEOUT):
+            await self._ready.wait()
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Connection state and metrics (no credentials) for diagnostics."""
+
+        last_push = self._last_push()
+        return {
+            "country": self.country,
+            "connected": self.connected,
+            "ready": self._ready.is_set(),
+            "devices_discovered": len(self._devices),
+            "devices_initialised": sorted(self._bots),
+            "unavailable": sorted(self._unavailable),
+            "push_healthy": self.health.push_healthy,
+            "push_degraded_since": self.health.degraded_since,
+            "last_push": last_push,
+            "metrics": self.metrics.as_dict(),
+            "command_queues": {
+                did: {
+                    "depth": queue.depth,
+                    "last_latency_s": queue.last_latency,
+                    "metrics": queue.metrics.as_dict(),
+                }
+                for did, queue in self._queues.items()
+            },
+            "subscriptions": {
+                did: {"active": events.active, "metrics": events.metrics.as_dict()}
+                for did, events in self._events.items()
+            },
+        }
+
+    def _last_push(self) -> Optional[datetime]:
+        return getattr(self._mqtt, "last_message_received_at", None)
+
+    async def _async_on_availability(self, did: str, event: AvailabilityEvent) -> None:
+        if event.available:
+            self._unavailable.discard(did)
+            return
+        self._unavailable.add(did)
+        if self._bots and self._unavailable.issuperset(self._bots):
+            self._schedule_reconnect()
+
+    def _schedule_reconnect(self) -> None:
+        if self._reconnect_task is not None and not self._reconnect_task.done():
+            return
+        self._ready.clear()
+        self._reconnect_task = self.hass.async_create_background_task(
+            self._async_reconnect_loop(), f"{DOMAIN} reconnect {self.key}"
+        )
+
+    async def _async_reconnect_loop(self) -> None:
+        attempt = 0
+        while self._mqtt is not None:
+            delay = backoff_delay(attempt)
+            attempt += 1
+            _LOGGER.debug("Reconnecting hub %s in %.1fs (attempt %d)", self.key, delay, attempt)
+            await asyncio.sleep(delay)
+            mqtt = self._mqtt
+            if mqtt is None:
+                return
+            started = time.monotonic()
+            try:
+                async with asyncio.timeout(CONNECT_TIMEOUT):
+                    await mqtt.disconnect()
+                    await mqtt.connect()
+            except Exception:
+                self.metrics.incr("reconnect_failures")
+                _LOGGER.debug("Reconnect of hub %s failed", self.key, exc_info=True)
+                continue
+            self.metrics.observe("reconnect", time.monotonic() - started)
+            self.metrics.incr("reconnects")
+            self._unavailable.clear()
+            self._ready.set()
+            return
+
+    async def async_close(self) -> None:
+        """Tear down device handles, the MQTT client and the HTTP session."""
+
+        async with self._lock:
+            await self._async_teardown()
+
+    async def _async_teardown(self) -> None:
+        self._ready.clear()
+        self.health.stop()
+        for task in (self._refresh_task, self._reconnect_task):
+            if task is not None:
+                task.cancel()
+        self._refresh_task = self._reconnect_task = None
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs.clear()
+        self._unavailable.clear()
+        events, self._events = self._events, {}
+        for subscriptions in events.values():
+            subscriptions.close()
+        queues, self._queues = self._queues, {}
+        for queue in queues.values():
+            await queue.async_close()
+        bots, self._bots = self._bots, {}
+        mqtt, self._mqtt = self._mqtt, None
+        auth, self._auth = self._auth, None
+        session, self._session = self._session, None
+
+        # Devices first (they unsubscribe from MQTT), then the MQTT client and
+        # authenticator, then the session they use; each step in parallel.
+        started = time.monotonic()
+        await self._async_close_all({did: bot.teardown() for did, bot in bots.items()})
+        await self._async_close_all(
+            {
+                **({"mqtt": mqtt.disconnect()} if mqtt else {}),
+                **({"authenticator": auth.teardown()} if auth else {}),
+            }
+        )
+        if session:
+            await self._async_close_all({"session": session.close()})
+        self.metrics.observe("teardown", time.monotonic() - started)
+
+    async def _async_close_all(self, steps: dict[str, Awaitable[Any]]) -> None:
+        """Run teardown steps concurrently, each bounded by ``TEARDOWN_TIMEOUT``."""
+
+        async def bounded(step: Awaitable[Any]) -> None:
+            async with asyncio.timeout(TEARDOWN_TIMEOUT):
+                await step
+
+        results = await asyncio.gather(
+            *(bounded(step) for step in steps.values()), return_exceptions=True
+        )
+        for name, result in zip(steps, results):
+            if isinstance(result, asyncio.CancelledError):
+                raise result
+            if isinstance(result, BaseException):
+                self.metrics.incr("teardown_failures")
+                _LOGGER.warning(
+                    "Closing %s of hub %s failed: %s",
+                    name,
+                    self.key,
+                    "timed out" if isinstance(result, TimeoutError) else repr(result),
+                )
@@ -0,0 +1,234 @@
+"""Map image entity fed by the incremental map pipeline."""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Optional
+
+from homeassistant.components.image import ImageEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .command_queue import PRIORITY_LOW
+from .const import DOMAIN, MAP_LIVE_TIMEOUT, MAP_RENDER_DELAY
+from .entity import YeediEntity
+from .helpers import entry_devices
+from .hub import YeediHub
+from .map import MapPipeline, render_png
+from .metrics import Metrics
+
+if TYPE_CHECKING:
+    from deebot_client.device import Device as DeebotDevice
+    from deebot_client.events import (
+        MajorMapEvent, MapTraceEvent, MinorMapEvent, PositionsEvent
+    )
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
+    # The pipeline imports NumPy on first use; do that here, off the loop.
+    try:
+        await hass.async_add_import_executor_job(importlib.import_module, "numpy")
+    except ImportError:
+        _LOGGER.info("NumPy is not available; map image disabled")
+        return
+    hub: YeediHub = hass.data[DOMAIN][entry.entry_id]
+    async_add_entities(
+        YeediMapImage(hass, entry, hub, did) for did, _name in entry_devices(entry.data)
+    )
+
+
+class YeediMapImage(YeediEntity, ImageEntity):
+    """Rendered floor map.
+
+    ``image_last_updated`` (the entity state) only moves when the content
+    key of the map changes, so clients keep their cached image while the
+    robot reports an unchanged map; ``etag`` exposes that key.
+
+    Nothing is polled: the robot pushes a major map whenever its floor plan
+    changes.  The cleaning trace and robot position, which stream several
+    times a second while cleaning, are only subscribed while the image is
+    being fetched, and dropped once nobody has asked for it for
+    ``MAP_LIVE_TIMEOUT`` seconds.
+    """
+
+    _attr_name = "Map"
+    _attr_content_type = "image/png"
+    _unrecorded_attributes = frozenset({"etag"})
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, hub: YeediHub, did: str) -> None:
+        ImageEntity.__init__(self, hass)
+        YeediEntity.__init__(self, entry, hub, did, "map")
+        self.metrics = Metrics()
+
+        self._pipeline = MapPipeline()
+        self._image: Optional[bytes] = None
+        self._etag: Optional[str] = None
+        self._fetch_task: Optional[asyncio.Task] = None
+        self._render_unsub: Optional[CALLBACK_TYPE] = None
+        self._live_unsubs: list[CALLBACK_TYPE] = []
+        self._live_until = 0.0
+        self._live_expiry: Optional[CALLBACK_TYPE] = None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        return {"etag": self._etag} if self._etag else {}
+
+    async def async_image(self) -> bytes | None:
+        self._async_keep_live()
+        return self._image
+
+    async def async_will_remove_from_hass(self) -> None:
+        self._async_stop_live()
+        if self._render_unsub is not None:
+            self._render_unsub()
+            self._render_unsub = None
+        if self._fetch_task is not None:
+            self._fetch_task.cancel()
+            self._fetch_task = None
+        await super().async_will_remove_from_hass()
+
+    def _async_subscribe(self, bot: DeebotDevice) -> bool:
+        if getattr(getattr(bot, "capabilities", None), "map", None) is None:
+            return False
+        from deebot_client.events import MajorMapEvent, MinorMapEvent
+
+        # Subscribing requests the current major map.
+        self._subscribe(MajorMapEvent, self._on_major_map)
+        self._subscribe(MinorMapEvent, self._on_minor_map)
+        return True
+
+    @callback
+    def _async_keep_live(self) -> None:
+        """Follow the trace and robot position while the map is being viewed."""
+
+        self._live_until = time.monotonic() + MAP_LIVE_TIMEOUT
+        if self._live_unsubs or self._events is None or not self.available:
+            return
+        from deebot_client.events import MajorMapEvent, MapTraceEvent, PositionsEvent
+
+        for event, consumer in ((MapTraceEvent, self._on_trace), (PositionsEvent, self._on_positions)):
+            if (unsub := self._events.subscribe(event, consumer)) is not None:
+                self._live_unsubs.append(unsub)
+            # The bus replays what it last saw, which may be long stale.
+            self._bot.events.request_refresh(event)
+        # Catch up on any floor plan change missed while nobody was looking.
+        self._bot.events.request_refresh(MajorMapEvent)
+        self.metrics.incr("map_live_starts")
+        self._live_expiry = async_call_later(self.hass, MAP_LIVE_TIMEOUT, self._async_check_live)
+
+    @callback
+    def _async_check_live(self, _now: Any = None) -> None:
+        remaining = self._live_until - time.monotonic()
+        if remaining > 0:
+            self._live_expiry = async_call_later(self.hass, remaining, self._async_check_live)
+            return
+        self._live_expiry = None
+        self._async_stop_live()
+
+    @callback
+    def _async_stop_live(self) -> None:
+        if self._live_expiry is not None:
+            self._live_expiry()
+            self._live_expiry = None
+        for unsub in self._live_unsubs:
+            unsub()
+        self._live_unsubs.clear()
+
+    async def _on_major_map(self, event: MajorMapEvent) -> None:
+        stale = self._pipeline.stale_pieces(event.map_id, list(event.values))
+        self.metrics.incr("map_pieces_stale", len(stale))
+        if stale:
+            if self._fetch_task is not None:
+                self._fetch_task.cancel()
+            self._fetch_task = self.entry.async_create_background_task(
+                self.hass,
+                self._async_fetch_pieces(event.map_id, stale),
+                f"{DOMAIN} map pieces {self._did}",
+            )
+        self._schedule_render()
+
+    async def _async_fetch_pieces(self, map_id: str, indexes: list[int]) -> None:
+        """Request changed pieces one by one, behind any user command."""
+
+        minor = self._bot.capabilities.map.minor
+        queue = self._hub.command_queue(self._did)
+        for index in indexes:
+            try:
+                await queue.async_submit(
+                    minor.execute(index, map_id),
+                    priority=PRIORITY_LOW,
+                    key=f"map_piece:{index}",
+                )
+            except HomeAssistantError:
+                # Queue full: the next major map will list the piece again.
+                return
+            except Exception as err:
+                _LOGGER.debug("Fetching map piece %s failed: %s", index, err)
+
+    async def _on_minor_map(self, event: MinorMapEvent) -> None:
+        try:
+            changed = self._pipeline.update_piece(event.index, event.value)
+        except Exception as err:
+            _LOGGER.debug("Undecodable map piece %s: %s", event.index, err)
+            return
+        self.metrics.incr("map_pieces_decoded" if changed else "map_pieces_unchanged")
+        if changed:
+            self._schedule_render()
+
+    async def _on_trace(self, event: MapTraceEvent) -> None:
+        try:
+            changed = self._pipeline.update_trace(event.start, event.data)
+        except Exception as err:
+            _LOGGER.debug("Undecodable map trace: %s", err)
+            return
+        if changed:
+            self._schedule_render()
+
+    async def _on_positions(self, event: PositionsEvent) -> None:
+        robot = charger = None
+        for position in event.positions:
+            kind = str(getattr(position.type, "value", position.type)).lower()
+            if "charge" in kind:
+                charger = (position.x, position.y)
+            else:
+                robot = (position.x, position.y)
+        if self._pipeline.update_positions(robot, charger):
+            self._schedule_render()
+
+    @callback
+    def _schedule_render(self) -> None:
+        if self._render_unsub is None:
+            self._render_unsub = async_call_later(
+                self.hass, MAP_RENDER_DELAY, self._async_render
+            )
+
+    async def _async_render(self, _now: Any = None) -> None:
+        self._render_unsub = None
+        key = self._pipeline.content_key()
+        if key == self._etag:
+            self.metrics.incr("map_renders_skipped")
+            return
+        image = self._pipeline.cached(key)
+        if image is None:
+            snapshot = self._pipeline.snapshot(key)
+            if snapshot is None:
+                return
+            started = time.monotonic()
+            image = await self.hass.async_add_executor_job(render_png, snapshot)
+            self.metrics.observe("map_render", time.monotonic() - started)
+            self.metrics.incr("map_renders")
+            self._pipeline.store(key, image)
+        else:
+            self.metrics.incr("map_render_cache_hits")
+        self._image = image
+        self._etag = key
+        self._attr_image_last_updated = dt_util.utcnow()
+        self.async_write_ha_state()
@@ -0,0 +1,134 @@
+"""Config entry lifecycle: hubs outlive an unload by a short grace period.
+
+Reloading an entry (options change, reauth, "Reload" in the UI) unloads
+and sets it up again within a second or two.  Closing the account's hub on
+unload meant that reload logged in, listed devices and connected to MQTT
+from scratch for every robot.  :class:`HubLifecycle` keeps the last
+released hub of an account open for ``HUB_RELEASE_GRACE`` seconds, so a
+setup in that window picks up the live connection and device handles, and
+only closes it once nothing came back for it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from functools import partial
+import logging
+import time
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import CONF_ACCOUNT, CONF_COUNTRY, CONF_PASSWORD, DOMAIN, HUB_RELEASE_GRACE
+from .hub import YeediHub, hub_key
+from .metrics import Metrics
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class HubLifecycle:
+    """Hand out the shared hub per account and decide when to close it."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self.hubs: dict[str, YeediHub] = {}
+        self.metrics = Metrics()
+        # Hub key -> cancels the pending close of a released hub.
+        self._closing: dict[str, CALLBACK_TYPE] = {}
+        # Entry id -> when its last unload started, to time the reload.
+        self._unloaded: dict[str, float] = {}
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, self._async_on_stop)
+
+    @callback
+    def async_acquire(self, entry: ConfigEntry) -> YeediHub:
+        """Return the hub for ``entry``'s account, reusing a released one."""
+
+        key = hub_key(entry.data[CONF_ACCOUNT], entry.data[CONF_COUNTRY])
+        hub = self.hubs.get(key)
+        if hub is not None and (cancel := self._closing.pop(key, None)) is not None:
+            cancel()
+            if hub.uses_password(entry.data[CONF_PASSWORD]):
+                self.metrics.incr("hubs_reused")
+                _LOGGER.debug("Reusing hub %s for %s", key, entry.title)
+            else:
+                # Reauthenticated with a new password: start over.
+                self._async_close_in_background(hub)
+                hub = None
+        if hub is None:
+            hub = self.hubs[key] = YeediHub(
+                self.hass,
+                account=entry.data[CONF_ACCOUNT],
+                password=entry.data[CONF_PASSWORD],
+                country=entry.data[CONF_COUNTRY],
+            )
+        hub.entry_ids.add(entry.entry_id)
+        return hub
+
+    @callback
+    def async_setup_done(self, entry: ConfigEntry, hub: YeediHub) -> None:
+        """Record how long the reload of ``entry`` took, if it was one."""
+
+        started = self._unloaded.pop(entry.entry_id, None)
+        if started is None:
+            return
+        elapsed = time.monotonic() - started
+        if elapsed > HUB_RELEASE_GRACE:
+            # Disabled and enabled again later rather than reloaded.
+            return
+        self.metrics.observe("entry_reload", elapsed)
+        hub.metrics.observe("entry_reload", elapsed)
+        _LOGGER.debug("Reloaded %s in %.2fs", entry.title, elapsed)
+
+    @callback
+    def async_unload_started(self, entry: ConfigEntry) -> None:
+        self._unloaded[entry.entry_id] = time.monotonic()
+
+    async def async_release(self, entry: ConfigEntry, hub: YeediHub) -> None:
+        """Drop ``entry`` from its hub; close the hub later if it was the last."""
+
+        hub.entry_ids.discard(entry.entry_id)
+        if hub.entry_ids or self._closing.get(hub.key) is not None:
+            return
+        if self.hass.is_stopping:
+            await self._async_close(hub)
+            return
+        self._closing[hub.key] = async_call_later(
+            self.hass, HUB_RELEASE_GRACE, partial(self._async_expire, hub)
+        )
+
+    async def async_close_released(self, key: str) -> None:
+        """Close ``key``'s hub now if it is only waiting out its grace period."""
+
+        cancel = self._closing.pop(key, None)
+        if cancel is not None:
+            cancel()
+            await self._async_close(self.hubs[key])
+
+    async def _async_expire(self, hub: YeediHub, _now: Any) -> None:
+        if self._closing.pop(hub.key, None) is not None:
+            await self._async_close(hub)
+
+    @callback
+    def _async_close_in_background(self, hub: YeediHub) -> None:
+        self.hass.async_create_background_task(
+            self._async_close(hub), f"{DOMAIN} close hub {hub.key}"
+        )
+
+    async def _async_close(self, hub: YeediHub) -> None:
+        if self.hubs.get(hub.key) is hub:
+            del self.hubs[hub.key]
+        started = time.monotonic()
+        await hub.async_close()
+        self.metrics.observe("hub_close", time.monotonic() - started)
+        self.metrics.incr("hubs_closed")
+
+    async def _async_on_stop(self, _event: Event) -> None:
+        """Close released hubs instead of leaving their timers pending."""
+
+        closing, self._closing = self._closing, {}
+        for cancel in closing.values():
+            cancel()
+        await asyncio.gather(*(self._async_close(self.hubs[key]) for key in closing))
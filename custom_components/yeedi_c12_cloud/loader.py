@@ -0,0 +1,55 @@
+"""Deferred imports of the heavy deebot_client modules.
+
+Importing ``deebot_client`` pulls in the command tables, event classes, the
+native map renderer and the MQTT stack.  None of that is needed to load the
+integration or render the config form, so modules here only reference it
+under ``TYPE_CHECKING`` or inside functions, and the first connect imports
+it once in the executor via :func:`async_import_client`.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import Any, Optional
+
+from homeassistant.core import HomeAssistant
+
+from . import normalize
+
+_MODULES = (
+    "deebot_client.authentication",
+    "deebot_client.api_client",
+    "deebot_client.events",
+    "deebot_client.commands.json",
+    "deebot_client.device",
+    "deebot_client.mqtt_client",
+)
+
+_loaded = False
+
+
+def import_client() -> None:
+    """Import every deebot_client module the runtime path needs (blocking)."""
+
+    for name in _MODULES:
+        importlib.import_module(name)
+
+
+async def async_import_client(hass: HomeAssistant) -> None:
+    """Import deebot_client in the executor the first time it is needed."""
+
+    global _loaded
+    if _loaded:
+        return
+    await hass.async_add_import_executor_job(import_client)
+    normalize.register_enums()
+    _loaded = True
+
+
+def optional_attr(module: str, name: str) -> Optional[Any]:
+    """Return ``module.name`` or ``None`` when this deebot_client lacks it."""
+
+    try:
+        return getattr(importlib.import_module(module), name)
+    except Exception:
+        return None
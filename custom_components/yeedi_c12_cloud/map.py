@@ -0,0 +1,274 @@
+"""Incremental map decoding and cached rendering.
+
+The robot describes its map as an 8x8 grid of 100x100 pixel pieces, each
+LZMA-compressed and base64 encoded, plus a run of trace points.  The major
+map event carries one CRC per piece, so only pieces whose CRC changed are
+requested and decoded; they are written straight into a NumPy pixel grid.
+NumPy is imported on first use, never when the module is loaded; the image
+platform imports it once in the executor before creating any pipeline.
+
+Rendering reads a snapshot of that grid and is keyed by a hash of the piece
+CRCs, trace length and robot/charger positions, so an unchanged map is never
+re-encoded and the same key can be handed to clients as an ETag.
+"""
+
+from __future__ import annotations
+
+import base64
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+import hashlib
+import io
+import logging
+import lzma
+import zlib
+from typing import TYPE_CHECKING, Callable, Optional
+
+from .loader import optional_attr
+
+if TYPE_CHECKING:
+    import numpy as np
+
+_LOGGER = logging.getLogger(__name__)
+
+PIECE_SIZE = 100
+PIECES_PER_ROW = 8
+GRID_SIZE = PIECE_SIZE * PIECES_PER_ROW
+
+# Map coordinates are millimetres (positions) or centimetres (trace) around
+# the grid centre; one pixel covers 50 mm.
+_PIXEL_MM = 50
+_TRACE_PER_PIXEL = 5
+
+# CRC the cloud reports for a piece that holds no map data.
+_EMPTY_PIECE_CRC = 1295764014
+
+# Pixel type -> RGBA.  0 = unknown, 1 = floor, 2 = wall, 3 = carpet.
+_PALETTE = (
+    (0, 0, 0, 0),
+    (0xBA, 0xDA, 0xFF, 0xFF),
+    (0x4E, 0x96, 0xE2, 0xFF),
+    (0x1A, 0x81, 0xED, 0xFF),
+)
+_TRACE_COLOUR = (0xFF, 0xFF, 0xFF, 0xFF)
+_ROBOT_COLOUR = (0xE0, 0x2D, 0x2D, 0xFF)
+_CHARGER_COLOUR = (0x3C, 0xB3, 0x71, 0xFF)
+
+# One trace point: x, y (centimetres) and a flags byte.
+_TRACE_FIELDS = [("x", "<i2"), ("y", "<i2"), ("flags", "u1")]
+
+# Rendered images kept per device (content key -> PNG).
+_RENDER_CACHE_SIZE = 4
+
+
+@lru_cache(maxsize=1)
+def _trace_dtype() -> np.dtype:
+    import numpy as np
+
+    return np.dtype(_TRACE_FIELDS)
+
+
+@lru_cache(maxsize=1)
+def _native_decompress() -> Optional[Callable[[str], bytes]]:
+    return optional_attr("deebot_client.rs.util", "decompress_base64_data")
+
+
+def decompress_piece(data: str) -> bytes:
+    """Decode one base64 + LZMA-alone payload as sent by the cloud.
+
+    Uses deebot_client's native decoder when it has one.  Otherwise pad the
+    4-byte uncompressed-size header field the cloud sends back to the 8
+    bytes :mod:`lzma` expects.
+    """
+
+    if (native := _native_decompress()) is not None:
+        return native(data)
+    raw = base64.b64decode(data)
+    raw = raw[:9] + b"\x00\x00\x00\x00" + raw[9:]
+    return lzma.LZMADecompressor(lzma.FORMAT_ALONE).decompress(raw)
+
+
+@dataclass(frozen=True, slots=True)
+class MapSnapshot:
+    """Immutable view of the map handed to the renderer."""
+
+    key: str
+    grid: np.ndarray
+    trace: np.ndarray
+    robot: Optional[tuple[float, float]]
+    charger: Optional[tuple[float, float]]
+
+
+class MapPipeline:
+    """Pixel grid, trace and positions for one device.
+
+    All mutators run on the event loop; :func:`render_png` works on a
+    :class:`MapSnapshot` and is safe to run in the executor.
+    """
+
+    def __init__(self) -> None:
+        import numpy as np
+
+        self._grid = np.zeros((GRID_SIZE, GRID_SIZE), dtype=np.uint8)
+        self._crcs: dict[int, int] = {}
+        self._trace = np.zeros(0, dtype=_trace_dtype())
+        self._robot: Optional[tuple[float, float]] = None
+        self._charger: Optional[tuple[float, float]] = None
+        self._cache: OrderedDict[str, bytes] = OrderedDict()
+        self.map_id: Optional[str] = None
+        self.pieces_decoded = 0
+
+    def stale_pieces(self, map_id: str, crcs: list[int]) -> list[int]:
+        """Return indexes whose CRC differs from the decoded piece.
+
+        Pieces reported empty are cleared here without a round-trip.
+        """
+
+        if map_id != self.map_id:
+            self.map_id = map_id
+            self._crcs.clear()
+            self._grid.fill(0)
+        stale: list[int] = []
+        for index, crc in enumerate(crcs):
+            if crc == self._crcs.get(index):
+                continue
+            if crc == _EMPTY_PIECE_CRC:
+                self._crcs[index] = crc
+                self._piece_view(index).fill(0)
+                continue
+            stale.append(index)
+        return stale
+
+    def update_piece(self, index: int, data: str) -> bool:
+        """Decode one piece into the grid; return False if it was unchanged."""
+
+        pixels = decompress_piece(data)
+        crc = zlib.crc32(pixels)
+        if self._crcs.get(index) == crc:
+            return False
+        import numpy as np
+
+        piece = np.frombuffer(pixels, dtype=np.uint8, count=PIECE_SIZE * PIECE_SIZE)
+        # Pieces are stored column-major with y growing northwards.
+        self._piece_view(index)[:] = piece.reshape(PIECE_SIZE, PIECE_SIZE).T[::-1]
+        self._crcs[index] = crc
+        self.pieces_decoded += 1
+        return True
+
+    def update_trace(self, start: int, data: str) -> bool:
+        """Append (or, from ``start == 0``, replace) trace points."""
+
+        import numpy as np
+
+        dtype = _trace_dtype()
+        points = np.zeros(0, dtype=dtype)
+        if data := data.strip():
+            raw = decompress_piece(data)
+            usable = len(raw) - len(raw) % dtype.itemsize
+            points = np.frombuffer(raw[:usable], dtype=dtype)
+        if start == 0:
+            changed = len(self._trace) > 0 or len(points) > 0
+            self._trace = points.copy()
+            return changed
+        if not len(points):
+            return False
+        self._trace = np.concatenate((self._trace, points))
+        return True
+
+    def update_positions(
+        self,
+        robot: Optional[tuple[int, int]],
+        charger: Optional[tuple[int, int]],
+    ) -> bool:
+        robot_px = _position_to_pixel(robot) if robot else self._robot
+        charger_px = _position_to_pixel(charger) if charger else self._charger
+        if (robot_px, charger_px) == (self._robot, self._charger):
+            return False
+        self._robot, self._charger = robot_px, charger_px
+        return True
+
+    def content_key(self) -> str:
+        """Hash of everything that affects the rendered image."""
+
+        digest = hashlib.blake2b(digest_size=12)
+        digest.update(str(self.map_id).encode())
+        for index in sorted(self._crcs):
+            digest.update(b"%d:%d;" % (index, self._crcs[index]))
+        digest.update(b"t%d" % len(self._trace))
+        if len(self._trace):
+            digest.update(self._trace[-1].tobytes())
+        digest.update(repr((self._robot, self._charger)).encode())
+        return digest.hexdigest()
+
+    def cached(self, key: str) -> Optional[bytes]:
+        image = self._cache.get(key)
+        if image is not None:
+            self._cache.move_to_end(key)
+        return image
+
+    def store(self, key: str, image: bytes) -> None:
+        self._cache[key] = image
+        self._cache.move_to_end(key)
+        while len(self._cache) > _RENDER_CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+    def snapshot(self, key: str) -> Optional[MapSnapshot]:
+        """Copy the drawn part of the grid, or None when nothing is mapped."""
+
+        import numpy as np
+
+        rows = np.flatnonzero(self._grid.any(axis=1))
+        if not len(rows):
+            return None
+        cols = np.flatnonzero(self._grid.any(axis=0))
+        top, bottom = int(rows[0]), int(rows[-1]) + 1
+        left, right = int(cols[0]), int(cols[-1]) + 1
+        grid = self._grid[top:bottom, left:right].copy()
+
+        def shift(point: Optional[tuple[float, float]]) -> Optional[tuple[float, float]]:
+            return None if point is None else (point[0] - left, point[1] - top)
+
+        trace = np.empty((len(self._trace), 2), dtype=np.float32)
+        trace[:, 0] = self._trace["x"] / _TRACE_PER_PIXEL + GRID_SIZE / 2 - left
+        trace[:, 1] = -self._trace["y"] / _TRACE_PER_PIXEL + GRID_SIZE / 2 - top
+        return MapSnapshot(
+            key=key,
+            grid=grid,
+            trace=trace,
+            robot=shift(self._robot),
+            charger=shift(self._charger),
+        )
+
+    def _piece_view(self, index: int) -> np.ndarray:
+        row, col = divmod(index, PIECES_PER_ROW)
+        # The grid is stored north-up; piece rows count from the south edge.
+        top = GRID_SIZE - (row + 1) * PIECE_SIZE
+        left = col * PIECE_SIZE
+        return self._grid[top : top + PIECE_SIZE, left : left + PIECE_SIZE]
+
+
+def _position_to_pixel(point: tuple[int, int]) -> tuple[float, float]:
+    x, y = point
+    return (x / _PIXEL_MM + GRID_SIZE / 2, -y / _PIXEL_MM + GRID_SIZE / 2)
+
+
+def render_png(snapshot: MapSnapshot) -> bytes:
+    """Render a snapshot to PNG (blocking; run in the executor)."""
+
+    import numpy as np
+    from PIL import Image, ImageDraw
+
+    palette = np.array(_PALETTE, dtype=np.uint8)
+    types = np.minimum(snapshot.grid, len(palette) - 1)
+    image = Image.fromarray(palette[types])
+    draw = ImageDraw.Draw(image)
+    if len(snapshot.trace) > 1:
+        draw.line([tuple(p) for p in snapshot.trace.tolist()], fill=_TRACE_COLOUR, width=1)
+    for point, colour in ((snapshot.charger, _CHARGER_COLOUR), (snapshot.robot, _ROBOT_COLOUR)):
+        if point is not None:
+            x, y = point
+            draw.ellipse((x - 3, y - 3, x + 3, y + 3), fill=colour)
+    out = io.BytesIO()
+    image.save(out, format="PNG", optimize=False)
+    return out.getvalue()
@@ -0,0 +1,92 @@
+"""Lightweight in-process counters and timings for the integration."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import defaultdict
+import time
+from typing import Any, Optional
+
+# Histogram bucket upper bounds in milliseconds; the last bucket is open.
+LATENCY_BUCKETS_MS: tuple[float, ...] = (
+    0.1, 0.5, 1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000
+)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram: one bisect and two adds per sample."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, ms: float) -> None:
+        self.counts[bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Upper bound of the bucket holding the ``pct``-th sample (capped at max)."""
+
+        if not self.count:
+            return None
+        rank = pct / 100 * self.count
+        seen = 0
+        for index, bucket in enumerate(self.counts):
+            seen += bucket
+            if seen >= rank and bucket:
+                if index < len(LATENCY_BUCKETS_MS):
+                    return min(LATENCY_BUCKETS_MS[index], round(self.max, 3))
+                return round(self.max, 3)
+        return round(self.max, 3)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count, 3) if self.count else None,
+            "p50_ms": self.percentile(50),
+            "p90_ms": self.percentile(90),
+            "p99_ms": self.percentile(99),
+            "max_ms": round(self.max, 3),
+        }
+
+
+class Metrics:
+    """Plain counters, last-seen durations and latency histograms.
+
+    Cheap enough for hot paths: :meth:`incr` is a dict add and
+    :meth:`observe` a dict store plus one :meth:`Histogram.add`.
+    """
+
+    def __init__(self) -> None:
+        self.started = time.monotonic()
+        self.counters: defaultdict[str, int] = defaultdict(int)
+        self.durations: dict[str, float] = {}
+        self.histograms: defaultdict[str, Histogram] = defaultdict(Histogram)
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        self.counters[name] += amount
+
+    def observe(self, name: str, seconds: float) -> None:
+        self.durations[name] = seconds
+        self.histograms[name].add(seconds * 1000)
+
+    def rate(self, name: str) -> float:
+        """Average per-minute rate of counter ``name`` since creation."""
+
+        minutes = (time.monotonic() - self.started) / 60
+        return self.counters.get(name, 0) / minutes if minutes > 0 else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "uptime_s": round(time.monotonic() - self.started, 1),
+            "counters": dict(self.counters),
+            "durations": {k: round(v, 4) for k, v in self.durations.items()},
+            "histograms": {k: h.as_dict() for k, h in self.histograms.items()},
+        }
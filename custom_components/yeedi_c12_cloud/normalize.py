@@ -0,0 +1,145 @@
+"""Map deebot_client event values onto Home Assistant vacuum values.
+
+Known enum members resolve through precomputed dictionaries (keyed by name
+until :func:`register_enums` adds the members themselves once deebot_client
+has been imported).  Anything else
+(older firmware strings, new enum members) goes through the substring
+classifiers once and is then served from an LRU cache, so the per-event
+cost is a dictionary lookup either way.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+import importlib
+from typing import Any, Optional
+
+from homeassistant.const import (
+    STATE_CLEANING,
+    STATE_DOCKED,
+    STATE_ERROR,
+    STATE_IDLE,
+    STATE_PAUSED,
+    STATE_RETURNING,
+)
+
+FAN_SPEEDS = ["silent", "standard", "max", "turbo"]
+
+# Lowercased enum names / raw strings -> HA state.  Shared by the clean and
+# charge handlers so a value means the same thing whichever event carries it.
+_STATE_BY_NAME: dict[str, str] = {
+    "cleaning": STATE_CLEANING,
+    "working": STATE_CLEANING,
+    "auto": STATE_CLEANING,
+    "spot_area": STATE_CLEANING,
+    "custom_area": STATE_CLEANING,
+    "paused": STATE_PAUSED,
+    "pause": STATE_PAUSED,
+    "idle": STATE_IDLE,
+    "stop": STATE_IDLE,
+    "stopped": STATE_IDLE,
+    "standby": STATE_IDLE,
+    "returning": STATE_RETURNING,
+    "going_to_charge": STATE_RETURNING,
+    "return": STATE_RETURNING,
+    "docked": STATE_DOCKED,
+    "charging": STATE_DOCKED,
+    "charged": STATE_DOCKED,
+    "station": STATE_DOCKED,
+    "error": STATE_ERROR,
+}
+
+_FAN_SPEED_BY_NAME: dict[str, str] = {
+    "quiet": "silent",
+    "silent": "silent",
+    "normal": "standard",
+    "standard": "standard",
+    "max": "max",
+    "strong": "max",
+    "max_plus": "turbo",
+    "turbo": "turbo",
+}
+
+
+_STATE_TABLE: dict[Any, str] = dict(_STATE_BY_NAME)
+_FAN_SPEED_TABLE: dict[Any, str] = dict(_FAN_SPEED_BY_NAME)
+
+
+def _add_enum(table: dict[Any, str], names: dict[str, str], module: str, attr: str) -> None:
+    try:
+        enum_cls = getattr(importlib.import_module(module), attr)
+    except Exception:
+        return
+    for member in enum_cls:
+        mapped = names.get(member.name.lower())
+        if mapped is not None:
+            table[member] = mapped
+
+
+def register_enums() -> None:
+    """Key the tables by deebot_client enum members as well as by name."""
+
+    _add_enum(_STATE_TABLE, _STATE_BY_NAME, "deebot_client.models", "State")
+    _add_enum(
+        _FAN_SPEED_TABLE, _FAN_SPEED_BY_NAME, "deebot_client.events.fan_speed", "FanSpeedLevel"
+    )
+
+
+def _key(value: Any) -> str:
+    name = getattr(value, "name", None)
+    return (name if isinstance(name, str) else str(value)).lower()
+
+
+def _lookup(table: dict[Any, str], value: Any) -> Optional[str]:
+    try:
+        return table[value]
+    except (KeyError, TypeError):
+        return table.get(_key(value))
+
+
+@lru_cache(maxsize=256)
+def _classify_clean(val: str) -> Optional[str]:
+    if any(k in val for k in ("clean", "working", "sweep", "mop")):
+        return STATE_CLEANING
+    if "pause" in val:
+        return STATE_PAUSED
+    if any(k in val for k in ("idle", "stop", "standby")):
+        return STATE_IDLE
+    return None
+
+
+def clean_state(value: Any) -> Optional[str]:
+    """Return the HA state for a clean-state event value, or ``None``."""
+
+    if value is None:
+        return None
+    return _lookup(_STATE_TABLE, value) or _classify_clean(_key(value))
+
+
+def fan_speed(value: Any) -> Optional[str]:
+    """Return the HA fan speed name (one of ``FAN_SPEEDS``), or ``None``."""
+
+    if value is None:
+        return None
+    return _lookup(_FAN_SPEED_TABLE, value)
+
+
+# ErrorEvent codes deebot_client describes as "NoError: Robot is operational".
+NO_ERROR_CODES = frozenset({0, 100})
+
+# ErrorEvent codes that mean the dust bin is full ("DustCaseFilled").
+BIN_FULL_ERROR_CODES = frozenset({114})
+
+
+def bin_full(error_code: Any) -> bool:
+    """Whether an ErrorEvent code reports a full dust bin."""
+
+    return error_code in BIN_FULL_ERROR_CODES
+
+
+def error_text(error_code: Any, description: Optional[str]) -> Optional[str]:
+    """Text for an ErrorEvent, or ``None`` when it reports no error."""
+
+    if error_code in NO_ERROR_CODES:
+        return None
+    return description or f"Error {error_code}"
@@ -0,0 +1,141 @@
+"""On-demand profiling of the event loop, summarised for this integration.
+
+The ``start_profile`` service enables :mod:`cProfile` on the event loop
+thread for a bounded window.  ``stop_profile``, or the end of the window,
+writes two files under ``config/yeedi_c12_cloud``:
+
+* ``profile-<time>.prof``: the full profile, for ``pstats`` or snakeviz;
+* ``profile-<time>.txt``: one line per function of this integration
+  (``_ensure_connected``, the ``_on_*`` handlers, the command methods, ...)
+  with calls, own and cumulative time and its share of the window.
+
+Nothing is hooked while no profile runs.  cProfile counts every resumption
+of a coroutine as one call, so a handler's times are how long it held the
+event loop, not the wall time spent waiting for the cloud; those latencies
+are in the diagnostics histograms.  Executor jobs are not profiled.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import logging
+from pathlib import Path
+import pstats
+import time
+from typing import Any, Optional
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later
+
+from .const import DATA_PROFILER, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# Functions defined under this directory (but not here) make up the summary.
+_PACKAGE_DIR = str(Path(__file__).parent)
+
+
+def summarise(stats: pstats.Stats, seconds: float) -> str:
+    """Per-function table of the integration's share of a profile."""
+
+    rows = []
+    for (filename, line, name), (_cc, calls, own, cumulative, _callers) in stats.stats.items():
+        if filename.startswith(_PACKAGE_DIR) and filename != __file__:
+            rows.append((cumulative, own, calls, f"{Path(filename).name}:{line}({name})"))
+    rows.sort(reverse=True)
+
+    lines = [
+        f"Profiled {seconds:.1f} s of the event loop; {stats.total_tt:.3f} s of it in profiled calls.",
+        "Times are milliseconds the function held the loop (coroutines: summed over resumptions).",
+        "",
+        f"{'calls':>9} {'own ms':>10} {'cum ms':>10} {'ms/call':>9} {'% window':>8}  function",
+    ]
+    for cumulative, own, calls, where in rows:
+        lines.append(
+            f"{calls:>9} {own * 1000:>10.3f} {cumulative * 1000:>10.3f} "
+            f"{cumulative * 1000 / calls if calls else 0:>9.4f} "
+            f"{cumulative / seconds * 100 if seconds else 0:>8.3f}  {where}"
+        )
+    if not rows:
+        lines.append("(no calls into the integration during the window)")
+    return "\n".join(lines) + "\n"
+
+
+def _write(profile: cProfile.Profile, base: Path, seconds: float) -> tuple[Path, Path]:
+    base.parent.mkdir(parents=True, exist_ok=True)
+    prof_path = base.with_suffix(".prof")
+    summary_path = base.with_suffix(".txt")
+    profile.dump_stats(prof_path)
+    summary_path.write_text(summarise(pstats.Stats(profile), seconds), encoding="utf-8")
+    return prof_path, summary_path
+
+
+class Profiler:
+    """At most one running profile per Home Assistant instance."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._profile: Optional[cProfile.Profile] = None
+        self._base: Optional[Path] = None
+        self._started = 0.0
+        self._expiry: Optional[CALLBACK_TYPE] = None
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, self._async_on_stop)
+
+    @property
+    def running(self) -> bool:
+        return self._profile is not None
+
+    def start(self, duration: float) -> dict[str, Any]:
+        """Profile the event loop for up to ``duration`` seconds."""
+
+        if self._profile is not None:
+            raise HomeAssistantError("A profile is already running; call stop_profile first")
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as err:
+            # Another profiler (e.g. HA's own profiler integration) is active.
+            raise HomeAssistantError(f"Cannot start profiling: {err}") from None
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        self._profile = profile
+        self._base = Path(self.hass.config.path(DOMAIN, f"profile-{stamp}"))
+        self._started = time.monotonic()
+        self._expiry = async_call_later(self.hass, duration, self._async_expire)
+        _LOGGER.info("Profiling for up to %ss (%s)", duration, self._base)
+        return {"profile": str(self._base.with_suffix(".prof")), "duration": duration}
+
+    async def async_stop(self) -> dict[str, Any]:
+        """Stop profiling and write the profile and summary files."""
+
+        profile, self._profile = self._profile, None
+        if profile is None:
+            raise HomeAssistantError("No profile is running")
+        profile.disable()
+        seconds = time.monotonic() - self._started
+        if self._expiry is not None:
+            self._expiry()
+            self._expiry = None
+        prof_path, summary_path = await self.hass.async_add_executor_job(
+            _write, profile, self._base, seconds
+        )
+        _LOGGER.info("Profile of %.1fs written to %s", seconds, summary_path)
+        return {"profile": str(prof_path), "summary": str(summary_path), "seconds": round(seconds, 1)}
+
+    async def _async_expire(self, _now: Any) -> None:
+        self._expiry = None
+        if self._profile is not None:
+            await self.async_stop()
+
+    async def _async_on_stop(self, _event: Event) -> None:
+        if self._profile is not None:
+            await self.async_stop()
+
+
+def get_profiler(hass: HomeAssistant) -> Profiler:
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    profiler = domain_data.get(DATA_PROFILER)
+    if profiler is None:
+        profiler = domain_data[DATA_PROFILER] = Profiler(hass)
+    return profiler
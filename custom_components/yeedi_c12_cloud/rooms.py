@@ -0,0 +1,106 @@
+"""Per-device room index for name-based room cleaning."""
+
+from __future__ import annotations
+
+import asyncio
+import re
+from typing import Any, Iterable, Optional
+
+from homeassistant.exceptions import HomeAssistantError
+
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+
+def room_slug(name: str) -> str:
+    """``"Living Room"`` -> ``"living_room"``."""
+
+    return _SLUG_RE.sub("_", name.casefold()).strip("_")
+
+
+class RoomIndex:
+    """Room ids and names as last reported by the robot.
+
+    The index is rebuilt only when a rooms event differs from what is
+    already known, which the robot sends when its map changes.  Lookups
+    accept the room id, the name in any case, or its slug, so both
+    ``"Living Room"`` and ``"living_room"`` resolve.
+    """
+
+    def __init__(self) -> None:
+        self._rooms: dict[int, str] = {}
+        # Alias -> room id, or None when several rooms share the alias.
+        self._lookup: dict[str, Optional[int]] = {}
+        self._ready = asyncio.Event()
+        self.version = 0
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    @property
+    def rooms(self) -> dict[int, str]:
+        return dict(self._rooms)
+
+    def update(self, rooms: Iterable[Any]) -> bool:
+        """Replace the index from ``Room`` objects; return True if it changed."""
+
+        new: dict[int, str] = {}
+        for room in rooms:
+            try:
+                new[int(room.id)] = str(room.name or "")
+            except (AttributeError, TypeError, ValueError):
+                continue
+        self._ready.set()
+        if new == self._rooms:
+            return False
+
+        lookup: dict[str, Optional[int]] = {}
+        for room_id, name in new.items():
+            lookup[str(room_id)] = room_id
+            for alias in {name.strip().casefold(), room_slug(name)} - {""}:
+                if alias in lookup and lookup[alias] != room_id:
+                    lookup[alias] = None
+                else:
+                    lookup[alias] = room_id
+        self._rooms = new
+        self._lookup = lookup
+        self.version += 1
+        return True
+
+    async def async_wait(self, timeout: float) -> None:
+        async with asyncio.timeout(timeout):
+            await self._ready.wait()
+
+    def resolve(self, values: Iterable[Any]) -> list[int]:
+        """Map ids/names/slugs to room ids, failing before anything is sent."""
+
+        ids: list[int] = []
+        unknown: list[str] = []
+        ambiguous: list[str] = []
+        for value in values:
+            text = str(value).strip()
+            key = text.casefold()
+            if key not in self._lookup:
+                key = room_slug(text)
+            if key not in self._lookup:
+                unknown.append(text)
+                continue
+            room_id = self._lookup[key]
+            if room_id is None:
+                ambiguous.append(text)
+            elif room_id not in ids:
+                ids.append(room_id)
+
+        if unknown or ambiguous:
+            known = ", ".join(f"{name} ({room_id})" for room_id, name in self._rooms.items())
+            problems = []
+            if unknown:
+                problems.append(f"unknown room(s) {', '.join(unknown)}")
+            if ambiguous:
+                problems.append(f"ambiguous room(s) {', '.join(ambiguous)}; use the id")
+            raise HomeAssistantError(
+                f"{'; '.join(problems).capitalize()}. Known rooms: {known or 'none'}"
+            )
+        if not ids:
+            raise HomeAssistantError("No rooms given")
+        return ids
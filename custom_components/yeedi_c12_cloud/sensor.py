@@ -0,0 +1,370 @@
+"""Per-value sensors split out of the vacuum's state attributes.
+
+Each sensor subscribes to one device event and writes state only when its
+own value changes, so a battery tick no longer re-records every other
+attribute of the vacuum.
+
+The metric sensors (disabled by default) poll the in-process counters and
+latency histograms instead of listening to the robot, and the clean history
+sensors read today's and this week's precomputed totals from the local
+history store whenever it changes.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import timedelta
+import time
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfArea, UnitOfTime
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.event import async_track_time_change
+from homeassistant.helpers.typing import StateType
+
+from .const import DOMAIN, SIGNAL_HISTORY_UPDATED
+from .entity import YeediEntity
+from .helpers import entry_devices
+from .history import async_get_history, period_start
+from .hub import YeediHub
+from .metrics import Metrics
+from .normalize import FAN_SPEEDS, error_text, fan_speed
+
+if TYPE_CHECKING:
+    from deebot_client.device import Device as DeebotDevice
+
+# Only the metric sensors poll; the event-driven ones never do.
+SCAN_INTERVAL = timedelta(seconds=60)
+
+
+def _first(event: Any, *names: str) -> Any:
+    for name in names:
+        value = getattr(event, name, None)
+        if value is not None:
+            return value
+    return None
+
+
+def _int_or_none(value: Any) -> int | None:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _error_text(event: Any) -> str | None:
+    code = _first(event, "code")
+    description = _first(event, "description", "value")
+    if code is None and description is None:
+        return None
+    # Same rule as the vacuum's error attribute: no text while healthy.
+    value = error_text(code, description)
+    if value is None:
+        return None
+    # Sensor states are capped at 255 characters.
+    return str(value)[:255]
+
+
+def _water_level(event: Any) -> int | None:
+    value = _first(event, "value", "amount")
+    # WaterAmountEvent carries a WaterAmount enum rather than an int.
+    return _int_or_none(getattr(value, "value", value))
+
+
+def _lifespan_type(event: Any) -> str:
+    kind = getattr(event, "type", None)
+    return str(getattr(kind, "value", kind))
+
+
+@dataclass(frozen=True, kw_only=True)
+class YeediSensorDescription(SensorEntityDescription):
+    """Sensor fed by the first event class this deebot_client provides."""
+
+    events: tuple[str, ...]
+    value_fn: Callable[[Any], StateType]
+    # Events for other entities on the same class (e.g. lifespans) are skipped.
+    match_fn: Callable[[Any], bool] = lambda _event: True
+
+
+def _lifespan(key: str, name: str, lifespan_type: str) -> YeediSensorDescription:
+    return YeediSensorDescription(
+        key=key,
+        name=name,
+        events=("LifeSpanEvent",),
+        value_fn=lambda e: _int_or_none(_first(e, "percent", "value")),
+        match_fn=lambda e: _lifespan_type(e) == lifespan_type,
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+    )
+
+
+SENSORS: tuple[YeediSensorDescription, ...] = (
+    YeediSensorDescription(
+        key="battery",
+        name="Battery",
+        events=("BatteryEvent",),
+        value_fn=lambda e: _int_or_none(e.value),
+        device_class=SensorDeviceClass.BATTERY,
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    YeediSensorDescription(
+        key="error",
+        name="Error",
+        events=("ErrorEvent",),
+        value_fn=_error_text,
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    YeediSensorDescription(
+        key="fan_speed",
+        name="Fan speed",
+        events=("FanSpeedEvent",),
+        # None (unknown) for speeds outside FAN_SPEEDS, which ENUM requires.
+        value_fn=lambda e: fan_speed(_first(e, "speed", "value")),
+        device_class=SensorDeviceClass.ENUM,
+        options=FAN_SPEEDS,
+    ),
+    YeediSensorDescription(
+        key="water_level",
+        name="Water level",
+        events=("water_info.WaterAmountEvent",),
+        value_fn=_water_level,
+    ),
+    _lifespan("lifespan_brush", "Main brush lifespan", "brush"),
+    _lifespan("lifespan_side_brush", "Side brush lifespan", "sideBrush"),
+    _lifespan("lifespan_filter", "Filter lifespan", "heap"),
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class YeediMetricDescription(SensorEntityDescription):
+    """Sensor computed from the hub's and the robot's :class:`Metrics`."""
+
+    value_fn: Callable[[YeediHub, Metrics], StateType]
+
+
+def _p90_ms(name: str) -> Callable[[YeediHub, Metrics], StateType]:
+    def value(_hub: YeediHub, metrics: Metrics) -> StateType:
+        histogram = metrics.histograms.get(name)
+        return histogram.percentile(90) if histogram is not None else None
+
+    return value
+
+
+def _last_ms(name: str) -> Callable[[YeediHub, Metrics], StateType]:
+    def value(hub: YeediHub, _metrics: Metrics) -> StateType:
+        seconds = hub.metrics.durations.get(name)
+        return round(seconds * 1000) if seconds is not None else None
+
+    return value
+
+
+METRIC_SENSORS: tuple[YeediMetricDescription, ...] = (
+    YeediMetricDescription(
+        key="metric_command_latency",
+        name="Command latency (p90)",
+        value_fn=_p90_ms("command"),
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    YeediMetricDescription(
+        key="metric_event_rate",
+        name="Events per minute",
+        value_fn=lambda _hub, metrics: round(metrics.rate("events"), 2),
+        native_unit_of_measurement="events/min",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    YeediMetricDescription(
+        key="metric_state_writes",
+        name="State writes",
+        value_fn=lambda _hub, metrics: metrics.counters.get("writes", 0),
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    YeediMetricDescription(
+        key="metric_mqtt_reconnects",
+        name="MQTT reconnects",
+        value_fn=lambda hub, _metrics: hub.metrics.counters.get("reconnects", 0),
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    YeediMetricDescription(
+        key="metric_connect_duration",
+        name="Cloud connect duration",
+        value_fn=_last_ms("hub_connect"),
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+    ),
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class YeediHistoryDescription(SensorEntityDescription):
+    """Today's or this week's total of one clean-history column."""
+
+    period: str  # "day" or "week"
+    value_fn: Callable[[dict[str, int]], StateType]
+
+
+def _history(period: str, label: str) -> tuple[YeediHistoryDescription, ...]:
+    return (
+        YeediHistoryDescription(
+            key=f"cleaned_area_{label}",
+            name=f"Cleaned area {label.replace('_', ' ')}",
+            period=period,
+            value_fn=lambda totals: totals["area"],
+            device_class=SensorDeviceClass.AREA,
+            native_unit_of_measurement=UnitOfArea.SQUARE_METERS,
+            state_class=SensorStateClass.TOTAL,
+        ),
+        YeediHistoryDescription(
+            key=f"cleaning_time_{label}",
+            name=f"Cleaning time {label.replace('_', ' ')}",
+            period=period,
+            value_fn=lambda totals: round(totals["duration"] / 60),
+            device_class=SensorDeviceClass.DURATION,
+            native_unit_of_measurement=UnitOfTime.MINUTES,
+            state_class=SensorStateClass.TOTAL,
+        ),
+        YeediHistoryDescription(
+            key=f"cleaning_jobs_{label}",
+            name=f"Cleaning jobs {label.replace('_', ' ')}",
+            period=period,
+            value_fn=lambda totals: totals["jobs"],
+            state_class=SensorStateClass.TOTAL,
+        ),
+    )
+
+
+HISTORY_SENSORS: tuple[YeediHistoryDescription, ...] = (
+    *_history("day", "today"),
+    *_history("week", "this_week"),
+)
+
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
+    hub: YeediHub = hass.data[DOMAIN][entry.entry_id]
+    devices = entry_devices(entry.data)
+    async_add_entities(
+        [
+            *(
+                YeediSensor(entry, hub, did, description)
+                for did, _name in devices
+                for description in SENSORS
+            ),
+            *(
+                YeediMetricSensor(hub, did, description)
+                for did, _name in devices
+                for description in METRIC_SENSORS
+            ),
+            *(
+                YeediHistorySensor(did, description)
+                for did, _name in devices
+                for description in HISTORY_SENSORS
+            ),
+        ]
+    )
+
+
+class YeediSensor(YeediEntity, SensorEntity):
+    entity_description: YeediSensorDescription
+
+    def __init__(
+        self, entry: ConfigEntry, hub: YeediHub, did: str, description: YeediSensorDescription
+    ) -> None:
+        super().__init__(entry, hub, did, description.key)
+        self.entity_description = description
+
+    def _async_subscribe(self, bot: DeebotDevice) -> bool:
+        return any(self._subscribe(name, self._on_event) for name in self.entity_description.events)
+
+    async def _on_event(self, event: Any) -> None:
+        description = self.entity_description
+        if not description.match_fn(event):
+            return
+        value = description.value_fn(event)
+        if value == self._attr_native_value:
+            return
+        self._attr_native_value = value
+        self.async_write_ha_state()
+
+
+class YeediMetricSensor(SensorEntity):
+    """Polled view of the integration's own performance counters."""
+
+    entity_description: YeediMetricDescription
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, hub: YeediHub, did: str, description: YeediMetricDescription) -> None:
+        self.entity_description = description
+        self._hub = hub
+        self._did = did
+        device_unique = f"{DOMAIN}:{did}"
+        self._attr_unique_id = f"{device_unique}:{description.key}"
+        self._attr_device_info = DeviceInfo(identifiers={(DOMAIN, device_unique)})
+
+    def _metrics(self) -> Optional[Metrics]:
+        return self._hub.device_metrics.get(self._did)
+
+    @property
+    def available(self) -> bool:
+        return self._metrics() is not None
+
+    async def async_update(self) -> None:
+        metrics = self._metrics()
+        if metrics is not None:
+            self._attr_native_value = self.entity_description.value_fn(self._hub, metrics)
+
+
+class YeediHistorySensor(SensorEntity):
+    """Daily/weekly clean totals, refreshed when the history store changes.
+
+    The totals restart from zero each period, so ``last_reset`` is the local
+    start of the current day or week.
+    """
+
+    entity_description: YeediHistoryDescription
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+
+    def __init__(self, did: str, description: YeediHistoryDescription) -> None:
+        self.entity_description = description
+        self._did = did
+        device_unique = f"{DOMAIN}:{did}"
+        self._attr_unique_id = f"{device_unique}:{description.key}"
+        self._attr_device_info = DeviceInfo(identifiers={(DOMAIN, device_unique)})
+
+    async def async_added_to_hass(self) -> None:
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, SIGNAL_HISTORY_UPDATED.format(did=self._did), self._async_refresh
+            )
+        )
+        # Today and this week roll over at local midnight.
+        self.async_on_remove(
+            async_track_time_change(self.hass, self._async_refresh, hour=0, minute=0, second=1)
+        )
+        await self._async_refresh()
+
+    async def _async_refresh(self, _now: Any = None) -> None:
+        history = await async_get_history(self.hass)
+        totals = await history.async_aggregates(self._did)
+        period = self.entity_description.period
+        value = self.entity_description.value_fn(totals[period])
+        last_reset = period_start(period, time.time())
+        if (value, last_reset) == (self._attr_native_value, self._attr_last_reset):
+            return
+        self._attr_native_value = value
+        self._attr_last_reset = last_reset
+        self.async_write_ha_state()
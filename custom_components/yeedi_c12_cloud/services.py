@@ -0,0 +1,203 @@
+"""Domain-level services: commands to several robots at once, and profiling."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.const import ATTR_DEVICE_ID, ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+
+from .commands import CORE_COMMANDS, core_command
+from .const import (
+    CONNECT_TIMEOUT,
+    DOMAIN,
+    FLEET_PARALLELISM,
+    PROFILE_DURATION,
+    PROFILE_MAX_DURATION,
+)
+from .helpers import entry_devices
+from .hub import YeediHub
+from .profiling import get_profiler
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_FLEET_COMMAND = "fleet_command"
+SERVICE_START_PROFILE = "start_profile"
+SERVICE_STOP_PROFILE = "stop_profile"
+
+FLEET_COMMAND_SCHEMA = vol.Schema(
+    {
+        vol.Required("command"): vol.In(CORE_COMMANDS),
+        vol.Optional(ATTR_ENTITY_ID, default=list): cv.entity_ids,
+        vol.Optional(ATTR_DEVICE_ID, default=list): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional("parallelism", default=FLEET_PARALLELISM): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=64)
+        ),
+    }
+)
+
+START_PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional("duration", default=PROFILE_DURATION): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=PROFILE_MAX_DURATION)
+        ),
+    }
+)
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the domain services (once per Home Assistant instance)."""
+
+    if hass.services.has_service(DOMAIN, SERVICE_FLEET_COMMAND):
+        return
+
+    async def fleet_command(call: ServiceCall) -> ServiceResponse:
+        return await async_fleet_command(
+            hass,
+            call.data["command"],
+            _resolve_targets(hass, call.data[ATTR_ENTITY_ID], call.data[ATTR_DEVICE_ID]),
+            parallelism=call.data["parallelism"],
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_FLEET_COMMAND,
+        fleet_command,
+        schema=FLEET_COMMAND_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def start_profile(call: ServiceCall) -> ServiceResponse:
+        return get_profiler(hass).start(call.data["duration"])
+
+    async def stop_profile(call: ServiceCall) -> ServiceResponse:
+        return await get_profiler(hass).async_stop()
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_PROFILE,
+        start_profile,
+        schema=START_PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_STOP_PROFILE,
+        stop_profile,
+        schema=vol.Schema({}),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+def _did_from_unique_id(unique_id: str) -> str | None:
+    """``yeedi_c12_cloud:<did>[:<key>]`` -> ``<did>``."""
+
+    prefix = f"{DOMAIN}:"
+    if not unique_id.startswith(prefix):
+        return None
+    return unique_id[len(prefix) :].split(":", 1)[0] or None
+
+
+def _resolve_targets(
+    hass: HomeAssistant, entity_ids: list[str], device_ids: list[str]
+) -> dict[str, tuple[YeediHub, str]]:
+    """Map the requested entities/devices to ``did -> (hub, name)``.
+
+    With neither given, every loaded robot is targeted.
+    """
+
+    domain_data = hass.data.get(DOMAIN, {})
+    robots: dict[str, tuple[YeediHub, str]] = {}
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        if entry.entry_id in domain_data:
+            for did, name in entry_devices(entry.data):
+                robots[did] = (domain_data[entry.entry_id], name)
+    if not entity_ids and not device_ids:
+        return robots
+
+    wanted: set[str] = set()
+    unknown: list[str] = []
+    ent_reg = er.async_get(hass)
+    for entity_id in entity_ids:
+        entity = ent_reg.async_get(entity_id)
+        did = _did_from_unique_id(entity.unique_id) if entity else None
+        if did in robots:
+            wanted.add(did)
+        else:
+            unknown.append(entity_id)
+    dev_reg = dr.async_get(hass)
+    for device_id in device_ids:
+        device = dev_reg.async_get(device_id)
+        dids = {
+            _did_from_unique_id(ident)
+            for domain, ident in (device.identifiers if device else ())
+            if domain == DOMAIN
+        } & robots.keys()
+        if dids:
+            wanted |= dids
+        else:
+            unknown.append(device_id)
+    if unknown:
+        raise HomeAssistantError(f"Not a loaded {DOMAIN} robot: {', '.join(unknown)}")
+    return {did: robots[did] for did in wanted}
+
+
+async def async_fleet_command(
+    hass: HomeAssistant,
+    command: str,
+    targets: dict[str, tuple[YeediHub, str]],
+    *,
+    parallelism: int = FLEET_PARALLELISM,
+) -> dict[str, Any]:
+    """Send ``command`` to every target concurrently, ``parallelism`` at a time.
+
+    Each robot goes through its hub's shared connection and command queue,
+    so robots on one account share a single login and MQTT session.  One
+    failing robot does not affect the others; the result lists the outcome
+    and timing of each.
+    """
+
+    semaphore = asyncio.Semaphore(parallelism)
+
+    async def run_one(did: str, hub: YeediHub, name: str) -> dict[str, Any]:
+        async with semaphore:
+            started = time.monotonic()
+            result: dict[str, Any] = {"name": name, "success": True}
+            try:
+                async with asyncio.timeout(CONNECT_TIMEOUT):
+                    await hub.async_get_device(did)
+                    await hub.async_wait_ready()
+                    payload, priority = core_command(command)
+                    await hub.command_queue(did).async_submit(payload, priority=priority)
+            except Exception as err:
+                result["success"] = False
+                result["error"] = str(err) or type(err).__name__
+            result["elapsed_ms"] = round((time.monotonic() - started) * 1000, 1)
+            return result
+
+    started = time.monotonic()
+    outcomes = await asyncio.gather(
+        *(run_one(did, hub, name) for did, (hub, name) in targets.items())
+    )
+    results = dict(zip(targets, outcomes))
+    failed = [did for did, r in results.items() if not r["success"]]
+    elapsed_ms = round((time.monotonic() - started) * 1000, 1)
+    _LOGGER.debug(
+        "%s to %d robot(s) in %.0f ms (%d failed)", command, len(results), elapsed_ms, len(failed)
+    )
+    return {
+        "command": command,
+        "elapsed_ms": elapsed_ms,
+        "succeeded": len(results) - len(failed),
+        "failed": len(failed),
+        "results": results,
+    }
@@ -0,0 +1,138 @@
+"""Per-robot event subscriptions, held only while something consumes them.
+
+deebot_client dispatches every event as one task per subscriber and, after
+an outage, refreshes every event type that has a subscriber.  The vacuum,
+each helper entity and the push-health monitor used to subscribe on their
+own, so one battery tick became a dozen tasks and event types nobody
+rendered were still refreshed.  :class:`EventSubscriptions` keeps a single
+bus subscription per event type, fans each event out to its consumers in
+one task, and drops the bus subscription when the last consumer leaves
+(an entity being disabled or removed).
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Optional
+
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .loader import optional_attr
+from .metrics import Metrics
+
+if TYPE_CHECKING:
+    from deebot_client.device import Device as DeebotDevice
+
+_LOGGER = logging.getLogger(__name__)
+
+Consumer = Callable[[Any], Awaitable[None]]
+
+# Event names already reported as missing from the installed deebot_client.
+_unresolved: set[str] = set()
+
+
+def resolve_event(name: str) -> Optional[type]:
+    """Return the deebot_client event class called ``name``, or ``None``.
+
+    ``name`` is relative to ``deebot_client.events``: ``"BatteryEvent"`` or,
+    for events only exported by a submodule, ``"water_info.WaterAmountEvent"``.
+    A name this client lacks is logged once, since nothing will ever arrive
+    for it.
+    """
+
+    module, _, attr = name.rpartition(".")
+    event_class = optional_attr(
+        f"deebot_client.events.{module}" if module else "deebot_client.events", attr
+    )
+    if event_class is None and name not in _unresolved:
+        _unresolved.add(name)
+        _LOGGER.warning("deebot_client has no event %s; it will not be received", name)
+    return event_class
+
+
+class EventSubscriptions:
+    """Shared, demand-driven subscriptions to one robot's event bus."""
+
+    def __init__(self, hass: HomeAssistant, bot: DeebotDevice, *, name: str) -> None:
+        self.hass = hass
+        self._bot = bot
+        self._name = name
+        self._consumers: dict[type, list[Consumer]] = {}
+        self._unsubs: dict[type, Callable[[], None]] = {}
+        self._last: dict[type, Any] = {}
+        self.metrics = Metrics()
+
+    @property
+    def active(self) -> dict[str, int]:
+        """Subscribed event types and how many consumers each has."""
+
+        return {cls.__name__: len(consumers) for cls, consumers in self._consumers.items()}
+
+    def subscribe(self, event: type | str, consumer: Consumer) -> Optional[Callable[[], None]]:
+        """Deliver ``event`` to ``consumer`` until the returned callback is called.
+
+        ``event`` may be a deebot_client event class or a name for
+        :func:`resolve_event`; ``None`` is returned if the installed client
+        has no such event.
+        """
+
+        event_class = resolve_event(event) if isinstance(event, str) else event
+        if event_class is None:
+            return None
+
+        consumers = self._consumers.setdefault(event_class, [])
+        consumers.append(consumer)
+        if event_class not in self._unsubs:
+            # The bus refreshes (or replays the last event) for us.
+            self.metrics.incr("bus_subscribes")
+            self._unsubs[event_class] = self._bot.events.subscribe(
+                event_class, self._dispatcher(event_class)
+            )
+        elif (last := self._last.get(event_class)) is not None:
+            # Late joiners get the current value, as the bus would give them.
+            self.hass.async_create_background_task(
+                self._async_deliver(consumer, last), f"{DOMAIN} replay {self._name}"
+            )
+
+        def unsubscribe() -> None:
+            current = self._consumers.get(event_class)
+            if current is None or consumer not in current:
+                return
+            current.remove(consumer)
+            if not current:
+                self._drop(event_class)
+
+        return unsubscribe
+
+    def close(self) -> None:
+        """Drop every bus subscription (the device is being torn down)."""
+
+        for event_class in list(self._consumers):
+            self._drop(event_class)
+
+    def _drop(self, event_class: type) -> None:
+        del self._consumers[event_class]
+        self._last.pop(event_class, None)
+        unsub = self._unsubs.pop(event_class, None)
+        if unsub is not None:
+            self.metrics.incr("bus_unsubscribes")
+            unsub()
+
+    def _dispatcher(self, event_class: type) -> Consumer:
+        counter = f"events.{event_class.__name__}"
+
+        async def dispatch(event: Any) -> None:
+            self._last[event_class] = event
+            self.metrics.incr(counter)
+            # Copy: a consumer may unsubscribe while handling the event.
+            for consumer in tuple(self._consumers.get(event_class, ())):
+                await self._async_deliver(consumer, event)
+
+        return dispatch
+
+    async def _async_deliver(self, consumer: Consumer, event: Any) -> None:
+        try:
+            await consumer(event)
+        except Exception:
+            _LOGGER.exception("Error handling %s for %s", type(event).__name__, self._name)
@@ -1,58 +1,57 @@
 
 from __future__ import annotations
+import asyncio
+from functools import partial
+import logging
+from pathlib import Path
 import time
-from typing import Any, Optional
-
-import aiohttp
-from deebot_client.api_client import ApiClient
-from deebot_client.authentication import Authenticator
-from deebot_client.commands.json.charge import Charge
-from deebot_client.commands.json.clean import Clean, CleanAction
-from deebot_client.commands.json.locate import PlaySound
-from deebot_client.device import Device as DeebotDevice
-from deebot_client.events import (
-    BatteryEvent, CleanStateEvent, ErrorEvent, BinFullEvent, ChargeStateEvent
-)
-# Optional events and commands (guarded)
-try:
-    from deebot_client.events import FanSpeedEvent, WaterLevelEvent
-except Exception:
-    FanSpeedEvent = None
-    WaterLevelEvent = None
-
-try:
-    from deebot_client.commands.json.fan import SetFanSpeed
-except Exception:
-    SetFanSpeed = None
-try:
-    from deebot_client.commands.json.water import SetWaterLevel
-except Exception:
-    SetWaterLevel = None
-
-from deebot_client.mqtt_client import MqttClient, create_mqtt_config
-from deebot_client.util import md5
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+import voluptuous as vol
 from homeassistant.components.vacuum import StateVacuumEntity, VacuumEntityFeature
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import (
-    STATE_CLEANING,
-    STATE_DOCKED,
-    STATE_IDLE,
-    STATE_PAUSED,
-    STATE_RETURNING,
-)
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import entity_platform
 from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.event import async_call_later
 
 from .const import (
     DOMAIN,
-    CONF_ACCOUNT,
-    CONF_COUNTRY,
-    CONF_DEVICE_ID,
-    CONF_DEVICE_NAME,
-    CONF_PASSWORD,
+    CONF_STATE_WRITE_WINDOW,
+    CONNECT_TIMEOUT,
+    DEFAULT_STATE_WRITE_WINDOW,
+    EVENT_RECORDING_DURATION,
+    EVENT_RECORDING_MAX_DURATION,
+    ROOMS_WAIT_TIMEOUT,
+)
+from .capabilities import (
+    CapabilityStore,
+    ModelCapabilities,
+    async_get_capability_store,
+    device_model,
+    probe,
 )
-from .helpers import create_yeedi_api_config
+from .command_queue import PRIORITY_LOW, PRIORITY_NORMAL, CommandQueue
+from .commands import core_command
+from .event_log import EventRecorder
+from .helpers import entry_devices
+from .history import CleanLogSync, async_get_history
+from .hub import YeediHub, backoff_delay
+from .loader import optional_attr
+from .metrics import Metrics
+from .normalize import FAN_SPEEDS, bin_full, clean_state, error_text
+from .normalize import fan_speed as normalize_fan_speed
+from .rooms import RoomIndex
+
+if TYPE_CHECKING:
+    from deebot_client.device import Device as DeebotDevice
+    from deebot_client.events import (
+        AvailabilityEvent, BatteryEvent, ErrorEvent, FanSpeedEvent, StateEvent
+    )
+    from deebot_client.events.water_info import WaterAmountEvent
+
+_LOGGER = logging.getLogger(__name__)
 
 SUPPORTED_FEATURES = (
     VacuumEntityFeature.STATE
@@ -67,8 +66,15 @@ SUPPORTED_FEATURES = (
 )
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
-    entity = YeediCloudVacuum(hass, entry)
-    async_add_entities([entity], True)
+    hub: YeediHub = hass.data[DOMAIN][entry.entry_id]
+    capabilities = await async_get_capability_store(hass)
+    async_add_entities(
+        [
+            YeediCloudVacuum(hass, entry, hub, did, name, capabilities=capabilities)
+            for did, name in entry_devices(entry.data)
+        ],
+        True,
+    )
 
     platform = entity_platform.async_get_current_platform()
     platform.async_register_entity_service("set_fan_speed", {"fan_speed": str}, "async_set_fan_speed")
@@ -77,16 +83,53 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     platform.async_register_entity_service("clean_rooms", {"rooms": list}, "async_clean_rooms")
     platform.async_register_entity_service("clean_areas", {"areas": list}, "async_clean_areas")
     platform.async_register_entity_service("empty_bin", {}, "async_empty_bin")
+    platform.async_register_entity_service(
+        "start_event_recording",
+        {vol.Optional("duration", default=EVENT_RECORDING_DURATION): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=EVENT_RECORDING_MAX_DURATION)
+        )},
+        "async_start_event_recording",
+    )
+    platform.async_register_entity_service("stop_event_recording", {}, "async_stop_event_recording")
     platform.async_register_entity_service("set_dnd", {"enabled": bool, "start": str | None, "end": str | None}, "async_set_dnd")
 
+# deebot_client event class name -> handler method.  Also used by the event
+# recorder and by scripts/replay_events.py to route recorded events.
+EVENT_HANDLERS: dict[str, str] = {
+    "AvailabilityEvent": "_on_availability",
+    "BatteryEvent": "_on_battery",
+    "StateEvent": "_on_state",
+    "ErrorEvent": "_on_error",
+    "FanSpeedEvent": "_on_fan_speed",
+    "water_info.WaterAmountEvent": "_on_water_level",
+    "RoomsEvent": "_on_rooms",
+}
+
+
 class YeediCloudVacuum(StateVacuumEntity):
     _attr_has_entity_name = True
-
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry):
+    # Mirrored by the sensor/binary_sensor entities, which record them only
+    # when they change; keep them out of every recorded vacuum state.
+    _unrecorded_attributes = frozenset(
+        {"battery_level", "battery_icon", "bin_full", "error", "water_level", "rooms"}
+    )
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        hub: YeediHub,
+        did: str,
+        name: str,
+        *,
+        capabilities: Optional[CapabilityStore] = None,
+    ):
         self.hass = hass
         self.entry = entry
-        self._name = entry.data.get(CONF_DEVICE_NAME) or "Yeedi C12"
-        self._unique = f"{DOMAIN}:{entry.data[CONF_DEVICE_ID]}"
+        self._hub = hub
+        self._did = did
+        self._name = name
+        self._unique = f"{DOMAIN}:{did}"
         self._attr_name = self._name
         self._attr_unique_id = self._unique
         self._attr_supported_features = SUPPORTED_FEATURES
@@ -97,11 +140,34 @@ class YeediCloudVacuum(StateVacuumEntity):
         self._battery: Optional[int] = None
         self._bin_full: Optional[bool] = None
         self._error: Optional[str] = None
+        self._rooms = RoomIndex()
+        self._rooms_supported = False
+        # Known before connecting if this model was probed on an earlier run.
+        self._capability_store = capabilities
+        self._caps: Optional[ModelCapabilities] = (
+            capabilities.for_device(did) if capabilities is not None else None
+        )
+        self._apply_capabilities()
 
-        self._mqtt: Optional[MqttClient] = None
         self._bot: Optional[DeebotDevice] = None
-        self._session: Optional[aiohttp.ClientSession] = None
-        self._auth: Optional[Authenticator] = None
+        self._queue: Optional[CommandQueue] = None
+        self._unsubs: list[Callable[[], None]] = []
+        self._connect_task: Optional[asyncio.Task] = None
+        self._connect_lock = asyncio.Lock()
+        self._attr_available = False
+        self.metrics = Metrics()
+
+        # Event bursts (after a command or reconnect) are folded into one
+        # state write per window, and skipped if nothing visible changed.
+        self._write_window = (
+            entry.options.get(CONF_STATE_WRITE_WINDOW, DEFAULT_STATE_WRITE_WINDOW) / 1000
+        )
+        self._write_unsub: Optional[CALLBACK_TYPE] = None
+        self._last_written: Optional[tuple] = None
+
+        self._clean_log: Optional[CleanLogSync] = None
+        self._recorder: Optional[EventRecorder] = None
+        self._recording_unsub: Optional[CALLBACK_TYPE] = None
 
     @property
     def battery_level(self) -> int | None:
@@ -113,7 +179,7 @@ class YeediCloudVacuum(StateVacuumEntity):
 
     @property
     def fan_speed_list(self) -> list[str]:
-        return ["silent", "standard", "max", "turbo"]
+        return self._caps.fan_speed_list if self._caps is not None else FAN_SPEEDS
 
     @property
     def state(self) -> str | None:
@@ -128,6 +194,8 @@ class YeediCloudVacuum(StateVacuumEntity):
             out["error"] = self._error
         if self._water_level is not None:
             out["water_level"] = self._water_level
+        if self._rooms.ready:
+            out["rooms"] = self._rooms.rooms
         return out
 
     @property
@@ -140,123 +208,259 @@ class YeediCloudVacuum(StateVacuumEntity):
         )
 
     async def async_added_to_hass(self) -> None:
-        await self._ensure_connected()
+        # Login, discovery and MQTT setup can take seconds; keep them off the
+        # platform setup path and report unavailable until they finish.
+        self._connect_task = self.entry.async_create_background_task(
+            self.hass, self._async_connect_loop(), f"{DOMAIN} connect {self._unique}"
+        )
+        self._hub.device_metrics[self._did] = self.metrics
 
     async def async_will_remove_from_hass(self) -> None:
+        await self.async_stop_event_recording()
+        if self._clean_log is not None:
+            self._clean_log.stop()
+            self._clean_log = None
+        if self._hub.device_metrics.get(self._did) is self.metrics:
+            del self._hub.device_metrics[self._did]
+        if self._write_unsub is not None:
+            self._write_unsub()
+            self._write_unsub = None
+        if self._connect_task is not None:
+            self._connect_task.cancel()
+            self._connect_task = None
+        # The MQTT connection and HTTP session belong to the shared hub and
+        # are closed when the last config entry of the account unloads.
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs.clear()
+        self._bot = None
+        self._queue = None
+
+    async def _async_connect_loop(self) -> None:
+        """Connect in the background, retrying until the device is reachable."""
+
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                await self._ensure_connected()
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:
+                self.metrics.incr("connect_failures")
+                delay = backoff_delay(attempt)
+                attempt += 1
+                _LOGGER.warning(
+                    "Connecting %s failed (%s); retrying in %.0fs",
+                    self._name,
+                    err or type(err).__name__,
+                    delay,
+                )
+                await asyncio.sleep(delay)
+                continue
+            break
+        elapsed = time.monotonic() - started
+        self.metrics.observe("startup_connect", elapsed)
+        _LOGGER.debug("%s available after %.2fs", self._name, elapsed)
+        self._async_flush_write()
         try:
-            if self._mqtt:
-                await self._mqtt.close()
-            if self._session:
-                await self._session.close()
+            await self._async_start_clean_log()
         except Exception:
-            pass
+            _LOGGER.warning("Clean history unavailable for %s", self._name, exc_info=True)
+
+    async def _async_start_clean_log(self) -> None:
+        """Record finished jobs (and the cloud's clean logs, if supported)."""
+
+        history = await async_get_history(self.hass)
+        log_event = optional_attr("deebot_client.events", "CleanLogEvent")
+        get_logs = optional_attr("deebot_client.commands.json.clean_logs", "GetCleanLogs")
+        request = None
+        if log_event and get_logs and self._caps.clean_logs:
+            request = partial(self._async_request_clean_logs, get_logs)
+        sync = CleanLogSync(self.hass, history, self._did, request)
+        await sync.async_start()
+        if request is not None:
+            # The first subscription also fetches the logs (startup sync).
+            events = self._hub.event_subscriptions(self._did)
+            self._unsubs.append(events.subscribe(log_event, sync.async_on_clean_logs))
+        self._clean_log = sync
+
+    async def _async_request_clean_logs(self, get_logs: Callable[[int], Any], count: int) -> None:
+        await self._async_send(get_logs(count), priority=PRIORITY_LOW, key="clean_logs")
 
     async def _ensure_connected(self):
-        if self._mqtt and self._bot:
+        if self._bot:
+            # Commands queue here while the hub reconnects after a broker blip.
+            await self._hub.async_wait_ready()
             return
-        data = self.entry.data
-        account = data[CONF_ACCOUNT]
-        password = data[CONF_PASSWORD]
-        country = data[CONF_COUNTRY]
-        did = data[CONF_DEVICE_ID]
-        device_id = md5(str(time.time()))
-
-        self._session = aiohttp.ClientSession()
-        yeedi_config = create_yeedi_api_config(
-            self._session, device_id=device_id, alpha_2_country=country
+        async with self._connect_lock:
+            if self._bot:
+                return
+            started = time.monotonic()
+            async with asyncio.timeout(CONNECT_TIMEOUT):
+                bot = await self._hub.async_get_device(self._did)
+            self.metrics.observe("connect", time.monotonic() - started)
+            self._bot = bot
+            self._queue = self._hub.command_queue(self._did)
+
+            if self._capability_store is not None:
+                self._caps = self._capability_store.async_probe(self._did, bot)
+            else:
+                self._caps = probe(device_model(bot), bot)
+            self._apply_capabilities()
+            events = self._hub.event_subscriptions(self._did)
+            for name in self._event_names():
+                handler = self._timed(name, getattr(self, EVENT_HANDLERS[name]))
+                if (unsub := events.subscribe(name, handler)) is not None:
+                    self._unsubs.append(unsub)
+            self._attr_available = True
+
+    def _timed(self, name: str, handler: Callable[[Any], Any]) -> Callable[[Any], Any]:
+        """Count ``name`` events and record the handler's latency."""
+
+        metrics = self.metrics
+        counter = f"events.{name}"
+        timing = f"handler.{name}"
+
+        async def timed(event: Any) -> None:
+            started = time.perf_counter()
+            try:
+                await handler(event)
+            finally:
+                metrics.observe(timing, time.perf_counter() - started)
+                metrics.incr(counter)
+
+        return timed
+
+    def _apply_capabilities(self) -> None:
+        caps = self._caps
+        features = SUPPORTED_FEATURES
+        if caps is not None and not caps.fan_speeds:
+            features &= ~VacuumEntityFeature.FAN_SPEED
+        self._attr_supported_features = features
+        # RoomsEvent is sent once on subscribe and again only when the map changes.
+        self._rooms_supported = caps is not None and caps.rooms
+
+    def _event_names(self) -> list[str]:
+        """Events backing something this model has; the rest stay unsubscribed."""
+
+        skip = set()
+        if not self._rooms_supported:
+            skip.add("RoomsEvent")
+        if self._caps is not None:
+            if not self._caps.fan_speeds:
+                skip.add("FanSpeedEvent")
+            if not self._caps.water_levels:
+                skip.add("water_info.WaterAmountEvent")
+        return [name for name in EVENT_HANDLERS if name not in skip]
+
+    def _state_snapshot(self) -> tuple:
+        return (
+            self._attr_available,
+            self._attr_supported_features,
+            self._state,
+            self._battery,
+            self._fan_speed,
+            self._water_level,
+            self._bin_full,
+            self._error,
+            self._rooms.version,
         )
-        self._auth = Authenticator(yeedi_config.rest, account, md5(password))
-        api = ApiClient(self._auth)
-        devices = await api.get_devices()
-
-        target = None
-        for d in devices.mqtt:
-            if getattr(d, "did", None) == did or getattr(d, "id", None) == did:
-                target = d
-                break
-        if not target and devices.mqtt:
-            target = devices.mqtt[0]
-        self._bot = DeebotDevice(target, self._auth)
-
-        mqtt_config = create_mqtt_config(
-            device_id=device_id,
-            country=country,
-            override_mqtt_url=yeedi_config.mqtt_override,
+
+    @callback
+    def _async_schedule_write(self) -> None:
+        """Request a state write, coalescing bursts within the write window."""
+
+        self.metrics.incr("events")
+        if self._write_unsub is not None:
+            self.metrics.incr("writes_coalesced")
+            return
+        if self._write_window <= 0:
+            self._async_flush_write()
+            return
+        self._write_unsub = async_call_later(
+            self.hass, self._write_window, self._async_flush_write
         )
-        self._mqtt = MqttClient(mqtt_config, self._auth)
-        await self._bot.initialize(self._mqtt)
-
-        self._bot.events.subscribe(BatteryEvent, self._on_battery)
-        self._bot.events.subscribe(CleanStateEvent, self._on_clean_state)
-        self._bot.events.subscribe(ChargeStateEvent, self._on_charge_state)
-        self._bot.events.subscribe(ErrorEvent, self._on_error)
-        self._bot.events.subscribe(BinFullEvent, self._on_binfull)
-        if FanSpeedEvent:
-            self._bot.events.subscribe(FanSpeedEvent, self._on_fan_speed)
-        if WaterLevelEvent:
-            self._bot.events.subscribe(WaterLevelEvent, self._on_water_level)
 
-    async def _on_battery(self, event: BatteryEvent):
-        self._battery = int(event.value) if event.value is not None else None
+    @callback
+    def _async_flush_write(self, _now: Any = None) -> None:
+        self._write_unsub = None
+        snapshot = self._state_snapshot()
+        if snapshot == self._last_written:
+            self.metrics.incr("writes_suppressed")
+            return
+        self._last_written = snapshot
+        self.metrics.incr("writes")
         self.async_write_ha_state()
 
-    async def _on_binfull(self, event: BinFullEvent):
-        self._bin_full = bool(event.value)
-        self.async_write_ha_state()
+    async def _on_availability(self, event: AvailabilityEvent):
+        self._attr_available = bool(event.available)
+        self._async_schedule_write()
+
+    async def _on_battery(self, event: BatteryEvent):
+        self._battery = int(event.value) if event.value is not None else None
+        self._async_schedule_write()
 
     async def _on_error(self, event: ErrorEvent):
-        self._error = event.value or ""
-        self.async_write_ha_state()
+        self._error = error_text(event.code, event.description) or ""
+        # deebot-client has no bin event; a full bin is reported as an error.
+        self._bin_full = bin_full(event.code)
+        self._async_schedule_write()
 
-    async def _on_fan_speed(self, event):
-        self._fan_speed = str(event.value).lower()
-        self.async_write_ha_state()
+    async def _on_fan_speed(self, event: FanSpeedEvent):
+        self._fan_speed = normalize_fan_speed(event.speed)
+        self._async_schedule_write()
 
-    async def _on_water_level(self, event):
+    async def _on_water_level(self, event: WaterAmountEvent):
         try:
             self._water_level = int(event.value)
         except Exception:
             self._water_level = None
-        self.async_write_ha_state()
+        self._async_schedule_write()
 
-    async def _on_clean_state(self, event: CleanStateEvent):
-        val = (str(event.value) if event.value is not None else "").lower()
-        if any(k in val for k in ["clean", "working", "sweep", "mop"]):
-            self._state = STATE_CLEANING
-        elif "pause" in val:
-            self._state = STATE_PAUSED
-        elif any(k in val for k in ["idle", "stop", "standby"]):
-            self._state = STATE_IDLE
-        self.async_write_ha_state()
+    async def _on_rooms(self, event):
+        if self._rooms.update(event.rooms):
+            _LOGGER.debug("%s room index: %s", self._name, self._rooms.rooms)
+        self._async_schedule_write()
 
-    async def _on_charge_state(self, event: ChargeStateEvent):
-        val = (str(event.value) if event.value is not None else "").lower()
-        if any(k in val for k in ["charging", "return"]):
-            self._state = STATE_RETURNING
-        elif "docked" in val or "station" in val:
-            self._state = STATE_DOCKED
-        self.async_write_ha_state()
+    async def _on_state(self, event: StateEvent):
+        state = clean_state(event.state)
+        if state is not None:
+            self._state = state
+            if self._clean_log is not None:
+                self._clean_log.on_state(state)
+        self._async_schedule_write()
 
     # ---- Core commands ----
+    async def _async_send(self, command, *, priority: int = PRIORITY_NORMAL, key: str | None = None):
+        started = time.monotonic()
+        try:
+            await self._ensure_connected()
+            return await self._queue.async_submit(command, priority=priority, key=key)
+        finally:
+            # Time until the cloud answered, including connecting and queueing.
+            self.metrics.observe("command", time.monotonic() - started)
+
     async def async_start(self):
-        await self._ensure_connected()
-        await self._bot.execute_command(Clean(CleanAction.START))
+        await self._async_send_core("start")
 
     async def async_stop(self):
-        await self._ensure_connected()
-        await self._bot.execute_command(Clean(CleanAction.STOP))
+        await self._async_send_core("stop")
 
     async def async_pause(self):
-        await self._ensure_connected()
-        await self._bot.execute_command(Clean(CleanAction.PAUSE))
+        await self._async_send_core("pause")
 
     async def async_return_to_base(self):
-        await self._ensure_connected()
-        await self._bot.execute_command(Charge())
+        await self._async_send_core("return_to_base")
 
     async def async_locate(self):
+        await self._async_send_core("locate")
+
+    async def _async_send_core(self, name: str):
+        # Connecting imports deebot_client (in the executor) before we build.
         await self._ensure_connected()
-        await self._bot.execute_command(PlaySound())
+        command, priority = core_command(name)
+        await self._async_send(command, priority=priority)
 
     async def async_send_command(self, command: str, params: dict | list | None = None):
         await self._ensure_connected()
@@ -274,49 +478,154 @@ class YeediCloudVacuum(StateVacuumEntity):
         # otherwise no-op
 
     # ---- Extended services ----
+    def _check_fan_speed(self, name: Optional[str], requested: str) -> None:
+        """Reject fan speeds the model cannot take (once its capabilities are known)."""
+
+        caps = self._caps
+        if caps is None:
+            return
+        if not caps.fan_speeds:
+            raise HomeAssistantError(f"{self._name} does not support setting the fan speed")
+        if name not in caps.fan_speeds:
+            raise HomeAssistantError(
+                f"{self._name} has no fan speed {requested!r}; "
+                f"use one of {', '.join(caps.fan_speeds)}"
+            )
+
+    def _check_water_level(self, level: int) -> None:
+        caps = self._caps
+        if caps is None:
+            return
+        if not caps.water_levels:
+            raise HomeAssistantError(f"{self._name} does not support setting the water level")
+        if level not in caps.water_levels:
+            raise HomeAssistantError(
+                f"{self._name} has no water level {level}; use one of "
+                f"{', '.join(map(str, caps.water_levels))}"
+            )
+
     async def async_set_fan_speed(self, fan_speed: str):
+        name = normalize_fan_speed(fan_speed)
+        self._check_fan_speed(name, fan_speed)
         await self._ensure_connected()
-        if SetFanSpeed is not None:
-            await self._bot.execute_command(SetFanSpeed(fan_speed))
+        self._check_fan_speed(name, fan_speed)
+
+        member = self._caps.fan_speeds[name]
+        bot_caps = getattr(self._bot, "capabilities", None)
+        capability = getattr(bot_caps, "fan_speed", None) if member else None
+        if capability is not None:
+            level = next(t for t in capability.types if t.name == member)
+            command = capability.set(level)
         else:
-            await self._bot.execute_command(Clean(CleanAction.START, options={"fanSpeed": fan_speed}))
+            SetFanSpeed = optional_attr("deebot_client.commands.json.fan_speed", "SetFanSpeed")
+            if SetFanSpeed is None or not member:
+                raise HomeAssistantError(
+                    f"{self._name} cannot set the fan speed with this deebot_client"
+                )
+            command = SetFanSpeed(member)
+        await self._async_send(command, key="fan_speed")
 
     async def async_set_water_level(self, level: int):
+        level = int(level)
+        self._check_water_level(level)
         await self._ensure_connected()
-        if SetWaterLevel is not None:
-            await self._bot.execute_command(SetWaterLevel(int(level)))
+        self._check_water_level(level)
+
+        bot_caps = getattr(self._bot, "capabilities", None)
+        capability = getattr(getattr(bot_caps, "water", None), "amount", None)
+        if capability is not None:
+            amount = next(t for t in capability.types if int(t) == level)
+            command = capability.set(amount)
         else:
-            await self._bot.execute_command(Clean(CleanAction.START, options={"waterLevel": int(level)}))
+            SetWaterInfo = optional_attr("deebot_client.commands.json.water_info", "SetWaterInfo")
+            WaterAmount = optional_attr("deebot_client.events.water_info", "WaterAmount")
+            if SetWaterInfo is None or WaterAmount is None:
+                raise HomeAssistantError(
+                    f"{self._name} cannot set the water level with this deebot_client"
+                )
+            command = SetWaterInfo(WaterAmount(level))
+        await self._async_send(command, key="water_level")
 
     async def async_set_clean_mode(self, mode: str):
-        await self._ensure_connected()
+        from deebot_client.commands.json.clean import Clean, CleanAction
+
         m = (mode or "").lower()
         if m in ("auto", "standard"):
-            await self._bot.execute_command(Clean(CleanAction.START, options={"type": "auto"}))
+            await self._async_send(Clean(CleanAction.START, options={"type": "auto"}))
         elif m == "edge":
-            await self._bot.execute_command(Clean(CleanAction.START, options={"type": "edge"}))
+            await self._async_send(Clean(CleanAction.START, options={"type": "edge"}))
         elif m in ("spot", "area"):
-            await self._bot.execute_command(Clean(CleanAction.START, options={"type": "spot"}))
+            await self._async_send(Clean(CleanAction.START, options={"type": "spot"}))
         else:
-            await self._bot.execute_command(Clean(CleanAction.START))
+            await self._async_send(Clean(CleanAction.START))
 
     async def async_clean_rooms(self, rooms: list):
+        from deebot_client.commands.json.clean import Clean, CleanAction
+
         await self._ensure_connected()
-        await self._bot.execute_command(Clean(CleanAction.START, options={"type": "rooms", "rooms": rooms}))
+        if not self._rooms_supported:
+            # No map support reported: pass the values through unchanged.
+            await self._async_send(Clean(CleanAction.START, options={"type": "rooms", "rooms": rooms}))
+            return
+        if not self._rooms.ready:
+            try:
+                await self._rooms.async_wait(ROOMS_WAIT_TIMEOUT)
+            except TimeoutError:
+                raise HomeAssistantError(
+                    f"{self._name} has not reported its rooms yet; try again shortly"
+                ) from None
+        ids = self._rooms.resolve(rooms)
+
+        if self._caps.area_clean:
+            from deebot_client.models import CleanMode
+
+            area = self._bot.capabilities.clean.action.area
+            await self._async_send(area(CleanMode.SPOT_AREA, ",".join(map(str, ids)), 1))
+        else:
+            await self._async_send(Clean(CleanAction.START, options={"type": "rooms", "rooms": ids}))
 
     async def async_clean_areas(self, areas: list):
-        await self._ensure_connected()
-        await self._bot.execute_command(Clean(CleanAction.START, options={"type": "areas", "areas": areas}))
+        from deebot_client.commands.json.clean import Clean, CleanAction
+
+        await self._async_send(Clean(CleanAction.START, options={"type": "areas", "areas": areas}))
 
     async def async_empty_bin(self):
-        await self._ensure_connected()
-        await self._bot.execute_command(Charge(options={"emptyDustBox": True}))
+        from deebot_client.commands.json.charge import Charge
+
+        await self._async_send(Charge(options={"emptyDustBox": True}))
 
     async def async_set_dnd(self, enabled: bool, start: str | None = None, end: str | None = None):
-        await self._ensure_connected()
+        from deebot_client.commands.json.clean import Clean, CleanAction
+
         opts = {"enabled": bool(enabled)}
         if start:
             opts["start"] = start
         if end:
             opts["end"] = end
-        await self._bot.execute_command(Clean(CleanAction.PAUSE, options={"dnd": opts}))
+        await self._async_send(Clean(CleanAction.PAUSE, options={"dnd": opts}))
+
+    # ---- Event recording ----
+    async def async_start_event_recording(self, duration: int = EVENT_RECORDING_DURATION):
+        """Append this robot's events to a file under the config directory."""
+
+        await self._ensure_connected()
+        await self.async_stop_event_recording()
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        path = Path(self.hass.config.path(DOMAIN, f"events-{self._did}-{stamp}.jsonl"))
+        recorder = EventRecorder(self.hass, path, self._did)
+        await recorder.async_start(self._hub.event_subscriptions(self._did), self._event_names())
+        self._recorder = recorder
+
+        async def _expire(_now: Any) -> None:
+            self._recording_unsub = None
+            await self.async_stop_event_recording()
+
+        self._recording_unsub = async_call_later(self.hass, duration, _expire)
+
+    async def async_stop_event_recording(self):
+        if self._recording_unsub is not None:
+            self._recording_unsub()
+            self._recording_unsub = None
+        recorder, self._recorder = self._recorder, None
+        if recorder is not None:
+            await recorder.async_stop()
@@ -0,0 +1,109 @@
+"""Micro-benchmark for the vacuum event handlers and value normalisation.
+
+Runs a fixed mix of battery, state and fan-speed events
+through the real ``YeediCloudVacuum`` handlers (with state writes counted
+instead of sent to Home Assistant) and reports events per second.  Use it
+as a regression gate before and after touching the handler hot path::
+
+    python -m scripts.bench_handlers --events 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import dataclass
+import sys
+import time
+from types import SimpleNamespace
+from typing import Any, Callable, List
+
+from custom_components.yeedi_c12_cloud import normalize
+from custom_components.yeedi_c12_cloud.vacuum import YeediCloudVacuum
+
+# StateEvent values, including spellings only the keyword fallback knows.
+_STATE_VALUES = ["cleaning", "paused", "idle", "returning", "docked", "SWEEPING", "standby"]
+_FAN_VALUES = ["quiet", "normal", "max", "max_plus"]
+
+
+@dataclass(slots=True)
+class BenchResult:
+    """Throughput of one benchmark case."""
+
+    name: str
+    events: int
+    seconds: float
+    writes: int = 0
+
+    @property
+    def events_per_second(self) -> float:
+        return self.events / self.seconds if self.seconds else float("inf")
+
+
+def _make_entity() -> YeediCloudVacuum:
+    entry = SimpleNamespace(data={}, options={}, entry_id="bench")
+    entity = YeediCloudVacuum(None, entry, None, "bench", "bench")  # type: ignore[arg-type]
+    # Flush every event so the measurement covers the full write decision.
+    entity._write_window = 0
+    entity._attr_available = True
+    return entity
+
+
+def _bench_normalize(events: int) -> BenchResult:
+    # The lookups the state and fan-speed handlers make.
+    cases: List[tuple[Callable[[Any], Any], List[str]]] = [
+        (normalize.clean_state, _STATE_VALUES),
+        (normalize.fan_speed, _FAN_VALUES),
+    ]
+    started = time.perf_counter()
+    for i in range(events):
+        func, values = cases[i & 1]
+        func(values[i % len(values)])
+    return BenchResult("normalize", events, time.perf_counter() - started)
+
+
+async def _bench_handlers(events: int) -> BenchResult:
+    entity = _make_entity()
+    writes = 0
+
+    def count_write() -> None:
+        nonlocal writes
+        writes += 1
+
+    entity.async_write_ha_state = count_write  # type: ignore[method-assign]
+
+    stream = []
+    for i in range(64):
+        stream.append((entity._on_battery, SimpleNamespace(value=100 - i % 50)))
+        stream.append((entity._on_state, SimpleNamespace(state=_STATE_VALUES[i % len(_STATE_VALUES)])))
+        stream.append((entity._on_fan_speed, SimpleNamespace(speed=_FAN_VALUES[i % len(_FAN_VALUES)])))
+
+    started = time.perf_counter()
+    for i in range(events):
+        handler, event = stream[i % len(stream)]
+        await handler(event)
+    return BenchResult("handlers", events, time.perf_counter() - started, writes)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument(
+        "--min-eps",
+        type=float,
+        default=0.0,
+        help="exit non-zero if handler throughput falls below this many events/s",
+    )
+    args = parser.parse_args()
+
+    results = [_bench_normalize(args.events), asyncio.run(_bench_handlers(args.events))]
+    for res in results:
+        print(
+            f"{res.name:<10} {res.events:>9} events  {res.seconds:8.3f}s  "
+            f"{res.events_per_second:>12,.0f} ev/s  writes={res.writes}"
+        )
+    sys.exit(0 if results[-1].events_per_second >= args.min_eps else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""Multi-robot scale benchmark against the offline fake cloud.
+
+Starts :mod:`scripts.fake_cloud` with N robots, builds N ``YeediCloudVacuum``
+entities on one shared hub inside a bare ``HomeAssistant`` instance and
+reports connect time, memory per entity, events handled per second, state
+writes and p50/p99 command latency::
+
+    python -m scripts.bench_scale --robots 50 --json > bench_output.txt
+
+Needs Home Assistant, deebot-client and amqtt installed.  State writes are
+counted rather than sent to the state machine, because the entities are
+not attached to an entity platform.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import asdict, dataclass
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, List
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.yeedi_c12_cloud.helpers import (
+    ENV_OVERRIDE_MQTT_URL,
+    ENV_OVERRIDE_REST_URL,
+)
+from custom_components.yeedi_c12_cloud.hub import YeediHub
+from custom_components.yeedi_c12_cloud.vacuum import YeediCloudVacuum
+from scripts.fake_cloud import FakeCloudConfig, FakeYeediCloud
+
+_ACCOUNT = "bench@example.com"
+_PASSWORD = "bench-password"
+
+
+@dataclass(slots=True)
+class ScaleResult:
+    """Numbers reported for one benchmark run."""
+
+    robots: int
+    connect_seconds: float
+    memory_per_entity_kib: float
+    events_handled: int
+    events_per_second: float
+    state_writes: int
+    writes_suppressed: int
+    command_p50_ms: float
+    command_p99_ms: float
+    logins: int
+
+
+class _BenchEntry:
+    """Just enough of a ConfigEntry for the vacuum entity."""
+
+    def __init__(self, did: str) -> None:
+        self.entry_id = f"bench-{did}"
+        self.data: dict[str, Any] = {}
+        self.options: dict[str, Any] = {}
+
+    def async_create_background_task(self, hass: HomeAssistant, target, name: str):
+        return hass.async_create_background_task(target, name)
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _counting_entity(hass: HomeAssistant, did: str, hub: YeediHub) -> YeediCloudVacuum:
+    entity = YeediCloudVacuum(hass, _BenchEntry(did), hub, did, did)
+    entity.async_write_ha_state = lambda: None  # type: ignore[method-assign]
+    return entity
+
+
+async def run_benchmark(
+    robots: int,
+    *,
+    bursts: int,
+    commands: int,
+    settle: float,
+    rest_port: int,
+    mqtt_port: int,
+) -> ScaleResult:
+    cloud = FakeYeediCloud(
+        FakeCloudConfig(
+            robots=robots,
+            accounts={_ACCOUNT: _PASSWORD},
+            rest_port=rest_port,
+            mqtt_port=mqtt_port,
+            tick_interval=0,
+            seed=1,
+        )
+    )
+    await cloud.start()
+    os.environ[ENV_OVERRIDE_REST_URL] = cloud.rest_url
+    os.environ[ENV_OVERRIDE_MQTT_URL] = cloud.mqtt_url or ""
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        hub = YeediHub(hass, account=_ACCOUNT, password=_PASSWORD, country="US")
+        try:
+            tracemalloc.start()
+            mem_before = tracemalloc.get_traced_memory()[0]
+            entities = [_counting_entity(hass, r.did, hub) for r in cloud.robots]
+
+            started = time.perf_counter()
+            await asyncio.gather(*(e._ensure_connected() for e in entities))
+            connect_seconds = time.perf_counter() - started
+            mem_per_entity = (tracemalloc.get_traced_memory()[0] - mem_before) / robots / 1024
+            tracemalloc.stop()
+
+            # Let the initial refresh traffic drain before measuring.
+            await asyncio.sleep(settle)
+            baseline = sum(e.metrics.counters["events"] for e in entities)
+            started = time.perf_counter()
+            for _ in range(bursts):
+                cloud.emit_status_burst()
+                await asyncio.sleep(0)
+            await asyncio.sleep(settle)
+            elapsed = time.perf_counter() - started
+            handled = sum(e.metrics.counters["events"] for e in entities) - baseline
+
+            latencies: List[float] = []
+
+            async def timed(entity: YeediCloudVacuum) -> None:
+                t0 = time.perf_counter()
+                await entity.async_locate()
+                latencies.append((time.perf_counter() - t0) * 1000)
+
+            for _ in range(commands):
+                await asyncio.gather(*(timed(e) for e in entities))
+            await asyncio.sleep(settle)
+
+            return ScaleResult(
+                robots=robots,
+                connect_seconds=round(connect_seconds, 3),
+                memory_per_entity_kib=round(mem_per_entity, 1),
+                events_handled=handled,
+                events_per_second=round(handled / elapsed, 1) if elapsed else 0.0,
+                state_writes=sum(e.metrics.counters["writes"] for e in entities),
+                writes_suppressed=sum(e.metrics.counters["writes_suppressed"] for e in entities),
+                command_p50_ms=round(_percentile(latencies, 50), 2),
+                command_p99_ms=round(_percentile(latencies, 99), 2),
+                logins=cloud.state.logins,
+            )
+        finally:
+            await hub.async_close()
+            await hass.async_stop(force=True)
+            await cloud.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Multi-robot scale benchmark.")
+    parser.add_argument("--robots", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--bursts", type=int, default=20, help="status bursts per robot")
+    parser.add_argument("--commands", type=int, default=5, help="commands per robot")
+    parser.add_argument("--settle", type=float, default=2.0, help="seconds to let traffic drain")
+    parser.add_argument("--rest-port", type=int, default=18080)
+    parser.add_argument("--mqtt-port", type=int, default=18883)
+    parser.add_argument("--json", action="store_true", help="print one JSON object per run")
+    args = parser.parse_args()
+
+    for count in args.robots:
+        result = asyncio.run(
+            run_benchmark(
+                count,
+                bursts=args.bursts,
+                commands=args.commands,
+                settle=args.settle,
+                rest_port=args.rest_port,
+                mqtt_port=args.mqtt_port,
+            )
+        )
+        if args.json:
+            print(json.dumps(asdict(result)))
+            continue
+        print(f"--- {result.robots} robot(s) ---")
+        for key, value in asdict(result).items():
+            if key != "robots":
+                print(f"  {key:<22} {value}")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Local stand-in for the Yeedi cloud, for offline benchmarks and load tests.
+
+``FakeYeediCloud`` serves the login, auth-code, device-list and command
+endpoints on one HTTP port and (with ``amqtt`` installed) runs an embedded
+MQTT broker that emits realistic battery/clean/charge events for any number
+of simulated robots.  Point the integration or the scripts at it with::
+
+    export YEEDI_OVERRIDE_REST_URL=http://127.0.0.1:8080
+    export YEEDI_OVERRIDE_MQTT_URL=mqtt://127.0.0.1:1883
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from aiohttp import web
+
+from scripts.fake_cloud.rest import FakeRestState, create_app
+from scripts.fake_cloud.robots import DEFAULT_DEVICE_CLASS, FakeRobot, make_robots
+
+__all__ = ["FakeCloudConfig", "FakeYeediCloud", "FakeRobot"]
+
+
+@dataclass(slots=True)
+class FakeCloudConfig:
+    """Knobs for one fake cloud instance."""
+
+    robots: int = 1
+    accounts: Optional[Dict[str, str]] = None
+    host: str = "127.0.0.1"
+    rest_port: int = 8080
+    mqtt_port: int = 1883
+    # Seconds between simulation ticks (battery drain, state transitions).
+    tick_interval: float = 5.0
+    device_class: str = DEFAULT_DEVICE_CLASS
+    with_mqtt: bool = True
+    seed: Optional[int] = None
+
+
+class FakeYeediCloud:
+    """REST app, optional MQTT broker and the robot simulation loop."""
+
+    def __init__(self, config: FakeCloudConfig) -> None:
+        self.config = config
+        self.robots: List[FakeRobot] = make_robots(
+            config.robots, device_class=config.device_class, seed=config.seed
+        )
+        self.state = FakeRestState(
+            accounts=config.accounts or {"fake@example.com": "fake-password"},
+            robots={r.did: r for r in self.robots},
+        )
+        self.broker = None
+        self._runner: Optional[web.AppRunner] = None
+        self._tick_task: Optional[asyncio.Task] = None
+
+    @property
+    def rest_url(self) -> str:
+        return f"http://{self.config.host}:{self.config.rest_port}"
+
+    @property
+    def mqtt_url(self) -> Optional[str]:
+        return self.broker.url if self.broker is not None else None
+
+    async def start(self) -> None:
+        if self.config.with_mqtt:
+            from scripts.fake_cloud.broker import FakeBroker
+
+            self.broker = FakeBroker(self.config.host, self.config.mqtt_port)
+            await self.broker.start()
+            self.state.publish = self.broker.publish
+
+        self._runner = web.AppRunner(create_app(self.state), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.config.host, self.config.rest_port)
+        await site.start()
+        if self.config.tick_interval > 0:
+            self._tick_task = asyncio.create_task(self._tick_loop())
+
+    async def _tick_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.config.tick_interval)
+            if self.broker is None:
+                continue
+            for robot in self.robots:
+                self.broker.publish(robot.tick())
+
+    def emit_status_burst(self) -> None:
+        """Publish a full status burst for every robot (reconnect-like load)."""
+
+        if self.broker is None:
+            return
+        for robot in self.robots:
+            self.broker.publish(robot.status_messages())
+
+    async def stop(self) -> None:
+        if self._tick_task is not None:
+            self._tick_task.cancel()
+        if self._runner is not None:
+            await self._runner.cleanup()
+        if self.broker is not None:
+            await self.broker.stop()
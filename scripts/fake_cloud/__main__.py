@@ -0,0 +1,74 @@
+"""Run the fake Yeedi cloud until interrupted.
+
+    python -m scripts.fake_cloud --robots 24 --account me@example.com:secret
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from typing import Dict, List
+
+from scripts.fake_cloud import FakeCloudConfig, FakeYeediCloud
+from scripts.fake_cloud.robots import DEFAULT_DEVICE_CLASS
+
+
+def _parse_accounts(values: List[str]) -> Dict[str, str]:
+    accounts: Dict[str, str] = {}
+    for value in values:
+        account, sep, password = value.partition(":")
+        if not sep:
+            raise SystemExit(f"--account expects ACCOUNT:PASSWORD, got {value!r}")
+        accounts[account] = password
+    return accounts
+
+
+async def _serve(config: FakeCloudConfig) -> None:
+    cloud = FakeYeediCloud(config)
+    await cloud.start()
+    print(f"REST  {cloud.rest_url}")
+    print(f"MQTT  {cloud.mqtt_url or 'disabled'}")
+    print("Accounts: " + ", ".join(cloud.state.accounts))
+    print(f"Robots:   {len(cloud.robots)} ({config.device_class})")
+    print()
+    print(f"export YEEDI_OVERRIDE_REST_URL={cloud.rest_url}")
+    if cloud.mqtt_url:
+        print(f"export YEEDI_OVERRIDE_MQTT_URL={cloud.mqtt_url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await cloud.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline stand-in for the Yeedi cloud.")
+    parser.add_argument("--robots", type=int, default=1)
+    parser.add_argument("--account", action="append", default=[], metavar="ACCOUNT:PASSWORD")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--rest-port", type=int, default=8080)
+    parser.add_argument("--mqtt-port", type=int, default=1883)
+    parser.add_argument("--tick", type=float, default=5.0, help="simulation tick in seconds")
+    parser.add_argument("--device-class", default=DEFAULT_DEVICE_CLASS)
+    parser.add_argument("--no-mqtt", action="store_true", help="REST only (no amqtt needed)")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    config = FakeCloudConfig(
+        robots=args.robots,
+        accounts=_parse_accounts(args.account) or None,
+        host=args.host,
+        rest_port=args.rest_port,
+        mqtt_port=args.mqtt_port,
+        tick_interval=args.tick,
+        device_class=args.device_class,
+        with_mqtt=not args.no_mqtt,
+        seed=args.seed,
+    )
+    try:
+        asyncio.run(_serve(config))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
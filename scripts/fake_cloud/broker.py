@@ -0,0 +1,76 @@
+"""Embedded MQTT broker for the fake cloud (requires the optional ``amqtt``)."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, List, Optional, Tuple
+
+_LOGGER = logging.getLogger(__name__)
+
+try:
+    from amqtt.broker import Broker
+    from amqtt.client import MQTTClient
+except ImportError:  # pragma: no cover - optional dependency
+    Broker = None
+    MQTTClient = None
+
+
+class FakeBroker:
+    """Plain-TCP, anonymous broker plus an internal publisher client.
+
+    Robots publish through :meth:`publish`, which never blocks the caller:
+    messages are queued and drained by a background task so the REST
+    handlers keep their latency independent of broker fan-out.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 1883) -> None:
+        if Broker is None:
+            raise SystemExit(
+                "The fake MQTT broker needs the 'amqtt' package: pip install amqtt"
+            )
+        self.host = host
+        self.port = port
+        self.published = 0
+        self._broker: Optional[Any] = None
+        self._client: Optional[Any] = None
+        self._queue: asyncio.Queue[Tuple[str, bytes]] = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def url(self) -> str:
+        return f"mqtt://{self.host}:{self.port}"
+
+    async def start(self) -> None:
+        config = {
+            "listeners": {"default": {"type": "tcp", "bind": f"{self.host}:{self.port}"}},
+            "sys_interval": 0,
+            "auth": {"allow-anonymous": True, "plugins": ["auth_anonymous"]},
+            "topic-check": {"enabled": False},
+        }
+        self._broker = Broker(config)
+        await self._broker.start()
+        self._client = MQTTClient(client_id="fake-cloud-publisher")
+        await self._client.connect(self.url)
+        self._task = asyncio.create_task(self._drain())
+
+    def publish(self, messages: List[Tuple[str, bytes]]) -> None:
+        for message in messages:
+            self._queue.put_nowait(message)
+
+    async def _drain(self) -> None:
+        while True:
+            topic, payload = await self._queue.get()
+            try:
+                await self._client.publish(topic, payload, qos=0)
+                self.published += 1
+            except Exception:
+                _LOGGER.debug("Publishing %s failed", topic, exc_info=True)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+        if self._client is not None:
+            await self._client.disconnect()
+        if self._broker is not None:
+            await self._broker.shutdown()
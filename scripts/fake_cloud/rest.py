@@ -0,0 +1,139 @@
+"""Fake Yeedi/Ecovacs REST endpoints: login, auth code, devices, commands."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import hashlib
+import secrets
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+from scripts.fake_cloud.robots import FakeRobot
+
+# Emits (topic, payload) pairs onto the broker; set by ``FakeYeediCloud``.
+PublishMany = Callable[[List[Tuple[str, bytes]]], None]
+
+
+def _md5(text: str) -> str:
+    return hashlib.md5(text.encode()).hexdigest()
+
+
+@dataclass
+class FakeRestState:
+    """Accounts, issued tokens and robots served by the REST app."""
+
+    accounts: Dict[str, str]
+    robots: Dict[str, FakeRobot]
+    token_validity_ms: int = 7 * 24 * 3600 * 1000
+    access_tokens: Dict[str, str] = field(default_factory=dict)
+    auth_codes: Dict[str, str] = field(default_factory=dict)
+    tokens: Dict[str, str] = field(default_factory=dict)
+    logins: int = 0
+    requests: int = 0
+    publish: Optional[PublishMany] = None
+
+    def user_for_token(self, body: Dict[str, Any]) -> Optional[str]:
+        auth = body.get("auth") or {}
+        uid = self.tokens.get(auth.get("token", ""))
+        if uid is not None and uid == auth.get("userid"):
+            return uid
+        return None
+
+
+def _auth_response(data: Optional[Dict[str, Any]] = None, *, code: str = "0000", msg: str = "ok") -> web.Response:
+    # The real service returns JSON with a text/plain content type.
+    return web.json_response({"code": code, "msg": msg, "data": data}, content_type="text/plain")
+
+
+def create_app(state: FakeRestState) -> web.Application:
+    """Build the aiohttp application serving every endpoint on one host."""
+
+    async def count(request: web.Request, handler):
+        state.requests += 1
+        return await handler(request)
+
+    app = web.Application(middlewares=[web.middleware(count)])
+
+    async def login(request: web.Request) -> web.Response:
+        account = request.query.get("account", "")
+        password = state.accounts.get(account)
+        if password is None or _md5(password) != request.query.get("password"):
+            return _auth_response(code="1005", msg="wrong account or password")
+        uid = f"uid-{_md5(account)[:10]}"
+        access = secrets.token_hex(8)
+        state.access_tokens[access] = uid
+        return _auth_response({"uid": uid, "accessToken": access})
+
+    async def auth_code(request: web.Request) -> web.Response:
+        uid = state.access_tokens.get(request.query.get("accessToken", ""))
+        if uid is None or uid != request.query.get("uid"):
+            return _auth_response(code="1010", msg="invalid access token")
+        code = secrets.token_hex(8)
+        state.auth_codes[code] = uid
+        return _auth_response({"authCode": code})
+
+    async def users(request: web.Request) -> web.Response:
+        body = await request.json()
+        todo = body.get("todo")
+        if todo == "loginByItToken":
+            uid = state.auth_codes.pop(body.get("token", ""), None)
+            if uid is None:
+                return web.json_response({"result": "fail", "error": "token error", "errno": "3"})
+            token = secrets.token_hex(16)
+            state.tokens[token] = uid
+            state.logins += 1
+            return web.json_response(
+                {"result": "ok", "userId": uid, "token": token, "last": state.token_validity_ms}
+            )
+        if state.user_for_token(body) is None:
+            return web.json_response({"result": "fail", "error": "auth error", "errno": "3"})
+        if todo == "GetDeviceList":
+            return web.json_response(
+                {"result": "ok", "devices": [r.api_info for r in state.robots.values()]}
+            )
+        return web.json_response({"result": "fail", "error": f"unknown todo {todo}", "errno": "1"})
+
+    async def appsvr(request: web.Request) -> web.Response:
+        body = await request.json()
+        if state.user_for_token(body) is None:
+            return web.json_response({"ret": "fail", "errno": "3"})
+        if body.get("todo") == "GetGlobalDeviceList":
+            return web.json_response({"ret": "ok", "devices": [r.api_info for r in state.robots.values()]})
+        return web.json_response({"ret": "fail", "errno": "1"})
+
+    async def devmanager(request: web.Request) -> web.Response:
+        body = await request.json()
+        if state.user_for_token(body) is None:
+            return web.json_response({"ret": "fail", "errno": "3", "error": "auth error"})
+        robot = state.robots.get(body.get("toId", ""))
+        if robot is None:
+            return web.json_response({"ret": "fail", "errno": "404", "error": "Recipient unavailable"})
+        payload = body.get("payload") or {}
+        data = (payload.get("body") or {}).get("data") if isinstance(payload, dict) else None
+        resp_data, events = robot.handle_command(body.get("cmdName", ""), data)
+        if events and state.publish is not None:
+            state.publish(events)
+        return web.json_response(
+            {
+                "ret": "ok",
+                "id": secrets.token_hex(4),
+                "payloadType": "j",
+                "resp": {
+                    "header": {"pri": 1, "ver": "0.0.1"},
+                    "body": {"code": 0, "msg": "ok", "data": resp_data},
+                },
+            }
+        )
+
+    async def clean_logs(request: web.Request) -> web.Response:
+        return web.json_response({"ret": "ok", "logs": []})
+
+    app.router.add_get(r"/v1/private/{tail:.*}/user/login", login)
+    app.router.add_get(r"/v1/private/{tail:.*}/user/loginCheckMobile", login)
+    app.router.add_get("/v1/global/auth/getAuthCode", auth_code)
+    app.router.add_post("/api/users/user.do", users)
+    app.router.add_post("/api/appsvr/app.do", appsvr)
+    app.router.add_post("/api/iot/devmanager.do", devmanager)
+    app.router.add_post("/api/lg/log.do", clean_logs)
+    return app
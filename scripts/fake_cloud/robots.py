@@ -0,0 +1,160 @@
+"""Simulated robots for the fake Yeedi cloud."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import json
+import random
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# A device class deebot_client ships static capabilities for; override it
+# with ``--device-class`` when benchmarking a different model family.
+DEFAULT_DEVICE_CLASS = "p1jij8"
+RESOURCE = "fake"
+
+
+def _header() -> Dict[str, Any]:
+    # ``ts`` is wall-clock milliseconds so consumers can measure event latency.
+    return {
+        "pri": 1,
+        "tzm": 480,
+        "ts": str(int(time.time() * 1000)),
+        "ver": "0.0.1",
+        "fwVer": "1.0.0",
+        "hwVer": "0.1.1",
+    }
+
+
+@dataclass
+class FakeRobot:
+    """State machine for one simulated robot."""
+
+    did: str
+    nick: str
+    device_class: str = DEFAULT_DEVICE_CLASS
+    battery: int = 100
+    # "idle" | "cleaning" | "paused" | "returning" | "docked"
+    state: str = "docked"
+    fan_speed: int = 0
+    water_amount: int = 1
+    events_sent: int = 0
+    commands_handled: int = 0
+
+    @property
+    def api_info(self) -> Dict[str, Any]:
+        """Return the device as the cloud device-list endpoints describe it."""
+
+        return {
+            "did": self.did,
+            "name": self.did,
+            "nick": self.nick,
+            "class": self.device_class,
+            "resource": RESOURCE,
+            "company": "eco-ng",
+            "deviceName": "Yeedi C12 (fake)",
+        }
+
+    def topic(self, name: str) -> str:
+        return f"iot/atr/{name}/{self.did}/{self.device_class}/{RESOURCE}/j"
+
+    # ---- message bodies -------------------------------------------------
+    def _clean_info(self) -> Dict[str, Any]:
+        if self.state in ("cleaning", "paused", "returning"):
+            motion = {"cleaning": "working", "paused": "pause", "returning": "goCharging"}
+            return {
+                "trigger": "app",
+                "state": "clean" if self.state != "returning" else "goCharging",
+                "cleanState": {"motionState": motion[self.state], "type": "auto"},
+            }
+        return {"trigger": "app", "state": "idle"}
+
+    def _charge_state(self) -> Dict[str, Any]:
+        return {"isCharging": 1 if self.state == "docked" else 0, "mode": "slot"}
+
+    def message(self, name: str, data: Any) -> Tuple[str, bytes]:
+        payload = {"header": _header(), "body": {"data": data}}
+        self.events_sent += 1
+        return self.topic(name), json.dumps(payload).encode()
+
+    def status_messages(self) -> List[Tuple[str, bytes]]:
+        """Full status burst, as a real robot sends after a command."""
+
+        return [
+            self.message("onBattery", {"value": self.battery, "isLow": int(self.battery < 15)}),
+            self.message("onCleanInfo_V2", self._clean_info()),
+            self.message("onChargeState", self._charge_state()),
+        ]
+
+    # ---- simulation -----------------------------------------------------
+    def tick(self) -> List[Tuple[str, bytes]]:
+        """Advance the simulation one step and return the events it produced."""
+
+        out: List[Tuple[str, bytes]] = []
+        if self.state == "cleaning":
+            self.battery = max(0, self.battery - 1)
+            if self.battery <= 15:
+                self.state = "returning"
+                out.append(self.message("onCleanInfo_V2", self._clean_info()))
+        elif self.state == "returning":
+            self.state = "docked"
+            out.append(self.message("onCleanInfo_V2", self._clean_info()))
+            out.append(self.message("onChargeState", self._charge_state()))
+        elif self.state == "docked" and self.battery < 100:
+            self.battery = min(100, self.battery + 2)
+        out.append(self.message("onBattery", {"value": self.battery, "isLow": int(self.battery < 15)}))
+        return out
+
+    # ---- commands -------------------------------------------------------
+    def handle_command(self, name: str, data: Any) -> Tuple[Dict[str, Any], List[Tuple[str, bytes]]]:
+        """Apply a devmanager command; return the response body data and events."""
+
+        self.commands_handled += 1
+        data = data or {}
+        act = data.get("act") if isinstance(data, dict) else None
+        lname = name.lower()
+        if lname.startswith("clean"):
+            if act in ("s", "start", "r", "resume"):
+                self.state = "cleaning"
+            elif act in ("p", "pause"):
+                self.state = "paused"
+            elif act in ("h", "stop"):
+                self.state = "idle"
+            return {}, self.status_messages()
+        if lname == "charge":
+            self.state = "returning"
+            return {}, self.status_messages()
+        if lname == "setspeed":
+            self.fan_speed = int(data.get("speed", 0))
+            return {}, [self.message("onSpeed", {"speed": self.fan_speed})]
+        if lname == "setwaterinfo":
+            self.water_amount = int(data.get("amount", 1))
+            return {}, [self.message("onWaterInfo", {"amount": self.water_amount, "enable": 1})]
+        if lname == "getbattery":
+            return {"value": self.battery, "isLow": int(self.battery < 15)}, []
+        if lname in ("getcleaninfo", "getcleaninfo_v2"):
+            return self._clean_info(), []
+        if lname == "getchargestate":
+            return self._charge_state(), []
+        if lname == "getspeed":
+            return {"speed": self.fan_speed}, []
+        if lname == "geterror":
+            return {"code": [0]}, []
+        return {}, []
+
+
+def make_robots(count: int, *, device_class: str = DEFAULT_DEVICE_CLASS, seed: Optional[int] = None) -> List[FakeRobot]:
+    """Create ``count`` robots with stable ids and staggered battery levels."""
+
+    rng = random.Random(seed)
+    robots = []
+    for i in range(count):
+        robots.append(
+            FakeRobot(
+                did=f"fake{i:04d}",
+                nick=f"Fake robot {i}",
+                device_class=device_class,
+                battery=rng.randint(40, 100),
+            )
+        )
+    return robots
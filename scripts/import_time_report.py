@@ -0,0 +1,143 @@
+"""Report how long importing the integration takes.
+
+Runs ``python -X importtime`` in a fresh interpreter, with the Home Assistant
+modules the integration depends on imported first so their cost is not
+attributed to us, and prints the cumulative time of every top-level module
+the integration import pulled in::
+
+    python -m scripts.import_time_report
+    python -m scripts.import_time_report --with-client   # include the deferred deebot_client set
+
+``--max-ms`` fails the run when the integration import exceeds a budget.
+"""
+
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+import os
+import subprocess
+import sys
+import tempfile
+from typing import List
+
+_PACKAGE = "custom_components.yeedi_c12_cloud"
+
+# Imported before the marker so Home Assistant's own cost is excluded.
+_PRELOAD = (
+    "homeassistant.core",
+    "homeassistant.config_entries",
+    "homeassistant.components.vacuum",
+    "homeassistant.helpers.entity_platform",
+    "homeassistant.helpers.event",
+    "homeassistant.helpers.storage",
+    "voluptuous",
+)
+
+_MARKER = "__yeedi_import_marker__"
+
+
+@dataclass(slots=True)
+class ImportTime:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def _program(with_client: bool) -> str:
+    lines = [f"import {name}" for name in _PRELOAD]
+    lines.append(f"import {_MARKER}")
+    lines.append(f"import {_PACKAGE}")
+    lines.append(f"import {_PACKAGE}.vacuum")
+    lines.append(f"import {_PACKAGE}.config_flow")
+    if with_client:
+        lines.append(f"from {_PACKAGE}.loader import import_client")
+        lines.append("import_client()")
+    return "\n".join(lines)
+
+
+def _parse(stderr: str) -> List[ImportTime]:
+    """Parse ``-X importtime`` output following the marker import."""
+
+    rows: List[ImportTime] = []
+    seen_marker = False
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us = int(parts[0])
+            cumulative_us = int(parts[1])
+        except ValueError:
+            continue  # header row
+        name = parts[2].rstrip()
+        module = name.strip()
+        if module == _MARKER:
+            seen_marker = True
+            continue
+        if not seen_marker:
+            continue
+        # One separator space, then two spaces per nesting level.
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append(ImportTime(module, self_us, cumulative_us, depth))
+    return rows
+
+
+def measure(with_client: bool) -> List[ImportTime]:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with tempfile.TemporaryDirectory() as marker_dir:
+        # An empty module whose import separates preload from measurement.
+        open(os.path.join(marker_dir, f"{_MARKER}.py"), "w", encoding="utf-8").close()
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(
+            p for p in (root, marker_dir, env.get("PYTHONPATH")) if p
+        )
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", _program(with_client)],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+    if proc.returncode:
+        tail = proc.stderr.strip().splitlines()[-1:] or ["?"]
+        raise SystemExit(f"Import failed: {tail[0]}")
+    return _parse(proc.stderr)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import-time report for the integration.")
+    parser.add_argument(
+        "--with-client",
+        action="store_true",
+        help="also import the deebot_client modules the first connect loads",
+    )
+    parser.add_argument("--top", type=int, default=15, help="heaviest modules to list")
+    parser.add_argument("--max-ms", type=float, help="fail above this total import time")
+    args = parser.parse_args()
+
+    rows = measure(args.with_client)
+    # -X importtime prints children before parents, so top-level rows (depth
+    # 0 after the marker) carry the cumulative cost of everything below them.
+    top_level = [r for r in rows if r.depth == 0]
+    total_ms = sum(r.cumulative_us for r in top_level) / 1000
+
+    print(f"Total: {total_ms:.1f} ms across {len(rows)} newly imported modules")
+    print()
+    print(f"{'cumulative ms':>14}  {'self ms':>8}  module")
+    heaviest = sorted(rows, key=lambda r: r.cumulative_us, reverse=True)[: args.top]
+    for row in heaviest:
+        print(f"{row.cumulative_us / 1000:>14.1f}  {row.self_us / 1000:>8.1f}  {row.module}")
+    deebot = [r.module for r in rows if r.module.startswith("deebot_client")]
+    print()
+    print(f"deebot_client modules imported: {len(deebot)}")
+
+    if args.max_ms is not None and total_ms > args.max_ms:
+        raise SystemExit(f"Import time {total_ms:.1f} ms exceeds budget of {args.max_ms} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Validate many Yeedi accounts concurrently and print a JSON report.
+
+Reads a CSV (header ``account,password[,country][,expect_success]``) or a
+JSON list of objects with the same keys::
+
+    python -m scripts.login_smoke_bulk accounts.csv --concurrency 16 --output report.json
+
+Exits non-zero if any account did not behave as expected.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+
+from scripts.login_test_utils import load_accounts, validate_many
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk concurrent Yeedi login validation.")
+    parser.add_argument("accounts", help="CSV or JSON file with the accounts to validate")
+    parser.add_argument(
+        "--concurrency", type=int, default=8, help="logins in flight at the same time"
+    )
+    parser.add_argument("--output", help="write the report here instead of stdout")
+    args = parser.parse_args()
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+
+    report = asyncio.run(validate_many(load_accounts(args.accounts), concurrency=args.concurrency))
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+        print(
+            f"{report['succeeded']}/{report['accounts']} account(s) as expected "
+            f"in {report['elapsed_s']} s; report written to {args.output}"
+        )
+    else:
+        print(text)
+    sys.exit(0 if report["failed"] == 0 else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,11 +3,14 @@
 from __future__ import annotations
 
 import asyncio
+import csv
+import json
 import os
 import sys
 import time
-from dataclasses import dataclass
-from typing import Awaitable, Dict, List
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Dict, List, Optional
 
 import aiohttp
 from deebot_client.api_client import ApiClient
@@ -29,21 +32,46 @@ class LoginResult:
     success: bool
     message: str
     mqtt_devices: List[str]
+    login_ms: Optional[float] = None
+    discovery_ms: Optional[float] = None
 
 
-async def _perform_login(account: str, password: str, country: str) -> List[str]:
-    """Attempt to authenticate and return a list of MQTT device IDs."""
+@dataclass(slots=True)
+class _Timings:
+    login_ms: Optional[float] = None
+    discovery_ms: Optional[float] = None
+
+
+async def _perform_login(
+    session: aiohttp.ClientSession,
+    account: str,
+    password: str,
+    country: str,
+    timings: _Timings,
+) -> List[str]:
+    """Attempt to authenticate and return a list of MQTT device IDs.
+
+    The login and the device listing are timed separately into ``timings``,
+    which is filled in as far as the attempt got.
+    """
 
     device_id = md5(str(time.time()))
-    async with aiohttp.ClientSession() as session:
-        yeedi_config = create_yeedi_api_config(
-            session,
-            device_id=device_id,
-            alpha_2_country=country,
-        )
-        auth = Authenticator(yeedi_config.rest, account, md5(password))
-        api = ApiClient(auth)
-        devices = await api.get_devices()
+    yeedi_config = create_yeedi_api_config(
+        session,
+        device_id=device_id,
+        alpha_2_country=country,
+    )
+    auth = Authenticator(yeedi_config.rest, account, md5(password))
+    try:
+        started = time.perf_counter()
+        await auth.authenticate()
+        timings.login_ms = round((time.perf_counter() - started) * 1000, 1)
+
+        started = time.perf_counter()
+        devices = await ApiClient(auth).get_devices()
+        timings.discovery_ms = round((time.perf_counter() - started) * 1000, 1)
+    finally:
+        await auth.teardown()
 
     mqtt_devs = getattr(devices, "mqtt", []) or []
     return [getattr(dev, "did", getattr(dev, "id", str(dev))) for dev in mqtt_devs]
@@ -55,29 +83,163 @@ async def validate_login(
     password: str,
     country: str,
     expect_success: bool,
+    session: Optional[aiohttp.ClientSession] = None,
 ) -> LoginResult:
-    """Run the login routine and check the result against expectations."""
+    """Run the login routine and check the result against expectations.
+
+    Pass ``session`` to reuse a connection pool across many calls; otherwise
+    a short-lived session is created for this one login.
+    """
 
+    timings = _Timings()
     try:
-        mqtt_devices = await _perform_login(account, password, country)
+        if session is None:
+            async with aiohttp.ClientSession() as own_session:
+                mqtt_devices = await _perform_login(
+                    own_session, account, password, country, timings
+                )
+        else:
+            mqtt_devices = await _perform_login(session, account, password, country, timings)
     except Exception as err:  # pragma: no cover - best effort smoke tests
         if expect_success:
-            return LoginResult(False, f"Login failed unexpectedly: {err}", [])
-        return LoginResult(True, f"Login failed as expected: {err}", [])
+            return LoginResult(
+                False, f"Login failed unexpectedly: {err}", [], timings.login_ms
+            )
+        return LoginResult(True, f"Login failed as expected: {err}", [], timings.login_ms)
 
     if not mqtt_devices:
         message = "Login succeeded but no MQTT devices were returned."
-        return LoginResult(expect_success and False, message, [])
+        return LoginResult(
+            expect_success and False, message, [], timings.login_ms, timings.discovery_ms
+        )
 
     if expect_success:
-        return LoginResult(True, "Login succeeded and devices discovered.", mqtt_devices)
+        return LoginResult(
+            True,
+            "Login succeeded and devices discovered.",
+            mqtt_devices,
+            timings.login_ms,
+            timings.discovery_ms,
+        )
     return LoginResult(
         False,
         "Login succeeded but a failure was expected.",
         mqtt_devices,
+        timings.login_ms,
+        timings.discovery_ms,
     )
 
 
+def _parse_bool(value: Any, default: bool) -> bool:
+    if isinstance(value, bool):
+        return value
+    text = str(value or "").strip().lower()
+    if not text:
+        return default
+    return text not in ("0", "false", "no", "n")
+
+
+def load_accounts(path: str | Path) -> List[Dict[str, Any]]:
+    """Read accounts for :func:`validate_many` from a CSV or JSON file.
+
+    CSV files need a header row with ``account`` and ``password`` columns;
+    JSON files hold a list of objects with the same keys.  ``country``
+    (default ``US``) and ``expect_success`` (default true) are optional.
+    """
+
+    path = Path(path)
+    with path.open(newline="", encoding="utf-8") as handle:
+        if path.suffix.lower() == ".json":
+            rows = json.load(handle)
+            if not isinstance(rows, list):
+                raise SystemExit(f"{path}: expected a JSON list of accounts.")
+        else:
+            rows = list(csv.DictReader(handle))
+
+    accounts: List[Dict[str, Any]] = []
+    for number, row in enumerate(rows, start=1):
+        account = str(row.get(CONF_ACCOUNT) or "").strip()
+        password = str(row.get(CONF_PASSWORD) or "")
+        if not account or not password:
+            raise SystemExit(f"{path}: entry {number} needs an account and a password.")
+        accounts.append(
+            {
+                CONF_ACCOUNT: account,
+                CONF_PASSWORD: password,
+                CONF_COUNTRY: str(row.get(CONF_COUNTRY) or "US").strip().upper(),
+                "expect_success": _parse_bool(row.get("expect_success"), True),
+            }
+        )
+    return accounts
+
+
+def _percentiles(values: List[float]) -> Dict[str, Optional[float]]:
+    if not values:
+        return {"count": 0, "p50": None, "p90": None, "p99": None, "max": None}
+    ordered = sorted(values)
+
+    def pick(pct: float) -> float:
+        return ordered[min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))]
+
+    return {
+        "count": len(ordered),
+        "p50": pick(50),
+        "p90": pick(90),
+        "p99": pick(99),
+        "max": ordered[-1],
+    }
+
+
+async def validate_many(
+    accounts: List[Dict[str, Any]], *, concurrency: int = 8
+) -> Dict[str, Any]:
+    """Validate every account concurrently and return a JSON-ready report.
+
+    All logins share one connection pool and at most ``concurrency`` run at
+    the same time.  The report lists each account's outcome (passwords are
+    left out) plus p50/p90/p99 latencies for login and device discovery.
+    """
+
+    semaphore = asyncio.Semaphore(concurrency)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+
+    async with aiohttp.ClientSession(connector=connector) as session:
+
+        async def run_one(spec: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                result = await validate_login(
+                    account=spec[CONF_ACCOUNT],
+                    password=spec[CONF_PASSWORD],
+                    country=spec[CONF_COUNTRY],
+                    expect_success=spec["expect_success"],
+                    session=session,
+                )
+            return {
+                CONF_ACCOUNT: spec[CONF_ACCOUNT],
+                CONF_COUNTRY: spec[CONF_COUNTRY],
+                "expect_success": spec["expect_success"],
+                **asdict(result),
+            }
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(run_one(spec) for spec in accounts))
+        elapsed = time.perf_counter() - started
+
+    failed = sum(1 for r in results if not r["success"])
+    return {
+        "accounts": len(results),
+        "succeeded": len(results) - failed,
+        "failed": failed,
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "login_ms": _percentiles([r["login_ms"] for r in results if r["login_ms"] is not None]),
+        "discovery_ms": _percentiles(
+            [r["discovery_ms"] for r in results if r["discovery_ms"] is not None]
+        ),
+        "results": results,
+    }
+
+
 def load_from_env(prefix: str = "YEEDI_") -> Dict[str, str]:
     """Load credentials from environment variables with a prefix."""
 
@@ -0,0 +1,167 @@
+"""Replay a recorded event stream through the vacuum's event handlers.
+
+Feeds a recording made with the ``start_event_recording`` service back
+through the real ``YeediCloudVacuum`` handlers, with no cloud access.  It
+reports handler time per event type, state writes and memory allocated
+while replaying::
+
+    python -m scripts.replay_events events-<did>-<time>.jsonl --speed 0 --repeat 10
+
+``--speed 1`` keeps the recorded timing, ``--speed 10`` plays it ten times
+faster and ``--speed 0`` (the default) does not wait between events.  Like
+``bench_handlers``, every event is flushed immediately (no write window),
+so ``writes`` counts the events that changed visible state.  Allocations
+are measured in one extra unpaced pass on a fresh entity, so tracing does
+not inflate the handler timings.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+import json
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+from typing import Any, Dict, List, Tuple
+
+from custom_components.yeedi_c12_cloud.event_log import read_events
+from custom_components.yeedi_c12_cloud.vacuum import EVENT_HANDLERS, YeediCloudVacuum
+
+
+@dataclass(slots=True)
+class ReplayResult:
+    """Numbers reported for one replay run."""
+
+    did: str
+    events: int
+    skipped: int
+    recorded_seconds: float
+    wall_seconds: float
+    handler_ms: float
+    handler_p50_us: float
+    handler_p99_us: float
+    writes: int
+    writes_suppressed: int
+    allocated_kib: float
+    peak_kib: float
+    by_event: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _make_entity(did: str) -> YeediCloudVacuum:
+    entry = SimpleNamespace(data={}, options={}, entry_id="replay")
+    entity = YeediCloudVacuum(None, entry, None, did, did)  # type: ignore[arg-type]
+    entity._write_window = 0
+    entity._attr_available = True
+    entity._rooms_supported = True
+    entity.async_write_ha_state = lambda: None  # type: ignore[method-assign]
+    return entity
+
+
+async def _measure_allocations(did: str, stream: List[Tuple[float, str, Any]]) -> Tuple[int, int]:
+    """Replay once under tracemalloc; return (retained, peak) bytes."""
+
+    entity = _make_entity(did)
+    calls = [
+        (getattr(entity, EVENT_HANDLERS[name]), event)
+        for _offset, name, event in stream
+        if name in EVENT_HANDLERS
+    ]
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        for handler, event in calls:
+            await handler(event)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return current - before, peak - before
+
+
+async def replay(path: str, *, speed: float, repeat: int) -> ReplayResult:
+    header, events = read_events(path)
+    # Decode up front so parsing does not count as handler time.
+    stream = list(events)
+    entity = _make_entity(str(header.get("did", "replay")))
+    handlers = {name: getattr(entity, method) for name, method in EVENT_HANDLERS.items()}
+
+    durations: List[float] = []
+    by_event: Dict[str, List[float]] = defaultdict(list)
+    skipped = 0
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        loop_started = time.perf_counter()
+        for offset, name, event in stream:
+            if speed > 0:
+                delay = offset / speed - (time.perf_counter() - loop_started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            handler = handlers.get(name)
+            if handler is None:
+                skipped += 1
+                continue
+            t0 = time.perf_counter()
+            await handler(event)
+            elapsed = time.perf_counter() - t0
+            durations.append(elapsed)
+            by_event[name].append(elapsed)
+    wall = time.perf_counter() - started
+    retained, peak = await _measure_allocations(entity._did, stream)
+
+    return ReplayResult(
+        did=str(header.get("did", "")),
+        events=len(durations),
+        skipped=skipped,
+        recorded_seconds=stream[-1][0] if stream else 0.0,
+        wall_seconds=round(wall, 3),
+        handler_ms=round(sum(durations) * 1000, 3),
+        handler_p50_us=round(_percentile(durations, 50) * 1e6, 2),
+        handler_p99_us=round(_percentile(durations, 99) * 1e6, 2),
+        writes=entity.metrics.counters["writes"],
+        writes_suppressed=entity.metrics.counters["writes_suppressed"],
+        allocated_kib=round(retained / 1024, 1),
+        peak_kib=round(peak / 1024, 1),
+        by_event={
+            name: {"count": len(values), "total_ms": round(sum(values) * 1000, 3)}
+            for name, values in sorted(by_event.items())
+        },
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay a recorded event stream.")
+    parser.add_argument("recording", help="file written by the start_event_recording service")
+    parser.add_argument("--speed", type=float, default=0.0, help="playback speed; 0 = no waits")
+    parser.add_argument("--repeat", type=int, default=1, help="play the recording this many times")
+    parser.add_argument("--json", action="store_true", help="print the result as JSON")
+    args = parser.parse_args()
+    if args.speed < 0 or args.repeat < 1:
+        parser.error("--speed must be >= 0 and --repeat >= 1")
+
+    result = asyncio.run(replay(args.recording, speed=args.speed, repeat=args.repeat))
+    if args.json:
+        print(json.dumps(asdict(result)))
+        return
+    for key, value in asdict(result).items():
+        if key == "by_event":
+            continue
+        print(f"  {key:<18} {value}")
+    for name, stats in result.by_event.items():
+        print(f"  {name:<18} {stats['count']:>8} events  {stats['total_ms']:>10.3f} ms")
+    sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()